@@ -0,0 +1,128 @@
+"""
+Load generator for api_server.py.
+
+    python api_loadgen.py --clients 16 --seconds 10 [--login member1:123]
+
+Each client thread keeps one keep-alive connection and loops over a mix of
+catalog pages, searches and book lookups (plus /history when logged in).
+Prints throughput and latency percentiles; --json writes them to a file.
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+
+SEARCH_WORDS = ["python", "code", "design", "habit", "novel", "data", "work"]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * p))
+    return sorted_values[index]
+
+
+class Client(threading.Thread):
+    def __init__(self, host, port, deadline, credentials=None):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.deadline = deadline
+        self.credentials = credentials
+        self.latencies = []
+        self.errors = 0
+        self.token = None
+        self.book_ids = []
+
+    def request(self, method, path, body=None):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = "Bearer " + self.token
+        data = json.dumps(body).encode() if body is not None else None
+
+        started = time.perf_counter()
+        self.conn.request(method, path, body=data, headers=headers)
+        response = self.conn.getresponse()
+        payload = json.loads(response.read() or b"{}")
+        self.latencies.append(time.perf_counter() - started)
+
+        if response.status >= 400:
+            self.errors += 1
+        return payload
+
+    def run(self):
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        if self.credentials:
+            username, password = self.credentials
+            self.token = self.request(
+                "POST", "/login", {"username": username, "password": password}
+            ).get("token")
+            # bcrypt login is not part of the measured mix
+            self.latencies.clear()
+
+        while time.perf_counter() < self.deadline:
+            roll = random.random()
+            try:
+                if roll < 0.4:
+                    books = self.request("GET", "/books?limit=50").get("books", [])
+                    self.book_ids = [b["id"] for b in books] or self.book_ids
+                elif roll < 0.7:
+                    word = random.choice(SEARCH_WORDS)
+                    self.request("GET", f"/books?q={word}&limit=20")
+                elif roll < 0.9 and self.book_ids:
+                    self.request("GET", "/books/" + random.choice(self.book_ids))
+                elif self.token:
+                    self.request("GET", "/history")
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                self.conn.close()
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test api_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--login", default=None, metavar="USER:PASSWORD")
+    parser.add_argument("--json", default=None, metavar="FILE")
+    args = parser.parse_args()
+
+    credentials = tuple(args.login.split(":", 1)) if args.login else None
+    deadline = time.perf_counter() + args.seconds
+    clients = [
+        Client(args.host, args.port, deadline, credentials)
+        for _ in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for c in clients:
+        c.start()
+    for c in clients:
+        c.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(l for c in clients for l in c.latencies)
+    result = {
+        "clients": args.clients,
+        "requests": len(latencies),
+        "errors": sum(c.errors for c in clients),
+        "seconds": round(elapsed, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+    for key, value in result.items():
+        print(f"{key:>9}: {value}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Local HTTP/JSON API over LibraryService, for kiosks and web front ends.
+
+    python api_server.py [--host 127.0.0.1] [--port 8080]
+
+POST /login    {"username", "password"}  -> {"token", "user"}
+POST /logout   (Authorization: Bearer <token>)
+GET  /books    ?q=&limit=&offset=  or  ?after_title=&after_id=&limit=
+GET  /books/<id>
+POST /borrow   {"book_id"}       (Authorization: Bearer <token>)
+POST /return   {"borrow_id"}     -> {"status": "ok" | "returned"}
+POST /checkout {"book_ids": []}  -> {"results": [{"book_id", "status"}]}
+POST /return-many {"borrow_ids": []} -> {"results": [{"borrow_id", "status"}]}
+GET  /history  ?after_date=&after_id=&limit=  (Authorization: Bearer <token>)
+
+One thread per client connection; HTTP/1.1 keep-alive lets a client
+reuse its socket, and each thread reuses a pooled SQLite connection.
+Tokens expire SESSION_TTL seconds after login.
+"""
+import argparse
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from database import init_db
+from services.library_service import LibraryService, ServiceError
+
+STATUS_CODES = {
+    "invalid": 400,
+    "unauthorized": 401,
+    "forbidden": 403,
+    "not_found": 404,
+    "conflict": 409,
+    "too_large": 413,
+}
+
+# giới hạn kích thước body của request
+MAX_BODY = 64 * 1024
+
+MAX_PAGE = 200
+
+# token hết hạn sau 8 giờ kể từ lúc login
+SESSION_TTL = 8 * 3600
+
+# số id tối đa mỗi request /checkout, /return-many
+MAX_BATCH = 100
+
+# JSON key -> record attribute
+BOOK_FIELDS = {
+    "id": "id", "title": "title", "author": "author",
+    "category": "category", "total": "total", "available": "available",
+}
+HISTORY_FIELDS = {
+    "borrow_id": "id", "title": "title", "borrow_date": "borrow_date",
+    "due_date": "due_date", "return_date": "return_date", "status": "status",
+    "fine": "fine",
+}
+
+
+def id_list(body, key):
+    ids = body.get(key)
+    if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+        raise ValueError(f"{key} must be a list of strings")
+    if len(ids) > MAX_BATCH:
+        raise ValueError(f"At most {MAX_BATCH} {key} per request")
+    return ids
+
+
+def to_json(record, fields):
+    return {key: getattr(record, attr) for key, attr in fields.items()}
+
+
+class Sessions:
+    def __init__(self, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self._users = {}  # token -> (user, expires)
+        self._lock = threading.Lock()
+
+    def create(self, user):
+        token = secrets.token_urlsafe(24)
+        now = time.monotonic()
+        with self._lock:
+            # dọn token đã hết hạn để dict không lớn mãi
+            for old in [t for t, (_, exp) in self._users.items() if exp <= now]:
+                del self._users[old]
+            self._users[token] = (user, now + self.ttl)
+        return token
+
+    def get(self, token):
+        with self._lock:
+            entry = self._users.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._users[token]
+                return None
+            return entry[0]
+
+    def remove(self, token):
+        with self._lock:
+            return self._users.pop(token, None) is not None
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service = LibraryService()
+    sessions = Sessions()
+    quiet = False
+
+    # ===== ROUTING =====
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/books":
+            return self.respond(self.list_books, query)
+        if url.path.startswith("/books/"):
+            return self.respond(self.get_book, url.path[len("/books/"):])
+        if url.path == "/history":
+            return self.respond(self.history, query)
+        self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        routes = {
+            "/login": self.login,
+            "/logout": self.logout,
+            "/borrow": self.borrow,
+            "/return": self.return_book,
+            "/checkout": self.checkout,
+            "/return-many": self.return_many,
+        }
+        if url.path not in routes:
+            self.send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            body = self.read_json()
+        except ServiceError as exc:
+            self.send_json(STATUS_CODES.get(exc.code, 400), {"error": exc.message})
+            return
+        except ValueError as exc:
+            self.send_json(400, {"error": str(exc)})
+            return
+        self.respond(routes[url.path], body)
+
+    def respond(self, action, *args):
+        try:
+            status, payload = 200, action(*args)
+        except ServiceError as exc:
+            status, payload = STATUS_CODES.get(exc.code, 400), {"error": exc.message}
+        except ValueError as exc:
+            status, payload = 400, {"error": str(exc)}
+        except Exception as exc:
+            self.log_error("%r", exc)
+            status, payload = 500, {"error": "Internal error"}
+        self.send_json(status, payload)
+
+    # ===== ENDPOINTS =====
+    def login(self, body):
+        user = self.service.login(body.get("username", ""), body.get("password", ""))
+        return {
+            "token": self.sessions.create(user),
+            "user": {"id": user.id, "username": user.username, "role": user.role},
+        }
+
+    def logout(self, body):
+        token = self.token()
+        if not token or not self.sessions.remove(token):
+            raise ServiceError("Login required", "Not logged in", "unauthorized")
+        return {"status": "ok"}
+
+    def list_books(self, query):
+        limit = min(int(query.get("limit", 50)), MAX_PAGE)
+        if query.get("q"):
+            offset = int(query.get("offset", 0))
+            rows = self.service.search_books(query["q"], limit, offset)
+        else:
+            after = None
+            if "after_title" in query and "after_id" in query:
+                after = (query["after_title"], query["after_id"])
+            rows = self.service.list_books(after, limit)
+        return {"books": [to_json(r, BOOK_FIELDS) for r in rows]}
+
+    def get_book(self, book_id):
+        book = self.service.get_book(book_id).as_dict()
+        book["detail"] = book["detail"] or ""
+        return book
+
+    def borrow(self, body):
+        self.service.borrow(self.current_user(), body.get("book_id"))
+        return {"status": "ok"}
+
+    def return_book(self, body):
+        # "ok", hoặc "returned" nếu đã trả trước đó (gọi lại không lỗi)
+        result = self.service.return_book(self.current_user(), body.get("borrow_id"))
+        return {"status": result}
+
+    def checkout(self, body):
+        results = self.service.borrow_many(
+            self.current_user(), id_list(body, "book_ids")
+        )
+        return {"results": [
+            {"book_id": book_id, "status": status} for book_id, status in results
+        ]}
+
+    def return_many(self, body):
+        results = self.service.return_many(
+            self.current_user(), id_list(body, "borrow_ids")
+        )
+        return {"results": [
+            {"borrow_id": borrow_id, "status": status} for borrow_id, status in results
+        ]}
+
+    def history(self, query):
+        # mới nhất trước, phân trang theo (borrow_date, borrow_id) của dòng cuối
+        limit = min(int(query.get("limit", 50)), MAX_PAGE)
+        after = None
+        if "after_date" in query and "after_id" in query:
+            after = (query["after_date"], query["after_id"])
+        rows = self.service.history(self.current_user(), after=after, limit=limit)
+        return {"history": [to_json(r, HISTORY_FIELDS) for r in rows]}
+
+    # ===== HELPERS =====
+    def token(self):
+        auth = self.headers.get("Authorization", "")
+        if auth.startswith("Bearer "):
+            return auth[len("Bearer "):]
+        return None
+
+    def current_user(self):
+        token = self.token()
+        return self.sessions.get(token) if token else None
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            # body không được đọc: giữ kết nối thì phần còn lại bị
+            # hiểu là request tiếp theo
+            self.close_connection = True
+            raise ServiceError("Too large", "Request body too large", "too_large")
+        raw = self.rfile.read(length) if length else b"{}"
+        body = json.loads(raw or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("Expected a JSON object")
+        return body
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Library HTTP/JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--quiet", action="store_true", help="no access log")
+    args = parser.parse_args()
+
+    init_db()
+    ApiHandler.quiet = args.quiet
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    server.daemon_threads = True
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Model benchmarks, meant to run against a generate_data.py database.
+
+    python benchmark.py --db bench.db [--json results.json]
+        [--compare baseline.json] [--threshold 10] [-k borrow]
+
+Each case is timed for a number of rounds after a warm-up; setup/teardown
+(e.g. taking the copy a return benchmark gives back) is not timed. Results
+use the pytest-benchmark JSON layout, so two runs can be diffed with
+--compare, which exits non-zero when a median got slower than --threshold
+percent. The borrow/return cases write to the database and delete
+their loans again at the end.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import date, datetime
+
+import database
+from database import connection, init_db
+from generate_data import PASSWORD
+from models.analytics import Analytics
+from models.book import Book
+from models.borrow import Borrow, BORROW_OK
+from models.user import User
+
+ROUNDS = 20
+WARMUP = 2
+
+
+class Case:
+    def __init__(self, name, group, run, setup=None, teardown=None,
+                 rounds=ROUNDS):
+        self.name = name
+        self.group = group
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+        self.rounds = rounds
+
+    def measure(self, rounds=None):
+        timings = []
+        for i in range(WARMUP + (rounds or self.rounds)):
+            args = self.setup() if self.setup else ()
+            started = time.perf_counter()
+            result = self.run(*args)
+            elapsed = time.perf_counter() - started
+            if self.teardown:
+                self.teardown(*args, result)
+            if i >= WARMUP:
+                timings.append(elapsed)
+        return stats(timings)
+
+
+def stats(timings):
+    ordered = sorted(timings)
+    mean = statistics.fmean(ordered)
+    return {
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": mean,
+        "median": statistics.median(ordered),
+        "stddev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "rounds": len(ordered),
+        "ops": 1 / mean if mean else 0.0,
+    }
+
+
+# ===== DATASET =====
+def dataset_info():
+    with connection() as conn:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("Users", "Book", "BorrowRecord", "Fine")
+        }
+
+
+def pick_fixtures():
+    """Members and books the cases run against."""
+    with connection() as conn:
+        heavy = conn.execute("""
+            SELECT UserID FROM BorrowRecord
+            GROUP BY UserID ORDER BY COUNT(*) DESC LIMIT 1
+        """).fetchone()
+        member = conn.execute("""
+            SELECT u.UserID, u.Username FROM Users u
+            LEFT JOIN UserLoanCount c ON c.UserID = u.UserID
+            WHERE u.Role = 'user' AND COALESCE(c.Active, 0) = 0
+            ORDER BY u.UserID DESC LIMIT 1
+        """).fetchone()
+        book = conn.execute("""
+            SELECT BookID FROM Book WHERE AvailableCopies > 1
+            ORDER BY BookID LIMIT 1
+        """).fetchone()
+
+    if not (heavy and member and book):
+        sys.exit("Database has no data to benchmark; run generate_data.py first")
+    return heavy[0], member[0], member[1], book[0]
+
+
+def open_loan(user_id):
+    with connection() as conn:
+        return conn.execute("""
+            SELECT BorrowID FROM BorrowRecord
+            WHERE UserID = ? AND Status = 'Borrowed'
+            LIMIT 1
+        """, (user_id,)).fetchone()[0]
+
+
+# ===== CASES =====
+def build_cases():
+    heavy_id, member_id, username, book_id = pick_fixtures()
+    book = Book()
+    created = []
+    # generate_data.py trải dữ liệu trên 2 năm gần nhất
+    last_year = date.today().year - 1
+
+    def take_copy():
+        result = Borrow.borrow(member_id, book_id)
+        if result != BORROW_OK:
+            raise RuntimeError(f"benchmark borrow of {book_id} failed: {result}")
+        created.append(open_loan(member_id))
+        return (created[-1],)
+
+    def give_back(*args):
+        created.append(open_loan(member_id))
+        Borrow.return_book(created[-1])
+
+    def cleanup():
+        # xoá các lượt mượn do benchmark tạo để lần chạy sau giống lần này
+        with connection() as conn:
+            conn.executemany(
+                "DELETE FROM BorrowRecord WHERE BorrowID=?",
+                [(borrow_id,) for borrow_id in created]
+            )
+
+    cases = [
+        Case("book.get_all[cold]", "book", book.get_all,
+             setup=lambda: Book.clear_cache() or (), rounds=5),
+        Case("book.get_all[cached]", "book", book.get_all),
+        Case("book.get_page", "book", book.get_page),
+        Case("book.get_by_id[cold]", "book", lambda: book.get_by_id(book_id),
+             setup=lambda: Book.clear_cache() or ()),
+        Case("book.search", "book", lambda: book.search("silent garden")),
+        Case("borrow.get_by_user[heavy]", "borrow",
+             lambda: Borrow.get_by_user(heavy_id)),
+        Case("borrow.get_by_user[member]", "borrow",
+             lambda: Borrow.get_by_user(member_id)),
+        Case("borrow.get_by_user[heavy,page]", "borrow",
+             lambda: Borrow.get_by_user(heavy_id, limit=100)),
+        Case("borrow.return_book", "borrow", Borrow.return_book,
+             setup=take_copy),
+        Case("borrow.flow", "borrow",
+             lambda: (book.get_by_id(book_id), Borrow.borrow(member_id, book_id)),
+             teardown=give_back),
+        Case("analytics.report", "analytics", Analytics.report),
+        Case("analytics.report[range]", "analytics",
+             lambda: Analytics.report(f"{last_year}-01", f"{last_year}-06")),
+        Case("user.login", "user", lambda: User.login(username, PASSWORD),
+             rounds=5),
+    ]
+    return cases, cleanup
+
+
+# ===== REPORT =====
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {b["name"]: b["stats"] for b in json.load(f)["benchmarks"]}
+
+    regressions = 0
+    print(f"\nvs {baseline_path}:")
+    for bench in results["benchmarks"]:
+        old = baseline.get(bench["name"])
+        if not old:
+            continue
+        change = (bench["stats"]["median"] / old["median"] - 1) * 100
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"  {bench['name']:<32} {change:+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the model layer")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--json", metavar="FILE", help="write results to FILE")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="compare medians with an earlier --json file")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percent slowdown counted as a regression")
+    parser.add_argument("--rounds", type=int, default=None,
+                        help="override the rounds of every case")
+    parser.add_argument("-k", dest="keyword", default="",
+                        help="only run cases whose name contains this")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"{args.db} not found; run generate_data.py first")
+    database.configure(args.db)
+    init_db()
+
+    results = {
+        "datetime": datetime.now().isoformat(timespec="seconds"),
+        "machine_info": machine_info(),
+        "dataset": dataset_info(),
+        "benchmarks": [],
+    }
+    print("Dataset:", ", ".join(f"{k}={v:,}" for k, v in results["dataset"].items()))
+    print(f"{'name':<32} {'median ms':>10} {'p95 ms':>10} {'ops/s':>10}")
+
+    cases, cleanup = build_cases()
+    try:
+        for case in cases:
+            if args.keyword not in case.name:
+                continue
+            s = case.measure(args.rounds)
+            results["benchmarks"].append(
+                {"name": case.name, "group": case.group, "stats": s}
+            )
+            print(f"{case.name:<32} {s['median'] * 1000:>10.3f} "
+                  f"{s['p95'] * 1000:>10.3f} {s['ops']:>10.1f}")
+    finally:
+        cleanup()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import argparse
+from database import init_db
+from models.loan_count import LoanCount
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare active-loan counters with BorrowRecord"
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="recompute the counters when they are out of sync"
+    )
+    args = parser.parse_args()
+
+    init_db()
+    mismatches = LoanCount.check()
+    for table, key, stored, actual in mismatches:
+        print(f"{table} {key}: stored {stored}, actual {actual}")
+
+    if not mismatches:
+        print("✅ Loan counters are consistent")
+    elif args.rebuild:
+        LoanCount.rebuild()
+        print(f"✅ Rebuilt counters ({len(mismatches)} were off)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import re
+from models.analytics import Analytics
+
+PERIOD_RE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+class AdminAnalyticsController:
+    def __init__(self):
+        self.model = Analytics()
+
+    def parse_period(self, text):
+        """'' -> None, 'YYYY-MM' -> itself, anything else -> ValueError."""
+        text = text.strip()
+        if not text:
+            return None
+        if not PERIOD_RE.match(text):
+            raise ValueError(f"Period must look like 2025-01, got {text!r}")
+        return text
+
+    def get_report(self, period_from, period_to, top=10):
+        return self.model.report(period_from, period_to, top)
+
+    def rebuild(self):
+        self.model.rebuild()
@@ -1,4 +1,5 @@
 from models.book import Book
+from models.book_import import import_books
 
 class AdminBookController:
     def __init__(self):
@@ -7,8 +8,21 @@ class AdminBookController:
     def get_books(self):
         return self.model.get_all()
 
-    def add_book(self, title, author, category, total):
-        self.model.create(title, author, category, total)
+    def get_books_page(self, after, limit):
+        return self.model.get_page(after, limit)
+
+    def page_cursor(self, row):
+        return self.model.page_cursor(row)
+
+    def get_book(self, book_id):
+        return self.model.get_by_id(book_id)
+
+    def add_book(self, title, author, category, detail, total):
+        self.model.create(title, author, category, total, detail)
+        return True
 
     def delete_book(self, book_id):
         self.model.delete(book_id)
+
+    def import_books(self, path, progress=None):
+        return import_books(path, progress=progress)
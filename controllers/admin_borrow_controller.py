@@ -1,4 +1,5 @@
 from models.borrow import Borrow
+from models.export import export_history
 
 class AdminBorrowController:
     def __init__(self):
@@ -6,3 +7,13 @@ class AdminBorrowController:
 
     def get_records(self):
         return self.model.get_all()
+
+    def get_records_page(self, filters, after, limit):
+        return self.model.query(after=after, limit=limit, **filters)
+
+    def page_cursor(self, filters):
+        sort = filters.get("sort", "borrow_date")
+        return lambda row: self.model.query_cursor(row, sort)
+
+    def export_history(self, path, fmt, date_from, date_to, status, progress=None):
+        return export_history(path, fmt, date_from, date_to, status, progress)
@@ -0,0 +1,11 @@
+import metrics
+
+class AdminDiagnosticsController:
+    def get_metrics(self):
+        return metrics.snapshot()
+
+    def reset_metrics(self):
+        metrics.reset()
+
+    def dump_metrics(self, path):
+        metrics.dump(path)
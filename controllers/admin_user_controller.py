@@ -1,31 +1,28 @@
 from models.user import User
+from services.library_service import LibraryService, ServiceError
 from tkinter import messagebox
 
 class AdminUserController:
     def __init__(self):
-        pass
+        self.service = LibraryService()
 
     def get_users(self):
         return User.get_all()
 
+    def get_user(self, user_id):
+        return User.get_by_id(user_id)
+
     def delete_user(self, user_id):
         User.delete(user_id)
 
-    def add_user(self, username, password, role):
-            if not username or not password:
-                messagebox.showwarning(
-                    "Invalid data",
-                    "Username and password are required"
-                )
-                return False
-
-            if role not in ("admin", "user"):
-                messagebox.showwarning(
-                    "Invalid role",
-                    "Role must be admin or user"
-                )
-                return False
+    def validate_user(self, username, password, role):
+        try:
+            self.service.validate_new_user(username, password, role)
+        except ServiceError as e:
+            messagebox.showwarning(e.title, e.message)
+            return False
+        return True
 
-            User.create(username, password, role)
-            messagebox.showinfo("Success", "User added successfully")
-            return True
+    def create_user(self, username, password, role):
+        # bcrypt: gọi từ worker thread
+        return self.service.add_user(username, password, role)
@@ -1,26 +1,79 @@
+import importlib
 import tkinter as tk
-from controllers.auth_controller import AuthController
-from controllers.admin_controller import AdminController
-from controllers.member_controller import MemberController
-from controllers.book_controller import BookController
-from controllers.history_controller import HistoryController
+from models import events
+from controllers.task_runner import TaskRunner
+
+# name -> (module, class). Controllers (and the views/models they import)
+# are loaded on first use, so startup only pays for the login screen.
+CONTROLLERS = {
+    "auth": ("controllers.auth_controller", "AuthController"),
+    "admin": ("controllers.admin_controller", "AdminController"),
+    "member": ("controllers.member_controller", "MemberController"),
+    "book": ("controllers.book_controller", "BookController"),
+    "history": ("controllers.history_controller", "HistoryController"),
+}
+
+# imported on a worker once the login screen is up, so the first
+# login does not wait for them
+PRELOAD = ("services.library_service", "bcrypt")
 
 class AppController:
     def __init__(self, root):
         self.root = root
         self.current_user = None
+        self.loading_label = None
 
-        self.auth = AuthController(self)
-        self.admin = AdminController(self)
-        self.member = MemberController(self)
-        self.book = BookController(self)
-        self.history = HistoryController(self)
+        # DB / bcrypt chạy ở worker thread, không block main loop
+        self.tasks = TaskRunner(root, on_busy=self.show_loading)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
 
         self.auth.show_login()
+        self.tasks.submit(self.preload, busy=False)
+
+    def __getattr__(self, name):
+        if name not in CONTROLLERS:
+            raise AttributeError(name)
+        module, cls = CONTROLLERS[name]
+        controller = getattr(importlib.import_module(module), cls)(self)
+        setattr(self, name, controller)
+        return controller
+
+    @staticmethod
+    def preload():
+        for module in PRELOAD:
+            importlib.import_module(module)
 
     def clear_screen(self):
+        # bỏ kết quả của các request thuộc màn hình cũ
+        self.tasks.cancel_pending()
         for w in self.root.winfo_children():
             w.destroy()
+        self.loading_label = None
+
+    def watch(self, table, callback):
+        """Subscribe a view to row changes; callback runs on the Tk thread."""
+        return events.subscribe(
+            table,
+            lambda action, key: self.tasks.call_soon(callback, action, key)
+        )
+
+    def show_loading(self, busy):
+        if busy:
+            self.root.config(cursor="watch")
+            if self.loading_label is None:
+                self.loading_label = tk.Label(
+                    self.root, text="Loading...",
+                    bg="#f39c12", fg="white", padx=8
+                )
+            self.loading_label.place(relx=1.0, rely=1.0, anchor="se")
+        else:
+            self.root.config(cursor="")
+            if self.loading_label is not None:
+                self.loading_label.place_forget()
+
+    def close(self):
+        self.tasks.shutdown()
+        self.root.destroy()
 
     def render_header(self, title):
         header = tk.Frame(self.root, bg="#2c3e50", height=50)
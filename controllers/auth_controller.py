@@ -1,11 +1,18 @@
 from tkinter import messagebox
-from models.user import User
 from views.login_view import LoginView
-from views.change_password_view import ChangePasswordView
 
 class AuthController:
     def __init__(self, app):
         self.app = app
+        self._service = None
+
+    @property
+    def service(self):
+        # models + bcrypt: chỉ import khi thật sự login
+        if self._service is None:
+            from services.library_service import LibraryService
+            self._service = LibraryService()
+        return self._service
 
     def show_login(self):
         self.app.current_user = None
@@ -14,10 +21,13 @@ class AuthController:
         LoginView(self.app.root, self).pack(expand=True)
 
     def handle_login(self, username, password):
-        user = User.login(username, password)
-        if not user:
-            messagebox.showerror("Error", "Invalid login")
-            return
+        # bcrypt chậm → chạy ở worker thread
+        self.app.tasks.submit(
+            self.service.login, username, password,
+            on_done=self.on_login
+        )
+
+    def on_login(self, user):
         self.app.current_user = user
         if user.role.lower() == "admin":
             self.app.admin.show_admin_dashboard()
@@ -29,17 +39,19 @@ class AuthController:
         self.app.book.show_books()
 
     def show_change_password(self):
+        from views.change_password_view import ChangePasswordView
+
         self.app.clear_screen()
         self.app.render_header("Change Password")
         ChangePasswordView(self.app.root, self).pack(expand=True)
 
     def update_password(self, old_pw, new_pw):
-        from models.user import User
-        current_hash = User.get_password_hash(self.app.current_user.id)
-        if not User.check_password(old_pw, current_hash):
-            messagebox.showerror("Error", "Old password incorrect")
-            return
-        User.change_password(self.app.current_user.id, new_pw)
+        self.app.tasks.submit(
+            self.service.change_password, self.app.current_user, old_pw, new_pw,
+            on_done=self.on_password_updated
+        )
+
+    def on_password_updated(self, _):
         messagebox.showinfo("Success", "Password updated")
         self.app.member.show_member_dashboard()
     def continue_as_guest(self):
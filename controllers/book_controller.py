@@ -1,8 +1,18 @@
 from tkinter import messagebox
 from models.book import Book
-from models.borrow import Borrow
+from models.borrow import (
+    Borrow, BORROW_OK, BORROW_UNAVAILABLE, BORROW_NOT_FOUND, BORROW_LIMIT,
+    RETURN_ALREADY
+)
+from services.library_service import LibraryService, ServiceError
 from views.book_view import BookView
 
+# lý do một cuốn trong giỏ không mượn được
+CART_REASONS = {
+    BORROW_UNAVAILABLE: "not available",
+    BORROW_NOT_FOUND: "no longer exists",
+    BORROW_LIMIT: "over the loan limit",
+}
 
 
 class BookController:
@@ -10,28 +20,29 @@ class BookController:
         self.app = app
         self.book_model = Book()
         self.borrow_model = Borrow()
+        self.service = LibraryService()
+        # giỏ mượn: BookID -> Title, giữ nguyên khi đổi màn hình
+        self.cart = {}
 
 
     def get_book_detail(self, book_id):
-        row = self.book_model.get_by_id(book_id)
-        if not row:
+        try:
+            return self.service.get_book(book_id)
+        except ServiceError:
             return None
 
-        return {
-            "id": row[0],
-            "title": row[1],
-            "author": row[2],
-            "category": row[3],
-            "total": row[4],
-            "available": row[5]
-        }
+    def get_books_page(self, after, limit):
+        return self.service.list_books(after, limit)
+
+    def search_books(self, query, offset, limit):
+        return self.service.search_books(query, limit, offset)
+
     def show_books(self):
         self.app.clear_screen()
         self.app.render_header("Books")
-        books = self.book_model.get_all()
-        BookView(self.app.root, self, books).pack(fill="both", expand=True)
+        BookView(self.app.root, self).pack(fill="both", expand=True)
 
-    def borrow_book(self, book_id):
+    def borrow_book(self, book_id, on_success=None):
         user = self.app.current_user
 
         if not user:
@@ -50,17 +61,93 @@ class BookController:
             )
             return False
 
-        book = self.book_model.get_by_id(book_id)
-        if not book or book[5] <= 0:
-            messagebox.showinfo(
-                "Unavailable",
-                "This book is not available"
-            )
-            return False
-
-        self.borrow_model.create(user.id, book_id)
-        self.book_model.decrease_available(book_id)
+        # lỗi (hết sách, quá giới hạn...) hiện qua ServiceError.title
+        self.app.tasks.submit(
+            self.service.borrow, user, book_id,
+            on_done=lambda _: self.on_borrowed(on_success)
+        )
+        return True
 
+    def on_borrowed(self, on_success=None):
         messagebox.showinfo("Success", "Borrow book successfully!")
-        return True
+        if on_success:
+            on_success()
+
+    def handle_return(self, borrow_id):
+        if not self.app.current_user:
+            messagebox.showwarning("Login required", "Please login to return books")
+            self.app.auth.show_login()
+            return
+
+        # dòng lịch sử tự cập nhật qua event "BorrowRecord" updated
+        self.app.tasks.submit(
+            self.service.return_book, self.app.current_user, borrow_id,
+            on_done=self.on_returned
+        )
+
+    def on_returned(self, result):
+        if result == RETURN_ALREADY:
+            messagebox.showinfo("Return", "This book was already returned")
+        else:
+            messagebox.showinfo("Success", "Book returned successfully!")
+
+    # ===== CART =====
+    def add_to_cart(self, books):
+        for book_id, title in books:
+            self.cart[book_id] = title
+
+    def remove_from_cart(self, book_id):
+        self.cart.pop(book_id, None)
+
+    def clear_cart(self):
+        self.cart.clear()
+
+    def checkout(self, on_done=None):
+        """Borrow everything in the cart in one transaction."""
+        user = self.app.current_user
+        if not user:
+            messagebox.showwarning("Login required", "Please login to borrow books")
+            self.app.auth.show_login()
+            return
+
+        self.app.tasks.submit(
+            self.service.borrow_many, user, list(self.cart),
+            on_done=lambda results: self.on_checkout(results, on_done)
+        )
+
+    def on_checkout(self, results, on_done=None):
+        borrowed = [book_id for book_id, result in results if result == BORROW_OK]
+        failed = [
+            f"{self.cart.get(book_id, book_id)}: {CART_REASONS[result]}"
+            for book_id, result in results if result != BORROW_OK
+        ]
+        for book_id in borrowed:
+            self.remove_from_cart(book_id)
+
+        message = f"Borrowed {len(borrowed)} of {len(results)} books."
+        if failed:
+            message += "\n\n" + "\n".join(failed)
+            messagebox.showwarning("Checkout", message)
+        else:
+            messagebox.showinfo("Checkout", message)
+        if on_done:
+            on_done()
+
+    def place_hold(self, book_id, on_success=None):
+        if not self.app.current_user:
+            messagebox.showwarning("Login required", "Please login to place a hold")
+            self.app.auth.show_login()
+            return
+
+        self.app.tasks.submit(
+            self.service.place_hold, self.app.current_user, book_id,
+            on_done=lambda _: self.on_hold_placed(on_success)
+        )
 
+    def on_hold_placed(self, on_success=None):
+        messagebox.showinfo(
+            "Hold placed",
+            "You are in the queue. The book will be kept for you when a copy is returned."
+        )
+        if on_success:
+            on_success()
@@ -1,13 +1,47 @@
-from models.borrow import Borrow
+from tkinter import messagebox
+from models.borrow import Borrow, RETURN_OK, RETURN_ALREADY
+from services.library_service import LibraryService
 from views.history_view import HistoryView
 
 class HistoryController:
     def __init__(self, app):
         self.app = app
+        self.service = LibraryService()
 
     # màn lịch sử mượn sách
     def show_history(self):
         self.app.clear_screen()
         self.app.render_header("Borrow History")
-        borrows = Borrow.get_by_user(self.app.current_user.id)
-        HistoryView(self.app.root, self, borrows).pack(fill="both", expand=True)
+        # HistoryView tự tải từng trang khi cuộn
+        HistoryView(self.app.root, self).pack(fill="both", expand=True)
+
+    def get_page(self, sort, descending, after, limit):
+        return self.service.history(
+            self.app.current_user, sort, descending, after, limit
+        )
+
+    def page_cursor(self, row, sort):
+        return Borrow.history_cursor(row, sort)
+
+    def get_entry(self, borrow_id):
+        return self.service.history_entry(self.app.current_user, borrow_id)
+
+    def return_many(self, borrow_ids):
+        # một transaction cho cả lô
+        self.app.tasks.submit(
+            self.service.return_many, self.app.current_user, borrow_ids,
+            on_done=self.on_returned
+        )
+
+    def on_returned(self, results):
+        returned = sum(1 for _, result in results if result == RETURN_OK)
+        already = sum(1 for _, result in results if result == RETURN_ALREADY)
+        missing = len(results) - returned - already
+
+        message = f"Returned {returned} of {len(results)} books."
+        if already:
+            message += f"\n{already} were already returned."
+        if missing:
+            message += f"\n{missing} could not be found."
+        # các dòng đã trả tự cập nhật qua event "BorrowRecord" updated
+        messagebox.showinfo("Return", message)
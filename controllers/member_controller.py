@@ -1,11 +1,43 @@
+from models.loan_count import LoanCount
+from services.library_service import LibraryService
+from tkinter import messagebox
 from views.member_view import MemberView
 
 class MemberController:
     def __init__(self, app):
         self.app = app
+        self.service = LibraryService()
 
     # màn member
     def show_member_dashboard(self):
         self.app.clear_screen()
         self.app.render_header("Member Dashboard")
-        MemberView(self.app.root, self).pack(expand=True)
+        view = MemberView(self.app.root, self)
+        view.pack(expand=True)
+        self.app.tasks.submit(
+            LoanCount.for_user, self.app.current_user.id,
+            on_done=view.show_active_loans,
+            busy=False
+        )
+        self.app.tasks.submit(
+            self.service.holds, self.app.current_user,
+            on_done=view.show_holds,
+            busy=False
+        )
+
+    def cancel_hold(self, hold_id):
+        self.app.tasks.submit(
+            self.service.cancel_hold, self.app.current_user, hold_id,
+            on_done=lambda _: self.show_member_dashboard()
+        )
+
+    def borrow_hold(self, book_id):
+        # service.borrow nhận luôn bản sách đang giữ cho hold Ready
+        self.app.tasks.submit(
+            self.service.borrow, self.app.current_user, book_id,
+            on_done=lambda _: self.on_hold_borrowed()
+        )
+
+    def on_hold_borrowed(self):
+        messagebox.showinfo("Success", "Borrow book successfully!")
+        self.show_member_dashboard()
@@ -0,0 +1,124 @@
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+# số worker chạy DB query / bcrypt
+MAX_WORKERS = 4
+
+# how often the Tk main loop picks up finished work (ms)
+POLL_MS = 25
+
+logger = logging.getLogger("library.tasks")
+
+
+class TaskRunner:
+    """
+    Runs blocking work (SQLite queries, bcrypt) on a worker pool and hands
+    the results back to the Tk main loop.
+
+    Workers never touch Tk: they push (callback, args) onto a queue which the
+    main loop drains every POLL_MS via root.after. cancel_pending() drops the
+    callbacks of everything submitted or scheduled so far, so results that
+    arrive after the user left a screen are ignored. A callback that raises
+    is logged and does not stop the rest of the queue.
+    """
+
+    def __init__(self, root, on_busy=None, max_workers=MAX_WORKERS):
+        self.root = root
+        self.on_busy = on_busy
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="db-worker"
+        )
+        self._results = queue.Queue()
+        self._generation = 0
+        self._futures = set()
+        self._running = 0
+        self._closed = False
+
+        self.root.after(POLL_MS, self._poll)
+
+    def submit(self, fn, *args, on_done=None, on_error=None, busy=True):
+        """
+        Run fn(*args) on a worker. on_done(result) or on_error(exc) is then
+        called on the Tk thread, unless the task was cancelled meanwhile.
+        """
+        generation = self._generation
+
+        def work():
+            try:
+                result = fn(*args)
+            except Exception as exc:
+                # import trễ: services kéo theo toàn bộ models lúc khởi động
+                from services.library_service import ServiceError
+
+                # ServiceError là kết quả bình thường (hết sách, sai mật khẩu...)
+                if not isinstance(exc, ServiceError):
+                    logger.exception("Task %r failed", fn)
+                self._results.put((generation, busy, on_error or self._show_error, (exc,)))
+            else:
+                self._results.put((generation, busy, on_done, (result,)))
+
+        if busy:
+            self._set_running(self._running + 1)
+
+        future = self._executor.submit(work)
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        return future
+
+    def call_soon(self, fn, *args):
+        """Thread-safe: run fn(*args) on the Tk thread at the next poll."""
+        self._results.put((self._generation, False, fn, args))
+
+    def cancel_pending(self):
+        self._generation += 1
+        for future in list(self._futures):
+            future.cancel()
+        self._set_running(0)
+
+    def shutdown(self):
+        self._closed = True
+        self.cancel_pending()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self):
+        if self._closed:
+            return
+
+        try:
+            self._drain()
+        finally:
+            self.root.after(POLL_MS, self._poll)
+
+    def _drain(self):
+        while True:
+            try:
+                generation, busy, callback, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if generation != self._generation:
+                continue
+
+            if busy:
+                self._set_running(self._running - 1)
+            if callback is None:
+                continue
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception("Callback %r failed", callback)
+
+    def _set_running(self, count):
+        was_busy = self._running > 0
+        self._running = max(count, 0)
+        is_busy = self._running > 0
+        if self.on_busy and was_busy != is_busy:
+            self.on_busy(is_busy)
+
+    @staticmethod
+    def _show_error(exc):
+        # ServiceError mang sẵn title cho messagebox
+        messagebox.showerror(getattr(exc, "title", "Error"), str(exc))
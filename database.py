@@ -1,59 +1,282 @@
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+import metrics
+import migrations
 
 DB_NAME = "library.db"
 
+# số connection rảnh được giữ lại để tái sử dụng
+POOL_SIZE = 8
+
+# seconds to wait on a locked database before raising
+BUSY_TIMEOUT = 5.0
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=134217728",
+)
+
+
+class ConnectionPool:
+    """Hands out one long-lived sqlite3 connection per thread.
+
+    A thread keeps the same connection for as long as it holds it (nested
+    acquires just bump a depth counter); once released, the connection goes
+    back to an idle queue so the next caller on any thread can reuse it.
+    """
+
+    def __init__(self, db_name, size=POOL_SIZE):
+        self.db_name = db_name
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = metrics.connect(
+            self.db_name,
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.depth += 1
+            return conn
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def depth(self):
+        return getattr(self._local, "depth", 0)
+
+    def release(self, conn):
+        # chỉ thread đang giữ connection mới được trả, và trả đúng số lần đã lấy
+        if getattr(self._local, "conn", None) is not conn:
+            raise sqlite3.ProgrammingError(
+                "Connection released by a thread that does not hold it, "
+                "or released more times than it was acquired."
+            )
+
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+
+        self._local.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+
+        if self._idle.qsize() < self.size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+class PooledConnection:
+    """Proxy returned by get_connection().
+
+    Behaves like a sqlite3.Connection, but close() hands the underlying
+    connection back to the pool instead of closing it.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._conn = pool.acquire()
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._conn.commit()
+        else:
+            self._conn.rollback()
+        self.close()
+        return False
+
+
+_pool = ConnectionPool(DB_NAME)
+
+
+def configure(db_name=None, pool_size=None):
+    """Point the pool at another database file and/or resize it."""
+    global DB_NAME, _pool
+    if db_name is not None:
+        DB_NAME = db_name
+    _pool.close_all()
+    _pool = ConnectionPool(DB_NAME, pool_size or POOL_SIZE)
+
+
+def close_all():
+    _pool.close_all()
+
+
 def get_connection():
-    return sqlite3.connect(DB_NAME)
+    return PooledConnection(_pool)
+
+
+@contextmanager
+def connection():
+    """
+    with connection() as conn:
+        conn.execute(...)
+
+    Commits on success and rolls back on error. Nested blocks on the same
+    thread share one connection and only the outermost block commits.
+    """
+    pool = _pool
+    conn = pool.acquire()
+    outermost = pool.depth() == 1
+    try:
+        yield conn
+        if outermost and conn.in_transaction:
+            conn.commit()
+    except BaseException:
+        if outermost and conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        pool.release(conn)
+
+
+@contextmanager
+def transaction(mode="IMMEDIATE"):
+    """
+    Explicit write transaction (BEGIN IMMEDIATE by default). When a
+    transaction is already open on this thread a SAVEPOINT is used instead,
+    so the block can be rolled back on its own.
+    """
+    pool = _pool
+    conn = pool.acquire()
+    savepoint = None
+    try:
+        if conn.in_transaction:
+            savepoint = "sp_%d" % pool.depth()
+            conn.execute("SAVEPOINT " + savepoint)
+        else:
+            conn.execute("BEGIN " + mode)
+
+        try:
+            yield conn
+        except BaseException:
+            if savepoint:
+                conn.execute("ROLLBACK TO " + savepoint)
+                conn.execute("RELEASE " + savepoint)
+            else:
+                conn.rollback()
+            raise
+
+        if savepoint:
+            conn.execute("RELEASE " + savepoint)
+        else:
+            conn.commit()
+    finally:
+        pool.release(conn)
+
 
 def init_db():
-    conn = get_connection()
-    cur = conn.cursor()
-
-    # USERS
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS Users (
-        UserID TEXT PRIMARY KEY,
-        Username TEXT UNIQUE,
-        Password TEXT,
-        Role TEXT
-    )
-    """)
-
-    # BOOK
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS Book (
-        BookID TEXT PRIMARY KEY,
-        Title TEXT,
-        Author TEXT,
-        Category TEXT,
-        Detail TEXT,
-        TotalCopies INTEGER,
-        AvailableCopies INTEGER
-    )
-    """)
-
-    # BORROW RECORD
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS BorrowRecord (
-        BorrowID TEXT PRIMARY KEY,
-        UserID TEXT,
-        BookID TEXT,
-        BorrowDate TEXT,
-        DueDate TEXT,
-        ReturnDate TEXT,
-        Status TEXT
-    )
-    """)
-
-    # FINE
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS Fine (
-        FineID TEXT PRIMARY KEY,
-        BorrowID TEXT,
-        Amount INTEGER,
-        Status TEXT
-    )
-    """)
-
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        # schema đã ở version mới nhất → khỏi chạy DDL lúc khởi động
+        if migrations.is_current(conn):
+            _restore_triggers()
+            return
+
+        cur = conn.cursor()
+
+        # USERS
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS Users (
+            UserID TEXT PRIMARY KEY,
+            Username TEXT UNIQUE,
+            Password TEXT,
+            Role TEXT
+        )
+        """)
+
+        # BOOK
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS Book (
+            BookID TEXT PRIMARY KEY,
+            Title TEXT,
+            Author TEXT,
+            Category TEXT,
+            Detail TEXT,
+            TotalCopies INTEGER,
+            AvailableCopies INTEGER
+        )
+        """)
+
+        # BORROW RECORD
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS BorrowRecord (
+            BorrowID TEXT PRIMARY KEY,
+            UserID TEXT,
+            BookID TEXT,
+            BorrowDate TEXT,
+            DueDate TEXT,
+            ReturnDate TEXT,
+            Status TEXT
+        )
+        """)
+
+        # FINE
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS Fine (
+            FineID TEXT PRIMARY KEY,
+            BorrowID TEXT,
+            Amount INTEGER,
+            Status TEXT
+        )
+        """)
+
+        # INDEXES + các thay đổi schema về sau
+        migrations.upgrade(conn)
+
+    _restore_triggers()
+
+
+def _restore_triggers():
+    # một bulk import/generate bị kill giữa chừng để lại bảng thiếu trigger
+    from migrations import v003_book_search, v009_circulation_stats
+
+    modules = (v003_book_search, v009_circulation_stats)
+    with connection() as conn:
+        cur = conn.cursor()
+        if not any(m.missing_triggers(cur) for m in modules):
+            return
+    with transaction() as conn:
+        for m in modules:
+            m.restore_triggers(conn.cursor())
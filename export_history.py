@@ -0,0 +1,39 @@
+import argparse
+from datetime import date
+from database import init_db
+from models.export import export_history, FORMATS
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export borrow history and fines to CSV or JSONL"
+    )
+    parser.add_argument("output", help="file to write")
+    parser.add_argument("--format", choices=FORMATS, default=None,
+                        help="default: taken from the output extension")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat,
+                        help="first BorrowDate (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat,
+                        help="last BorrowDate (YYYY-MM-DD)")
+    parser.add_argument("--status", choices=("Borrowed", "Returned"))
+    args = parser.parse_args()
+
+    fmt = args.format or ("jsonl" if args.output.endswith(".jsonl") else "csv")
+
+    init_db()
+
+    def progress(count):
+        print(f"\r{count} rows", end="", flush=True)
+
+    count = export_history(
+        args.output, fmt,
+        args.date_from.isoformat() if args.date_from else None,
+        args.date_to.isoformat() if args.date_to else None,
+        args.status,
+        progress
+    )
+    print(f"\n✅ Exported {count} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import time
+from datetime import date, datetime
+from database import init_db
+from models.fine import Fine
+from models.hold import Hold
+
+
+def run_once(as_of=None):
+    started = time.perf_counter()
+    changed = Fine.assess_overdue(as_of)
+    # hold đã sẵn sàng mà member không đến lấy → chuyển cho người kế tiếp
+    expired = Hold.expire_ready(as_of)
+    elapsed = time.perf_counter() - started
+    stamp = datetime.now().isoformat(timespec="seconds")
+    print(f"[{stamp}] {changed} fines created/updated, "
+          f"{expired} holds expired in {elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Assess fines for every overdue loan that is still out "
+                    "and expire holds that were not picked up"
+    )
+    parser.add_argument(
+        "--as-of", type=date.fromisoformat, default=None,
+        help="assess as of this date (YYYY-MM-DD), default today"
+    )
+    parser.add_argument(
+        "--every", type=float, default=None, metavar="HOURS",
+        help="keep running and repeat every HOURS hours"
+    )
+    args = parser.parse_args()
+    if args.as_of and args.every:
+        # ngày cố định thì lần chạy sau không tính thêm được gì
+        parser.error("--as-of cannot be combined with --every")
+
+    init_db()
+    run_once(args.as_of or date.today())
+
+    while args.every:
+        time.sleep(args.every * 3600)
+        # tính lại mỗi lần: tiền phạt tăng theo ngày
+        run_once(args.as_of or date.today())
+
+
+if __name__ == "__main__":
+    main()
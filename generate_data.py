@@ -0,0 +1,297 @@
+"""
+Synthetic dataset generator — seed_test_data.py, scaled up.
+
+    python generate_data.py --db bench.db --books 1000000 --users 100000 \
+        --borrows 10000000 [--zipf 1.1] [--seed 42]
+
+Book popularity and member activity follow a Zipf distribution, so a few
+titles and heavy readers account for most loans, like a real branch. Loans
+are spread over --days days of history; recent ones may still be out
+(respecting MAX_ACTIVE_LOANS and each book's copies) and late returns get
+a Fine. Every table is loaded with executemany in CHUNK_SIZE transactions;
+secondary indexes, search and statistics triggers are dropped during the
+load and rebuilt once at the end. All members log in with password "123" (one
+bcrypt hash, reused).
+"""
+import argparse
+import itertools
+import random
+import time
+from datetime import date, timedelta
+
+import database
+from database import connection, init_db, transaction
+from migrations import v003_book_search, v009_circulation_stats
+from models.borrow import LOAN_DAYS, MAX_ACTIVE_LOANS
+from models.fine import FINE_PER_DAY
+from models.loan_count import LoanCount
+from models.password import hash_password
+
+# số dòng mỗi transaction
+CHUNK_SIZE = 50000
+
+PASSWORD = "123"
+
+ADJECTIVES = (
+    "Silent", "Hidden", "Last", "Broken", "Golden", "Lost", "Secret", "Dark",
+    "Quiet", "Endless", "Wild", "Little", "Modern", "Practical", "Clean",
+    "Deep", "Ancient", "Distant", "Crimson", "Frozen", "Burning", "Simple",
+)
+NOUNS = (
+    "Garden", "River", "Code", "Kingdom", "Habit", "Memory", "Ocean",
+    "Empire", "Design", "Algorithm", "Journey", "Mountain", "Data", "City",
+    "Storm", "Mind", "Patterns", "Island", "Network", "Forest", "Night",
+    "Python", "Database", "Letters", "Machine", "Winter", "Engine",
+)
+FIRST_NAMES = (
+    "Anna", "Minh", "John", "Lan", "David", "Mai", "Robert", "Hoa", "Maria",
+    "Tuan", "James", "Linh", "Sarah", "Nam", "Daniel", "Thu", "Emily", "Huy",
+)
+LAST_NAMES = (
+    "Nguyen", "Smith", "Tran", "Martin", "Le", "Brown", "Pham", "Clear",
+    "Hoang", "Newport", "Vo", "Orwell", "Dang", "Hunt", "Bui", "Lee",
+)
+# (category, weight)
+CATEGORIES = (
+    ("IT", 20), ("Novel", 30), ("Self-help", 10), ("Psychology", 6),
+    ("History", 8), ("Science", 10), ("Children", 8), ("Business", 8),
+)
+
+
+def zipf_cum_weights(n, s):
+    """Cumulative weights of ranks 1..n under Zipf(s), for random.choices."""
+    return list(itertools.accumulate(1.0 / (k ** s) for k in range(1, n + 1)))
+
+
+def chunked(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load(sql, rows, chunk_size, label):
+    count = 0
+    started = time.perf_counter()
+    for batch in chunked(rows, chunk_size):
+        with transaction() as conn:
+            conn.executemany(sql, batch)
+        count += len(batch)
+        rate = count / max(time.perf_counter() - started, 1e-9)
+        print(f"\r  {label}: {count:,} rows ({rate:,.0f}/s)", end="", flush=True)
+    print()
+    return count
+
+
+# ===== GENERATORS =====
+def gen_users(rng, count, hashed):
+    yield ("U0000000", "admin", hashed, "admin")
+    for i in range(1, count + 1):
+        yield (f"U{i:07d}", f"member{i}", hashed, "user")
+
+
+def gen_books(rng, count, copies):
+    names, weights = zip(*CATEGORIES)
+    for i in range(1, count + 1):
+        title = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+        if rng.random() < 0.6:
+            title += f" {rng.choice(NOUNS)} {i}"
+        author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        category = rng.choices(names, weights)[0]
+        total = copies[i - 1]
+        yield (f"B{i:07d}", title, author, category, None, total, total)
+
+
+def gen_borrows(rng, count, users, books, copies, zipf, days):
+    """
+    BorrowRecord rows with Zipf-distributed books and members. Loans from
+    the last 2*LOAN_DAYS days are left out half of the time, as long as the
+    member and the book still have room.
+    """
+    today = date.today()
+    book_weights = zipf_cum_weights(books, zipf)
+    # heavy readers are less extreme than bestsellers
+    user_weights = zipf_cum_weights(users, max(zipf - 0.3, 0.5))
+
+    # rank -> id, so popularity is not correlated with BookID order
+    book_ids = list(range(1, books + 1))
+    user_ids = list(range(1, users + 1))
+    rng.shuffle(book_ids)
+    rng.shuffle(user_ids)
+
+    user_active = {}
+    book_active = {}
+
+    produced = 0
+    while produced < count:
+        n = min(CHUNK_SIZE, count - produced)
+        picked_books = rng.choices(book_ids, cum_weights=book_weights, k=n)
+        picked_users = rng.choices(user_ids, cum_weights=user_weights, k=n)
+
+        for book, user in zip(picked_books, picked_users):
+            produced += 1
+            days_ago = rng.randrange(days)
+            borrowed = today - timedelta(days=days_ago)
+            due = borrowed + timedelta(days=LOAN_DAYS)
+
+            if (days_ago < 2 * LOAN_DAYS and rng.random() < 0.5
+                    and user_active.get(user, 0) < MAX_ACTIVE_LOANS
+                    and book_active.get(book, 0) < copies[book - 1]):
+                user_active[user] = user_active.get(user, 0) + 1
+                book_active[book] = book_active.get(book, 0) + 1
+                returned, status = None, "Borrowed"
+            else:
+                # ~15% trả trễ
+                late = rng.random() < 0.15
+                kept = rng.randint(LOAN_DAYS + 1, LOAN_DAYS + 21) if late \
+                    else rng.randint(1, LOAN_DAYS)
+                returned = min(borrowed + timedelta(days=kept), today)
+                returned, status = returned.isoformat(), "Returned"
+
+            yield (
+                f"BR{produced:08d}",
+                f"U{user:07d}",
+                f"B{book:07d}",
+                borrowed.isoformat(),
+                due.isoformat(),
+                returned,
+                status,
+            )
+
+
+# ===== BULK HELPERS =====
+def drop_indexes(tables):
+    """Drop the secondary indexes of tables; returns their CREATE statements."""
+    with transaction() as conn:
+        indexes = conn.execute(f"""
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL
+            AND tbl_name IN ({",".join("?" * len(tables))})
+        """, tables).fetchall()
+        for name, _ in indexes:
+            conn.execute(f"DROP INDEX {name}")
+    return [sql for _, sql in indexes]
+
+
+def create_indexes(statements):
+    with transaction() as conn:
+        for sql in statements:
+            conn.execute(sql)
+
+
+def clear_tables():
+    with transaction() as conn:
+        for table in ("Hold", "Fine", "BorrowRecord", "Book", "Users",
+                      "UserLoanCount", "BookLoanCount", "LoanStats",
+                      "BookLoanTotal", "CategoryStats", "FineStats"):
+            conn.execute(f"DELETE FROM {table}")
+
+
+def generate(books, users, borrows, zipf=1.1, days=730, seed=42,
+             chunk_size=CHUNK_SIZE):
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    with transaction() as conn:
+        cur = conn.cursor()
+        v003_book_search.drop_triggers(cur)
+        v009_circulation_stats.drop_triggers(cur)
+    clear_tables()
+    indexes = drop_indexes(("Book", "BorrowRecord"))
+
+    try:
+        load(
+            "INSERT INTO Users (UserID, Username, Password, Role) VALUES (?, ?, ?, ?)",
+            gen_users(rng, users, hash_password(PASSWORD)),
+            chunk_size, "Users"
+        )
+
+        copies = [rng.randint(1, 10) for _ in range(books)]
+        load("""
+            INSERT INTO Book
+            (BookID, Title, Author, Category, Detail, TotalCopies, AvailableCopies)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            gen_books(rng, books, copies),
+            chunk_size, "Book"
+        )
+
+        if borrows:
+            load("""
+                INSERT INTO BorrowRecord
+                (BorrowID, UserID, BookID, BorrowDate, DueDate, ReturnDate, Status,
+                 Category)
+                VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7,
+                        (SELECT Category FROM Book WHERE BookID = ?3))
+                """,
+                gen_borrows(rng, borrows, users, books, copies, zipf, days),
+                chunk_size, "BorrowRecord"
+            )
+    finally:
+        print("  rebuilding indexes...")
+        create_indexes(indexes)
+        with transaction() as conn:
+            cur = conn.cursor()
+            v003_book_search.create_triggers(cur)
+            cur.execute("INSERT INTO BookSearch (BookSearch) VALUES ('rebuild')")
+            v009_circulation_stats.create_triggers(cur)
+            v009_circulation_stats.rebuild(cur)
+
+    # từ đây trigger của v009 tự cập nhật rollup
+    with transaction() as conn:
+        # sách đang cho mượn không còn trên kệ
+        conn.execute("""
+            UPDATE Book SET AvailableCopies = TotalCopies - (
+                SELECT COUNT(*) FROM BorrowRecord b
+                WHERE b.BookID = Book.BookID AND b.Status = 'Borrowed'
+            )
+            WHERE BookID IN (
+                SELECT BookID FROM BorrowRecord WHERE Status = 'Borrowed'
+            )
+        """)
+        conn.execute("""
+            INSERT INTO Fine (FineID, BorrowID, Amount, Status)
+            SELECT 'F-' || BorrowID, BorrowID,
+                   CAST(julianday(ReturnDate) - julianday(DueDate) AS INTEGER) * ?,
+                   'Unpaid'
+            FROM BorrowRecord
+            WHERE Status = 'Returned' AND ReturnDate > DueDate
+        """, (FINE_PER_DAY,))
+    LoanCount.rebuild()
+
+    with connection() as conn:
+        conn.execute("ANALYZE")
+
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a large synthetic library dataset"
+    )
+    parser.add_argument("--db", default="bench.db",
+                        help="database file to (re)fill (default bench.db)")
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--borrows", type=int, default=1000000)
+    parser.add_argument("--zipf", type=float, default=1.1,
+                        help="Zipf exponent of book popularity")
+    parser.add_argument("--days", type=int, default=730,
+                        help="days of borrow history")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    database.configure(args.db)
+    init_db()
+    print(f"Generating into {args.db}")
+    generate(args.books, args.users, args.borrows, args.zipf, args.days,
+             args.seed, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
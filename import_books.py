@@ -0,0 +1,32 @@
+import argparse
+from database import init_db
+from models.book_import import import_books, CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import a CSV or JSONL book catalog into library.db"
+    )
+    parser.add_argument("path", help="catalog file (.csv or .jsonl)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    init_db()
+
+    def progress(report):
+        print(f"\r{report.imported} imported, {report.rejected} rejected",
+              end="", flush=True)
+
+    report = import_books(args.path, args.chunk_size, progress)
+    print()
+
+    for line, reason in report.rejects:
+        print(f"line {line}: {reason}")
+    if report.rejected > len(report.rejects):
+        print(f"... {report.rejected - len(report.rejects)} more rejected rows")
+
+    print(f"✅ {report.imported} books imported in {report.elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,41 @@
+import time
+
+STARTED = time.perf_counter()
+
+import json
+import sys
 import tkinter as tk
 from controllers.app_controller import AppController
 from database import init_db
 
-if __name__ == "__main__":
+
+def main(exit_after_startup=False):
+    phases = {"imports": time.perf_counter() - STARTED}
+
+    mark = time.perf_counter()
     init_db()
+    phases["init_db"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
     root = tk.Tk()
     root.title("Library Management System")
     root.geometry("900x600")
-    AppController(root)
+    phases["tk"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    app = AppController(root)
+    root.update()
+    phases["login_screen"] = time.perf_counter() - mark
+    phases["total"] = time.perf_counter() - STARTED
+
+    if exit_after_startup:
+        # dùng bởi startup_report.py
+        print("STARTUP " + json.dumps({k: v * 1000 for k, v in phases.items()}))
+        app.close()
+        return
+
     root.mainloop()
+
+
+if __name__ == "__main__":
+    main(exit_after_startup="--exit-after-startup" in sys.argv)
@@ -0,0 +1,361 @@
+"""
+Query timing and slow-query log.
+
+database.py opens every connection with InstrumentedConnection, whose
+cursors time each statement (including the fetches, where SQLite does most
+of its work) and count the rows it returned or changed. Model classes are
+wrapped with @instrument, so each public method gets a latency histogram
+as well. Statements slower than SLOW_QUERY_MS are logged on the
+"library.slow_query" logger together with their EXPLAIN QUERY PLAN.
+
+    LIBRARY_METRICS=1          turn instrumentation on (off by default:
+                               timing every fetched row has a real cost)
+    LIBRARY_SLOW_QUERY_MS=50   slow-query threshold (default 100)
+    LIBRARY_METRICS_FILE=path  write a JSON dump when the process exits
+
+snapshot() returns everything as plain dicts; dump(path) writes it as JSON.
+"""
+import atexit
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+ENABLED = os.environ.get("LIBRARY_METRICS", "0") != "0"
+
+SLOW_QUERY_MS = float(os.environ.get("LIBRARY_SLOW_QUERY_MS", "100"))
+
+# upper bounds (ms) of the histogram buckets; the last bucket is open
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# số slow query gần nhất giữ lại cho màn hình diagnostics
+SLOW_LOG_SIZE = 200
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, ms, rows=0):
+        self.count += 1
+        self.total += ms
+        self.rows += rows
+        if ms > self.max:
+            self.max = ms
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        target = self.count * p
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                bound = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+                return min(bound, round(self.max, 3))
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max, 3),
+            "buckets": dict(zip(
+                [f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"],
+                self.buckets
+            )),
+        }
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = datetime.now()
+            self.statements = {}
+            self.methods = {}
+            self.connects = Histogram()
+            self.slow = deque(maxlen=SLOW_LOG_SIZE)
+
+    def record_statement(self, sql, ms, rows, failed=False):
+        key = normalize(sql)
+        with self._lock:
+            hist = self.statements.get(key)
+            if hist is None:
+                hist = self.statements[key] = Histogram()
+            hist.add(ms, rows)
+            if failed:
+                hist.errors += 1
+
+    def record_method(self, name, ms, failed=False):
+        with self._lock:
+            hist = self.methods.get(name)
+            if hist is None:
+                hist = self.methods[name] = Histogram()
+            hist.add(ms)
+            if failed:
+                hist.errors += 1
+
+    def record_connect(self, ms):
+        with self._lock:
+            self.connects.add(ms)
+
+    def record_slow(self, sql, ms, rows, plan):
+        entry = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "sql": normalize(sql),
+            "ms": round(ms, 3),
+            "rows": rows,
+            "plan": plan,
+        }
+        with self._lock:
+            self.slow.append(entry)
+        import logging  # chỉ cần khi thật sự có slow query
+        logging.getLogger("library.slow_query").warning(
+            "%.1f ms, %d rows: %s\n  %s",
+            ms, rows, entry["sql"], "\n  ".join(plan)
+        )
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "since": self.started.isoformat(timespec="seconds"),
+                "taken": datetime.now().isoformat(timespec="seconds"),
+                "enabled": ENABLED,
+                "slow_query_ms": SLOW_QUERY_MS,
+                "connections": self.connects.to_dict(),
+                "statements": {k: h.to_dict() for k, h in self.statements.items()},
+                "methods": {k: h.to_dict() for k, h in self.methods.items()},
+                "slow_queries": list(self.slow),
+            }
+
+
+registry = Registry()
+
+
+def normalize(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+# ===== SQLITE =====
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Times a statement from execute() until its results are consumed (or the
+    cursor is reused, closed or dropped), so lazy SELECT stepping is counted.
+    executemany() statements are timed but never EXPLAINed.
+    """
+
+    _sql = None
+    _params = None
+    _many = False
+    _rows = 0
+    _elapsed = 0.0
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        self._begin(sql, parameters)
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except Exception:
+            self._elapsed += time.perf_counter() - started
+            self._finish(failed=True)
+            raise
+        self._elapsed += time.perf_counter() - started
+        if self.description is None:
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        self._begin(sql, None, many=True)
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        except Exception:
+            self._elapsed += time.perf_counter() - started
+            self._finish(failed=True)
+            raise
+        self._elapsed += time.perf_counter() - started
+        self._finish()
+        return self
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - started
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._elapsed += time.perf_counter() - started
+            self._finish()
+            raise
+        self._elapsed += time.perf_counter() - started
+        self._rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+    def _begin(self, sql, parameters, many=False):
+        self._sql = sql
+        self._params = parameters
+        self._many = many
+        self._rows = 0
+        self._elapsed = 0.0
+
+    def _finish(self, failed=False):
+        sql = self._sql
+        if sql is None:
+            return
+        self._sql = None
+
+        ms = self._elapsed * 1000
+        rows = self._rows
+        if self.description is None and self.rowcount > 0:
+            rows = self.rowcount
+
+        registry.record_statement(sql, ms, rows, failed)
+        if ms >= SLOW_QUERY_MS and not failed:
+            # executemany: không có một bộ tham số để EXPLAIN
+            plan = [] if self._many else self._explain(sql)
+            registry.record_slow(sql, ms, rows, plan)
+
+    def _explain(self, sql):
+        if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return []
+        try:
+            cur = sqlite3.Cursor(self.connection)
+            cur.execute("EXPLAIN QUERY PLAN " + sql, self._params or ())
+            return [row[3] for row in cur.fetchall()]
+        except sqlite3.Error as exc:
+            return [f"(no plan: {exc})"]
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connect(*args, **kwargs):
+    """sqlite3.connect that records how long opening took."""
+    if not ENABLED:
+        return sqlite3.connect(*args, **kwargs)
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(*args, factory=InstrumentedConnection, **kwargs)
+    registry.record_connect((time.perf_counter() - started) * 1000)
+    return conn
+
+
+# ===== MODELS =====
+def instrument(cls):
+    """Class decorator: time every public method as "<Class>.<method>"."""
+    if not ENABLED:
+        return cls
+
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        if isinstance(attr, staticmethod):
+            setattr(cls, name, staticmethod(_timed(f"{cls.__name__}.{name}", attr.__func__)))
+        elif callable(attr):
+            setattr(cls, name, _timed(f"{cls.__name__}.{name}", attr))
+    return cls
+
+
+def _timed(name, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = fn(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            registry.record_method(
+                name, (time.perf_counter() - started) * 1000, failed
+            )
+    return wrapper
+
+
+# ===== EXPORT =====
+def snapshot():
+    return registry.snapshot()
+
+
+def reset():
+    registry.reset()
+
+
+def dump(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, indent=2, ensure_ascii=False)
+
+
+if ENABLED and os.environ.get("LIBRARY_METRICS_FILE"):
+    atexit.register(dump, os.environ["LIBRARY_METRICS_FILE"])
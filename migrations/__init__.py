@@ -0,0 +1,80 @@
+"""
+Versioned schema migrations.
+
+Each migration is a module in this package named ``vNNN_<description>.py``
+with an ``upgrade(cur)`` function. They run in version order, inside one
+transaction each, and the applied version is recorded in schema_version.
+"""
+import importlib
+import os
+import sqlite3
+from datetime import datetime
+
+
+def names():
+    """(version, module name) of every migration, from the file names only."""
+    found = []
+    for entry in os.listdir(__path__[0]):
+        name, ext = os.path.splitext(entry)
+        if ext == ".py" and name.startswith("v") and name[1:4].isdigit():
+            found.append((int(name[1:4]), name))
+    found.sort()
+    return found
+
+
+def discover():
+    return [
+        (version, name, importlib.import_module(__name__ + "." + name))
+        for version, name in names()
+    ]
+
+
+def latest_version():
+    found = names()
+    return found[-1][0] if found else 0
+
+
+def is_current(conn):
+    """True when every migration is applied; runs no DDL and imports none."""
+    try:
+        row = conn.execute("SELECT MAX(Version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return False
+    return (row[0] or 0) >= latest_version()
+
+
+def current_version(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        Version INTEGER PRIMARY KEY,
+        Name TEXT,
+        AppliedAt TEXT
+    )
+    """)
+    row = conn.execute("SELECT MAX(Version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def upgrade(conn):
+    """Apply every migration newer than the recorded version."""
+    applied = []
+    version = current_version(conn)
+
+    for number, name, module in discover():
+        if number <= version:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            module.upgrade(conn.cursor())
+            conn.execute(
+                "INSERT INTO schema_version VALUES (?, ?, ?)",
+                (number, name, datetime.now().isoformat(timespec="seconds"))
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(name)
+
+    return applied
@@ -0,0 +1,22 @@
+def upgrade(cur):
+    # lịch sử mượn của member: WHERE UserID=? (AND Status=?)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_borrow_user_status
+    ON BorrowRecord (UserID, Status)
+    """)
+
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_borrow_book
+    ON BorrowRecord (BookID)
+    """)
+
+    # tìm các phiếu quá hạn
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_borrow_due
+    ON BorrowRecord (DueDate)
+    """)
+
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_fine_borrow
+    ON Fine (BorrowID)
+    """)
@@ -0,0 +1,5 @@
+def upgrade(cur):
+    # library.db cũ được tạo trước khi có cột Detail
+    columns = [row[1] for row in cur.execute("PRAGMA table_info(Book)")]
+    if "Detail" not in columns:
+        cur.execute("ALTER TABLE Book ADD COLUMN Detail TEXT")
@@ -0,0 +1,78 @@
+import sqlite3
+
+TRIGGERS = ("book_search_ai", "book_search_ad", "book_search_au")
+
+
+def upgrade(cur):
+    # full-text index over Book, giữ đồng bộ bằng trigger
+    try:
+        cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS BookSearch USING fts5(
+            Title, Author, Category, Detail,
+            content='Book',
+            content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+        """)
+    except sqlite3.OperationalError:
+        # SQLite build without FTS5: Book.search falls back to LIKE
+        return
+
+    create_triggers(cur)
+    cur.execute("INSERT INTO BookSearch (BookSearch) VALUES ('rebuild')")
+
+
+def create_triggers(cur):
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS book_search_ai AFTER INSERT ON Book BEGIN
+        INSERT INTO BookSearch (rowid, Title, Author, Category, Detail)
+        VALUES (new.rowid, new.Title, new.Author, new.Category, new.Detail);
+    END
+    """)
+
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS book_search_ad AFTER DELETE ON Book BEGIN
+        INSERT INTO BookSearch (BookSearch, rowid, Title, Author, Category, Detail)
+        VALUES ('delete', old.rowid, old.Title, old.Author, old.Category, old.Detail);
+    END
+    """)
+
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS book_search_au
+    AFTER UPDATE OF Title, Author, Category, Detail ON Book BEGIN
+        INSERT INTO BookSearch (BookSearch, rowid, Title, Author, Category, Detail)
+        VALUES ('delete', old.rowid, old.Title, old.Author, old.Category, old.Detail);
+        INSERT INTO BookSearch (rowid, Title, Author, Category, Detail)
+        VALUES (new.rowid, new.Title, new.Author, new.Category, new.Detail);
+    END
+    """)
+
+
+def drop_triggers(cur):
+    for name in TRIGGERS:
+        cur.execute("DROP TRIGGER IF EXISTS " + name)
+
+
+def missing_triggers(cur):
+    """True when BookSearch exists but some of its triggers do not."""
+    found = cur.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'BookSearch' "
+        "OR (type = 'trigger' AND name IN (%s))" % ", ".join("?" * len(TRIGGERS)),
+        TRIGGERS
+    ).fetchall()
+    names = {row[0] for row in found}
+    return "BookSearch" in names and len(names) < len(TRIGGERS) + 1
+
+
+def restore_triggers(cur):
+    """
+    Recreate the triggers if any is missing (e.g. a bulk import that dropped
+    them was interrupted) and rebuild the index. Returns True if it did.
+    """
+    if not missing_triggers(cur):
+        return False
+
+    create_triggers(cur)
+    cur.execute("INSERT INTO BookSearch (BookSearch) VALUES ('rebuild')")
+    return True
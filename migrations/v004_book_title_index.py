@@ -0,0 +1,6 @@
+def upgrade(cur):
+    # keyset pagination của danh mục: ORDER BY Title, BookID
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_book_title
+    ON Book (Title, BookID)
+    """)
@@ -0,0 +1,18 @@
+def upgrade(cur):
+    # mỗi phiếu mượn chỉ có một Fine → cho phép UPSERT theo BorrowID
+    cur.execute("""
+    DELETE FROM Fine
+    WHERE rowid NOT IN (SELECT MIN(rowid) FROM Fine GROUP BY BorrowID)
+    """)
+    cur.execute("DROP INDEX IF EXISTS idx_fine_borrow")
+    cur.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_fine_borrow
+    ON Fine (BorrowID)
+    """)
+
+    # các phiếu đang mượn, theo hạn trả (fine engine)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_borrow_open_due
+    ON BorrowRecord (DueDate)
+    WHERE Status = 'Borrowed'
+    """)
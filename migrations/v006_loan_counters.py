@@ -0,0 +1,63 @@
+def upgrade(cur):
+    # số sách đang mượn của mỗi member / mỗi đầu sách
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS UserLoanCount (
+        UserID TEXT PRIMARY KEY,
+        Active INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS BookLoanCount (
+        BookID TEXT PRIMARY KEY,
+        Active INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS loan_count_ai
+    AFTER INSERT ON BorrowRecord WHEN new.Status = 'Borrowed' BEGIN
+        INSERT INTO UserLoanCount (UserID, Active) VALUES (new.UserID, 1)
+        ON CONFLICT (UserID) DO UPDATE SET Active = Active + 1;
+        INSERT INTO BookLoanCount (BookID, Active) VALUES (new.BookID, 1)
+        ON CONFLICT (BookID) DO UPDATE SET Active = Active + 1;
+    END
+    """)
+
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS loan_count_au_old
+    AFTER UPDATE OF Status, UserID, BookID ON BorrowRecord
+    WHEN old.Status = 'Borrowed' BEGIN
+        UPDATE UserLoanCount SET Active = Active - 1 WHERE UserID = old.UserID;
+        UPDATE BookLoanCount SET Active = Active - 1 WHERE BookID = old.BookID;
+    END
+    """)
+
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS loan_count_au_new
+    AFTER UPDATE OF Status, UserID, BookID ON BorrowRecord
+    WHEN new.Status = 'Borrowed' BEGIN
+        INSERT INTO UserLoanCount (UserID, Active) VALUES (new.UserID, 1)
+        ON CONFLICT (UserID) DO UPDATE SET Active = Active + 1;
+        INSERT INTO BookLoanCount (BookID, Active) VALUES (new.BookID, 1)
+        ON CONFLICT (BookID) DO UPDATE SET Active = Active + 1;
+    END
+    """)
+
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS loan_count_ad
+    AFTER DELETE ON BorrowRecord WHEN old.Status = 'Borrowed' BEGIN
+        UPDATE UserLoanCount SET Active = Active - 1 WHERE UserID = old.UserID;
+        UPDATE BookLoanCount SET Active = Active - 1 WHERE BookID = old.BookID;
+    END
+    """)
+
+    cur.execute("""
+    INSERT OR REPLACE INTO UserLoanCount (UserID, Active)
+    SELECT UserID, COUNT(*) FROM BorrowRecord
+    WHERE Status = 'Borrowed' GROUP BY UserID
+    """)
+    cur.execute("""
+    INSERT OR REPLACE INTO BookLoanCount (BookID, Active)
+    SELECT BookID, COUNT(*) FROM BorrowRecord
+    WHERE Status = 'Borrowed' GROUP BY BookID
+    """)
@@ -0,0 +1,18 @@
+def upgrade(cur):
+    # keyset pagination của màn admin: ORDER BY <cột>, BorrowID
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_borrow_date
+    ON BorrowRecord (BorrowDate, BorrowID)
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_borrow_status_date
+    ON BorrowRecord (Status, BorrowDate, BorrowID)
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_borrow_user_date
+    ON BorrowRecord (UserID, BorrowDate, BorrowID)
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_borrow_due_id
+    ON BorrowRecord (DueDate, BorrowID)
+    """)
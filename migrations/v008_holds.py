@@ -0,0 +1,29 @@
+def upgrade(cur):
+    # hàng đợi giữ chỗ cho sách đã hết
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS Hold (
+        HoldID TEXT PRIMARY KEY,
+        UserID TEXT NOT NULL,
+        BookID TEXT NOT NULL,
+        Position INTEGER NOT NULL,
+        Status TEXT NOT NULL,
+        CreatedAt TEXT NOT NULL,
+        ReadyAt TEXT
+    )
+    """)
+
+    # next hold of a book = first entry of this index for (BookID, 'Waiting')
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_hold_queue
+    ON Hold (BookID, Status, Position)
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_hold_user
+    ON Hold (UserID, Status)
+    """)
+    # one open hold per member and book
+    cur.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_hold_open
+    ON Hold (UserID, BookID)
+    WHERE Status IN ('Waiting', 'Ready')
+    """)
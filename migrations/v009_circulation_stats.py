@@ -0,0 +1,305 @@
+"""
+Rollups for the statistics dashboard, kept current by triggers so the
+dashboard never has to scan BorrowRecord:
+
+    LoanStats      (Period, Category) -> loans, returned, days out, late
+    BookLoanStats  (Period, BookID) -> loans, for top titles of a range
+    BookLoanTotal  BookID -> loans ever, indexed for the all-time top-N
+    CategoryStats  Category -> titles, copies
+    FineStats      Period -> amount assessed, amount paid
+
+Period is the 'YYYY-MM' of the loan's BorrowDate (of its DueDate for
+fines). A loan is counted under BorrowRecord.Category, the category its
+book had when it was borrowed, so recategorising or deleting the book
+later does not move the loan (or its return) to another category.
+"""
+
+# trigger trên Book: book_import tắt chúng khi import lớn
+CATEGORY_TRIGGERS = ("category_stats_ai", "category_stats_ad", "category_stats_au")
+
+TRIGGERS = (
+    "loan_category_ai",
+    "loan_stats_ai", "loan_stats_ad", "loan_stats_au", "book_loans_au",
+    *CATEGORY_TRIGGERS,
+    "fine_stats_ai", "fine_stats_ad", "fine_stats_au",
+)
+
+
+def upgrade(cur):
+    _add_loan_category(cur)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS LoanStats (
+        Period TEXT NOT NULL,
+        Category TEXT NOT NULL,
+        Loans INTEGER NOT NULL DEFAULT 0,
+        Returned INTEGER NOT NULL DEFAULT 0,
+        DaysOut INTEGER NOT NULL DEFAULT 0,
+        Late INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (Period, Category)
+    ) WITHOUT ROWID
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS BookLoanStats (
+        Period TEXT NOT NULL,
+        BookID TEXT NOT NULL,
+        Loans INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (Period, BookID)
+    ) WITHOUT ROWID
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS BookLoanTotal (
+        BookID TEXT PRIMARY KEY,
+        Loans INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_book_loan_total
+    ON BookLoanTotal (Loans)
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS CategoryStats (
+        Category TEXT PRIMARY KEY,
+        Titles INTEGER NOT NULL DEFAULT 0,
+        Copies INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS FineStats (
+        Period TEXT PRIMARY KEY,
+        Assessed INTEGER NOT NULL DEFAULT 0,
+        Paid INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+
+    create_triggers(cur)
+    rebuild(cur)
+
+
+def _add_loan_category(cur):
+    """Add BorrowRecord.Category and fill it from Book for existing loans."""
+    columns = [row[1] for row in cur.execute("PRAGMA table_info(BorrowRecord)")]
+    if "Category" in columns:
+        return
+    cur.execute("ALTER TABLE BorrowRecord ADD COLUMN Category TEXT")
+    cur.execute("""
+    UPDATE BorrowRecord
+    SET Category = (SELECT Category FROM Book WHERE BookID = BorrowRecord.BookID)
+    """)
+
+
+# cộng (sign = 1) hoặc trừ (sign = -1) một BorrowRecord vào LoanStats
+def _loan_stats(row, sign):
+    return f"""
+        INSERT INTO LoanStats (Period, Category, Loans, Returned, DaysOut, Late)
+        VALUES (
+            COALESCE(substr({row}.BorrowDate, 1, 7), ''),
+            COALESCE({row}.Category, ''),
+            {sign},
+            {sign} * ({row}.ReturnDate IS NOT NULL),
+            {sign} * COALESCE(CAST(
+                julianday({row}.ReturnDate) - julianday({row}.BorrowDate) AS INTEGER
+            ), 0),
+            {sign} * COALESCE({row}.ReturnDate > {row}.DueDate, 0)
+        )
+        ON CONFLICT (Period, Category) DO UPDATE SET
+            Loans = Loans + excluded.Loans,
+            Returned = Returned + excluded.Returned,
+            DaysOut = DaysOut + excluded.DaysOut,
+            Late = Late + excluded.Late;
+    """
+
+
+def _book_loans(row, sign):
+    return f"""
+        INSERT INTO BookLoanStats (Period, BookID, Loans)
+        VALUES (COALESCE(substr({row}.BorrowDate, 1, 7), ''),
+                COALESCE({row}.BookID, ''), {sign})
+        ON CONFLICT (Period, BookID) DO UPDATE SET Loans = Loans + excluded.Loans;
+        INSERT INTO BookLoanTotal (BookID, Loans)
+        VALUES (COALESCE({row}.BookID, ''), {sign})
+        ON CONFLICT (BookID) DO UPDATE SET Loans = Loans + excluded.Loans;
+    """
+
+
+def _category_stats(row, sign):
+    return f"""
+        INSERT INTO CategoryStats (Category, Titles, Copies)
+        VALUES (COALESCE({row}.Category, ''), {sign},
+                {sign} * COALESCE({row}.TotalCopies, 0))
+        ON CONFLICT (Category) DO UPDATE SET
+            Titles = Titles + excluded.Titles,
+            Copies = Copies + excluded.Copies;
+    """
+
+
+def _fine_stats(row, sign):
+    return f"""
+        INSERT INTO FineStats (Period, Assessed, Paid)
+        VALUES (
+            COALESCE((SELECT substr(DueDate, 1, 7) FROM BorrowRecord
+                      WHERE BorrowID = {row}.BorrowID), ''),
+            {sign} * COALESCE({row}.Amount, 0),
+            {sign} * CASE WHEN {row}.Status = 'Paid'
+                          THEN COALESCE({row}.Amount, 0) ELSE 0 END
+        )
+        ON CONFLICT (Period) DO UPDATE SET
+            Assessed = Assessed + excluded.Assessed,
+            Paid = Paid + excluded.Paid;
+    """
+
+
+def create_triggers(cur):
+    # INSERT không ghi Category (vd. sqlite3 shell) → lấy từ Book; việc sửa
+    # Category này lại qua loan_stats_au nên rollup vẫn đúng
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS loan_category_ai AFTER INSERT ON BorrowRecord
+    WHEN new.Category IS NULL BEGIN
+        UPDATE BorrowRecord
+        SET Category = (SELECT Category FROM Book WHERE BookID = new.BookID)
+        WHERE rowid = new.rowid;
+    END
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS loan_stats_ai AFTER INSERT ON BorrowRecord BEGIN
+        {_loan_stats("new", 1)}
+        {_book_loans("new", 1)}
+    END
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS loan_stats_ad AFTER DELETE ON BorrowRecord BEGIN
+        {_loan_stats("old", -1)}
+        {_book_loans("old", -1)}
+    END
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS loan_stats_au
+    AFTER UPDATE OF Category, BorrowDate, DueDate, ReturnDate ON BorrowRecord BEGIN
+        {_loan_stats("old", -1)}
+        {_loan_stats("new", 1)}
+    END
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS book_loans_au
+    AFTER UPDATE OF BookID, BorrowDate ON BorrowRecord
+    WHEN old.BookID IS NOT new.BookID
+      OR substr(old.BorrowDate, 1, 7) IS NOT substr(new.BorrowDate, 1, 7) BEGIN
+        {_book_loans("old", -1)}
+        {_book_loans("new", 1)}
+    END
+    """)
+
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS category_stats_ai AFTER INSERT ON Book BEGIN
+        {_category_stats("new", 1)}
+    END
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS category_stats_ad AFTER DELETE ON Book BEGIN
+        {_category_stats("old", -1)}
+    END
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS category_stats_au
+    AFTER UPDATE OF Category, TotalCopies ON Book BEGIN
+        {_category_stats("old", -1)}
+        {_category_stats("new", 1)}
+    END
+    """)
+
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS fine_stats_ai AFTER INSERT ON Fine BEGIN
+        {_fine_stats("new", 1)}
+    END
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS fine_stats_ad AFTER DELETE ON Fine BEGIN
+        {_fine_stats("old", -1)}
+    END
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS fine_stats_au
+    AFTER UPDATE OF BorrowID, Amount, Status ON Fine BEGIN
+        {_fine_stats("old", -1)}
+        {_fine_stats("new", 1)}
+    END
+    """)
+
+
+def drop_triggers(cur, names=TRIGGERS):
+    for name in names:
+        cur.execute("DROP TRIGGER IF EXISTS " + name)
+
+
+def missing_triggers(cur):
+    found = cur.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s)"
+        % ", ".join("?" * len(TRIGGERS)),
+        TRIGGERS
+    ).fetchone()[0]
+    return found < len(TRIGGERS)
+
+
+def restore_triggers(cur):
+    """
+    Recreate the triggers if any is missing (e.g. a bulk load that dropped
+    them was interrupted) and rebuild the rollups. Returns True if it did.
+    """
+    if not missing_triggers(cur):
+        return False
+
+    create_triggers(cur)
+    rebuild(cur)
+    return True
+
+
+def rebuild(cur):
+    """Recompute every rollup from the base tables."""
+    for table in ("LoanStats", "BookLoanStats", "BookLoanTotal", "FineStats"):
+        cur.execute(f"DELETE FROM {table}")
+
+    cur.execute("""
+    INSERT INTO LoanStats (Period, Category, Loans, Returned, DaysOut, Late)
+    SELECT COALESCE(substr(BorrowDate, 1, 7), ''),
+           COALESCE(Category, ''),
+           COUNT(*),
+           COUNT(ReturnDate),
+           COALESCE(SUM(CAST(
+               julianday(ReturnDate) - julianday(BorrowDate) AS INTEGER
+           )), 0),
+           COALESCE(SUM(ReturnDate > DueDate), 0)
+    FROM BorrowRecord
+    GROUP BY 1, 2
+    """)
+    cur.execute("""
+    INSERT INTO BookLoanStats (Period, BookID, Loans)
+    SELECT COALESCE(substr(BorrowDate, 1, 7), ''), COALESCE(BookID, ''), COUNT(*)
+    FROM BorrowRecord
+    GROUP BY 1, 2
+    """)
+    cur.execute("""
+    INSERT INTO BookLoanTotal (BookID, Loans)
+    SELECT BookID, SUM(Loans) FROM BookLoanStats
+    GROUP BY BookID
+    """)
+    rebuild_categories(cur)
+    cur.execute("""
+    INSERT INTO FineStats (Period, Assessed, Paid)
+    SELECT COALESCE(substr(b.DueDate, 1, 7), ''),
+           COALESCE(SUM(f.Amount), 0),
+           COALESCE(SUM(CASE WHEN f.Status = 'Paid' THEN f.Amount ELSE 0 END), 0)
+    FROM Fine f
+    LEFT JOIN BorrowRecord b ON b.BorrowID = f.BorrowID
+    GROUP BY 1
+    """)
+
+
+def rebuild_categories(cur):
+    """Recompute CategoryStats from Book."""
+    cur.execute("DELETE FROM CategoryStats")
+    cur.execute("""
+    INSERT INTO CategoryStats (Category, Titles, Copies)
+    SELECT COALESCE(Category, ''), COUNT(*), COALESCE(SUM(TotalCopies), 0)
+    FROM Book
+    GROUP BY 1
+    """)
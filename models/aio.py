@@ -0,0 +1,236 @@
+"""
+asyncio front end for the models.
+
+All SQLite work runs on one dedicated thread that drains a request queue.
+Requests that are waiting together are executed as one batch: a single
+transaction with a SAVEPOINT per request, so a failing request only rolls
+back itself. Change events of the batch are published after its COMMIT.
+The methods call the sync models, so results are identical.
+
+    async with AsyncLibrary() as lib:
+        books = await lib.books.search("python")
+        user = await lib.users.login("member1", "123")
+        await lib.borrows.borrow(user.id, books[0].id)
+
+bcrypt work (login, create, change_password) runs on the loop's default
+executor instead, so hashing does not stall the DB thread.
+"""
+import asyncio
+import queue
+import threading
+
+from database import connection, transaction
+from models import events
+from models.book import Book, cache as book_cache
+from models.borrow import Borrow
+from models.user import User
+
+# số request tối đa gom vào một transaction
+MAX_BATCH = 64
+
+
+class AsyncDatabase:
+    def __init__(self, max_batch=MAX_BATCH):
+        self.max_batch = max_batch
+        self._requests = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="sqlite-async", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join()
+            self._thread = None
+
+    async def read(self, fn, *args):
+        return await self._submit(False, fn, args)
+
+    async def write(self, fn, *args):
+        return await self._submit(True, fn, args)
+
+    def _submit(self, writes, fn, args):
+        if self._thread is None:
+            raise RuntimeError("AsyncDatabase is not started")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._requests.put((loop, future, writes, fn, args))
+        return future
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+
+            batch = [request]
+            while len(batch) < self.max_batch:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._requests.put(None)
+                    break
+                batch.append(request)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        # có request ghi → BEGIN IMMEDIATE để tránh lỗi nâng cấp lock
+        mode = "IMMEDIATE" if any(r[2] for r in batch) else "DEFERRED"
+        results = []
+        changes = []
+
+        try:
+            with connection(), transaction(mode):
+                for loop, future, _, fn, args in batch:
+                    try:
+                        with events.deferred() as pending, transaction():
+                            value = fn(*args)
+                    except Exception as exc:
+                        results.append((loop, future, False, exc))
+                        continue
+
+                    results.append((loop, future, True, value))
+                    changes.extend(pending)
+                    # các request sau trong batch không được đọc cache cũ
+                    for table, _, key in pending:
+                        if table == "Book":
+                            book_cache.invalidate(key)
+        except Exception as exc:
+            # the COMMIT itself failed: nothing in the batch was stored
+            results = [(r[0], r[1], False, exc) for r in batch]
+            changes = []
+
+        # sau COMMIT: cache invalidate lần nữa, view thấy dữ liệu đã lưu
+        events.publish(changes)
+
+        for loop, future, ok, value in results:
+            loop.call_soon_threadsafe(_resolve, future, ok, value)
+
+
+def _resolve(future, ok, value):
+    if future.cancelled():
+        return
+    if ok:
+        future.set_result(value)
+    else:
+        future.set_exception(value)
+
+
+class AsyncBook:
+    def __init__(self, db):
+        self.db = db
+        self.model = Book()
+
+    async def get_all(self):
+        return await self.db.read(self.model.get_all)
+
+    async def get_page(self, after=None, limit=100):
+        return await self.db.read(self.model.get_page, after, limit)
+
+    async def get_by_id(self, book_id):
+        return await self.db.read(self.model.get_by_id, book_id)
+
+    async def search(self, query, limit=50, offset=0):
+        return await self.db.read(self.model.search, query, limit, offset)
+
+    async def create(self, title, author, category, total, detail=None):
+        return await self.db.write(
+            self.model.create, title, author, category, total, detail
+        )
+
+    async def delete(self, book_id):
+        return await self.db.write(self.model.delete, book_id)
+
+    async def decrease_available(self, book_id):
+        return await self.db.write(self.model.decrease_available, book_id)
+
+
+class AsyncBorrow:
+    def __init__(self, db):
+        self.db = db
+
+    async def get_all(self):
+        return await self.db.read(Borrow.get_all)
+
+    async def query(self, **filters):
+        return await self.db.read(lambda: Borrow.query(**filters))
+
+    async def get_by_id(self, borrow_id):
+        return await self.db.read(Borrow.get_by_id, borrow_id)
+
+    async def get_by_user(self, user_id, **options):
+        return await self.db.read(lambda: Borrow.get_by_user(user_id, **options))
+
+    async def get_history_entry(self, borrow_id, user_id=None):
+        return await self.db.read(Borrow.get_history_entry, borrow_id, user_id)
+
+    async def create(self, user_id, book_id):
+        return await self.db.write(Borrow.create, user_id, book_id)
+
+    async def borrow(self, user_id, book_id):
+        return await self.db.write(Borrow.borrow, user_id, book_id)
+
+    async def borrow_many(self, user_id, book_ids):
+        return await self.db.write(Borrow.borrow_many, user_id, book_ids)
+
+    async def return_book(self, borrow_id, user_id=None):
+        return await self.db.write(Borrow.return_book, borrow_id, user_id)
+
+    async def return_many(self, borrow_ids, user_id=None):
+        return await self.db.write(Borrow.return_many, borrow_ids, user_id)
+
+
+class AsyncUser:
+    def __init__(self, db):
+        self.db = db
+
+    async def login(self, username, password):
+        return await asyncio.get_running_loop().run_in_executor(
+            None, User.login, username, password
+        )
+
+    async def create(self, username, password, role):
+        return await asyncio.get_running_loop().run_in_executor(
+            None, User.create, username, password, role
+        )
+
+    async def change_password(self, user_id, new_password):
+        return await asyncio.get_running_loop().run_in_executor(
+            None, User.change_password, user_id, new_password
+        )
+
+    async def get_all(self):
+        return await self.db.read(User.get_all)
+
+    async def get_by_id(self, user_id):
+        return await self.db.read(User.get_by_id, user_id)
+
+    async def get_password_hash(self, user_id):
+        return await self.db.read(User.get_password_hash, user_id)
+
+    async def delete(self, user_id):
+        return await self.db.write(User.delete, user_id)
+
+
+class AsyncLibrary:
+    def __init__(self, max_batch=MAX_BATCH):
+        self.db = AsyncDatabase(max_batch)
+        self.books = AsyncBook(self.db)
+        self.borrows = AsyncBorrow(self.db)
+        self.users = AsyncUser(self.db)
+
+    async def __aenter__(self):
+        self.db.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.db.stop)
+        return False
@@ -0,0 +1,197 @@
+from database import connection, transaction
+from metrics import instrument
+from migrations import v009_circulation_stats
+from models.records import CategoryStat, PeriodStat, TitleStat, fetch_all
+from datetime import date
+import time
+
+
+def _date_bounds(period_from, period_to):
+    # 'YYYY-MM' -> khoảng BorrowDate; '-31' vẫn >= mọi ngày trong tháng
+    return (
+        period_from + "-01" if period_from else None,
+        period_to + "-31" if period_to else None,
+    )
+
+
+def _period_filter(column, period_from, period_to):
+    where = []
+    params = []
+    if period_from:
+        where.append(f"{column} >= ?")
+        params.append(period_from)
+    if period_to:
+        where.append(f"{column} <= ?")
+        params.append(period_to)
+    return ("WHERE " + " AND ".join(where) if where else ""), params
+
+
+@instrument
+class Analytics:
+    """
+    Circulation statistics for the admin dashboard. Everything is read from
+    the rollups of migration v009 (per month and category, per month and
+    book), never from BorrowRecord itself, except the count of loans that
+    are overdue right now. Periods are 'YYYY-MM' strings, both ends inclusive;
+    None means unbounded.
+    """
+
+    @staticmethod
+    def top_titles(limit=10, period_from=None, period_to=None):
+        with connection() as conn:
+            first, last = conn.execute(
+                "SELECT MIN(Period), MAX(Period) FROM LoanStats WHERE Period <> ''"
+            ).fetchone()
+            covers_all = (
+                (not period_from or not first or period_from <= first)
+                and (not period_to or not last or period_to >= last)
+            )
+            if covers_all:
+                # all time: top-N straight off idx_book_loan_total
+                cur = conn.execute("""
+                SELECT t.BookID, COALESCE(bk.Title, t.BookID), t.Loans
+                FROM BookLoanTotal t
+                LEFT JOIN Book bk ON bk.BookID = t.BookID
+                WHERE t.Loans > 0
+                ORDER BY t.Loans DESC
+                LIMIT ?
+                """, (limit,))
+                return fetch_all(cur, TitleStat)
+
+            where, params = _period_filter("Period", period_from, period_to)
+            cur = conn.execute(f"""
+            SELECT t.BookID, COALESCE(bk.Title, t.BookID), t.Loans
+            FROM (
+                SELECT BookID, SUM(Loans) AS Loans
+                FROM BookLoanStats
+                {where}
+                GROUP BY BookID
+                ORDER BY Loans DESC
+                LIMIT ?
+            ) t
+            LEFT JOIN Book bk ON bk.BookID = t.BookID
+            ORDER BY t.Loans DESC
+            """, params + [limit])
+            return fetch_all(cur, TitleStat)
+
+    @staticmethod
+    def categories(period_from=None, period_to=None):
+        """
+        Loans per category and turnover (loans per copy), busiest first.
+        Categories that no longer have any book still show their loans,
+        with turnover None.
+        """
+        where, params = _period_filter("Period", period_from, period_to)
+        with connection() as conn:
+            cur = conn.execute(f"""
+            SELECT k.Category, COALESCE(c.Titles, 0), COALESCE(c.Copies, 0),
+                   COALESCE(l.Loans, 0),
+                   CASE WHEN c.Copies > 0
+                        THEN ROUND(COALESCE(l.Loans, 0) * 1.0 / c.Copies, 2) END
+            FROM (
+                SELECT Category FROM CategoryStats
+                UNION
+                SELECT Category FROM LoanStats
+            ) k
+            LEFT JOIN CategoryStats c ON c.Category = k.Category
+            LEFT JOIN (
+                SELECT Category, SUM(Loans) AS Loans
+                FROM LoanStats {where}
+                GROUP BY Category
+            ) l ON l.Category = k.Category
+            WHERE c.Titles > 0 OR l.Loans > 0
+            ORDER BY 5 DESC NULLS LAST, 4 DESC
+            """, params)
+            return fetch_all(cur, CategoryStat)
+
+    @staticmethod
+    def periods(period_from=None, period_to=None):
+        """One PeriodStat per month, oldest first."""
+        loan_where, params = _period_filter("Period", period_from, period_to)
+        fine_where, fine_params = _period_filter("Period", period_from, period_to)
+        with connection() as conn:
+            cur = conn.execute(f"""
+            SELECT Period,
+                   SUM(Loans), SUM(Returned),
+                   ROUND(SUM(DaysOut) * 1.0 / MAX(SUM(Returned), 1), 1),
+                   SUM(Late), SUM(Assessed), SUM(Paid)
+            FROM (
+                SELECT Period, Loans, Returned, DaysOut, Late,
+                       0 AS Assessed, 0 AS Paid
+                FROM LoanStats {loan_where}
+                UNION ALL
+                SELECT Period, 0, 0, 0, 0, Assessed, Paid
+                FROM FineStats {fine_where}
+            )
+            WHERE Period <> ''
+            GROUP BY Period
+            ORDER BY Period
+            """, params + fine_params)
+            return fetch_all(cur, PeriodStat)
+
+    @staticmethod
+    def open_overdue(period_from=None, period_to=None, as_of=None):
+        """Loans still out and past due, borrowed within the period range."""
+        date_from, date_to = _date_bounds(period_from, period_to)
+        where = ["Status = 'Borrowed'", "DueDate < ?"]
+        params = [(as_of or date.today()).isoformat()]
+        if date_from:
+            where.append("BorrowDate >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("BorrowDate <= ?")
+            params.append(date_to)
+
+        with connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM BorrowRecord WHERE " + " AND ".join(where),
+                params
+            ).fetchone()[0]
+
+    @staticmethod
+    def summary(period_from=None, period_to=None):
+        loan_where, params = _period_filter("Period", period_from, period_to)
+        fine_where, fine_params = _period_filter("Period", period_from, period_to)
+        with connection() as conn:
+            loans, returned, days_out, late = conn.execute(f"""
+            SELECT COALESCE(SUM(Loans), 0), COALESCE(SUM(Returned), 0),
+                   COALESCE(SUM(DaysOut), 0), COALESCE(SUM(Late), 0)
+            FROM LoanStats {loan_where}
+            """, params).fetchone()
+            assessed, paid = conn.execute(f"""
+            SELECT COALESCE(SUM(Assessed), 0), COALESCE(SUM(Paid), 0)
+            FROM FineStats {fine_where}
+            """, fine_params).fetchone()
+        overdue = Analytics.open_overdue(period_from, period_to)
+
+        return {
+            "loans": loans,
+            "returned": returned,
+            "avg_loan_days": round(days_out / returned, 1) if returned else 0.0,
+            "late_returns": late,
+            "open_overdue": overdue,
+            # trả trễ + đang quá hạn, trên tổng số lượt mượn
+            "overdue_rate": round((late + overdue) / loans, 4) if loans else 0.0,
+            "fines_assessed": assessed,
+            "fines_paid": paid,
+        }
+
+    @staticmethod
+    def report(period_from=None, period_to=None, top=10):
+        """Everything the dashboard shows, as one dict."""
+        started = time.perf_counter()
+        return {
+            "period_from": period_from,
+            "period_to": period_to,
+            "summary": Analytics.summary(period_from, period_to),
+            "top_titles": Analytics.top_titles(top, period_from, period_to),
+            "categories": Analytics.categories(period_from, period_to),
+            "periods": Analytics.periods(period_from, period_to),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    @staticmethod
+    def rebuild():
+        """Recompute the rollups from BorrowRecord, Book and Fine."""
+        with transaction() as conn:
+            v009_circulation_stats.rebuild(conn.cursor())
@@ -1,67 +1,264 @@
-from database import get_connection
+from collections import OrderedDict
+from database import connection
+from models import events
+from models.records import BookRecord, fetch_all, fetch_one
+from metrics import instrument
+import re
+import threading
+import time
 import uuid
 
+# trọng số bm25 cho Title, Author, Category, Detail
+SEARCH_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+# cache của get_by_id / get_all
+CACHE_SIZE = 2048
+CACHE_TTL = 60.0
+
+
+class BookCache:
+    """
+    Bounded LRU + TTL cache of Book rows keyed by BookID, plus one cached
+    snapshot of the whole catalog for get_all().
+
+    Every Book change event drops the row and the snapshot. A read that
+    started before an invalidation is not stored, so a slow query cannot
+    put a stale row back.
+    """
+
+    def __init__(self, max_size=CACHE_SIZE, ttl=CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._rows = OrderedDict()
+        self._catalog = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self):
+        return self._version
+
+    def get(self, key):
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return False, None
+            self._rows.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key, row, version):
+        with self._lock:
+            if version != self._version:
+                return
+            self._rows[key] = (time.monotonic() + self.ttl, row)
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+
+    def get_catalog(self):
+        with self._lock:
+            if self._catalog is None or self._catalog[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._catalog[1]
+
+    def put_catalog(self, rows, version):
+        with self._lock:
+            if version == self._version:
+                self._catalog = (time.monotonic() + self.ttl, rows)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            self._version += 1
+            self._catalog = None
+            if key is None:
+                self._rows.clear()
+            else:
+                self._rows.pop(key, None)
+
+    def on_change(self, action, key):
+        self.invalidate(key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._rows),
+                "max_size": self.max_size,
+                "catalog_cached": self._catalog is not None,
+            }
+
+
+cache = BookCache()
+events.subscribe("Book", cache.on_change)
+
+
+@instrument
 class Book:
 
     def get_all(self):
-        conn = get_connection()
-        cur = conn.cursor()
+        rows = cache.get_catalog()
+        if rows is not None:
+            return list(rows)
 
-        cur.execute("""
-            SELECT BookID, Title, Author, Category,
-                   TotalCopies, AvailableCopies
-            FROM Book
-        """)
-        rows = cur.fetchall()
-        conn.close()
-        return rows
-
-    def create(self, title, author, category, total):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO Book
-            (BookID, Title, Author, Category, TotalCopies, AvailableCopies)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            str(uuid.uuid4()),
-            title, author, category,
-            total, total
-        ))
-        conn.commit()
-        conn.close()
+        version = cache.version()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT BookID, Title, Author, Category,
+                       TotalCopies, AvailableCopies
+                FROM Book
+            """)
+            rows = fetch_all(cur, BookRecord)
+
+        cache.put_catalog(rows, version)
+        return list(rows)
+
+    def get_page(self, after=None, limit=100):
+        """
+        One page of the catalog ordered by Title, BookID. `after` is the
+        (Title, BookID) of the last row of the previous page.
+        """
+        with connection() as conn:
+            if after is None:
+                cur = conn.execute("""
+                    SELECT BookID, Title, Author, Category,
+                           TotalCopies, AvailableCopies
+                    FROM Book
+                    ORDER BY Title, BookID
+                    LIMIT ?
+                """, (limit,))
+            else:
+                cur = conn.execute("""
+                    SELECT BookID, Title, Author, Category,
+                           TotalCopies, AvailableCopies
+                    FROM Book
+                    WHERE (Title, BookID) > (?, ?)
+                    ORDER BY Title, BookID
+                    LIMIT ?
+                """, (*after, limit))
+            return fetch_all(cur, BookRecord)
+
+    @staticmethod
+    def page_cursor(book):
+        return (book.title, book.id)
+
+    def create(self, title, author, category, total, detail=None):
+        book_id = str(uuid.uuid4())
+        with connection() as conn:
+            conn.execute("""
+                INSERT INTO Book
+                (BookID, Title, Author, Category, Detail,
+                 TotalCopies, AvailableCopies)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                book_id,
+                title, author, category, detail,
+                total, total
+            ))
+        events.emit("Book", events.CREATED, book_id)
+        return book_id
 
     def delete(self, book_id):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("DELETE FROM Book WHERE BookID = ?", (book_id,))
-        conn.commit()
-        conn.close()
+        with connection() as conn:
+            conn.execute("DELETE FROM Book WHERE BookID = ?", (book_id,))
+        events.emit("Book", events.DELETED, book_id)
 
     def get_by_id(self, book_id):
-        conn = get_connection()
-        cur = conn.cursor()
+        found, row = cache.get(book_id)
+        if found:
+            # bản sao: caller sửa record không làm bẩn cache
+            return BookRecord(*row) if row else row
 
-        cur.execute("""
-            SELECT BookID, Title, Author, Category,
-                   TotalCopies, AvailableCopies
-            FROM Book
-            WHERE BookID = ?
-        """, (book_id,))
+        version = cache.version()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT BookID, Title, Author, Category,
+                       TotalCopies, AvailableCopies, Detail
+                FROM Book
+                WHERE BookID = ?
+            """, (book_id,))
+            row = fetch_one(cur, BookRecord)
+
+        cache.put(book_id, row, version)
+        return BookRecord(*row) if row else row
 
-        row = cur.fetchone()
-        conn.close()
-        return row
+    @staticmethod
+    def cache_stats():
+        return cache.stats()
+
+    @staticmethod
+    def clear_cache():
+        cache.invalidate()
 
     def decrease_available(self, book_id):
-        conn = get_connection()
-        cur = conn.cursor()
+        with connection() as conn:
+            conn.execute("""
+                UPDATE Book
+                SET AvailableCopies = AvailableCopies - 1
+                WHERE BookID = ? AND AvailableCopies > 0
+            """, (book_id,))
+        events.emit("Book", events.UPDATED, book_id)
+
+    def search(self, query, limit=50, offset=0):
+        """
+        Ranked full-text search over Title, Author, Category and Detail.
+        Every word in the query must match, and the last one is also
+        matched as a prefix so results show up while typing.
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+
+        with connection() as conn:
+            if not Book._has_search_index(conn):
+                return Book._search_like(conn, words, limit, offset)
+
+            match = " ".join('"%s"' % w for w in words[:-1])
+            match = (match + ' "%s"*' % words[-1]).strip()
+
+            cur = conn.execute("""
+                SELECT b.BookID, b.Title, b.Author, b.Category,
+                       b.TotalCopies, b.AvailableCopies
+                FROM BookSearch s
+                JOIN Book b ON b.rowid = s.rowid
+                WHERE BookSearch MATCH ?
+                ORDER BY bm25(BookSearch, ?, ?, ?, ?)
+                LIMIT ? OFFSET ?
+            """, (match, *SEARCH_WEIGHTS, limit, offset))
+            return fetch_all(cur, BookRecord)
 
-        cur.execute("""
-            UPDATE Book
-            SET AvailableCopies = AvailableCopies - 1
-            WHERE BookID = ? AND AvailableCopies > 0
-        """, (book_id,))
+    @staticmethod
+    def _has_search_index(conn):
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'BookSearch'"
+        ).fetchone()
+        return row is not None
 
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def _search_like(conn, words, limit, offset):
+        where = []
+        params = []
+        for w in words:
+            where.append(
+                "(Title LIKE ? OR Author LIKE ? OR Category LIKE ? OR Detail LIKE ?)"
+            )
+            params.extend(["%" + w + "%"] * 4)
+
+        cur = conn.execute("""
+            SELECT BookID, Title, Author, Category,
+                   TotalCopies, AvailableCopies
+            FROM Book
+            WHERE """ + " AND ".join(where) + """
+            ORDER BY Title
+            LIMIT ? OFFSET ?
+        """, (*params, limit, offset))
+        return fetch_all(cur, BookRecord)
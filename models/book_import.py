@@ -0,0 +1,197 @@
+import csv
+import functools
+import json
+import os
+import time
+import uuid
+from database import transaction
+from migrations import v003_book_search, v009_circulation_stats
+from models.book import Book
+
+# số dòng mỗi transaction
+CHUNK_SIZE = 20000
+
+# After this many rows the BookSearch and CategoryStats triggers are dropped
+# and both are rebuilt once at the end; per-row FTS maintenance is ~5x the
+# insert cost.
+BULK_THRESHOLD = 50000
+
+# chỉ giữ lại chi tiết của N dòng lỗi đầu tiên
+MAX_REJECTS_KEPT = 1000
+
+# header name (lowercase, no spaces/underscores) -> Book column
+COLUMN_ALIASES = {
+    "bookid": "BookID",
+    "id": "BookID",
+    "title": "Title",
+    "author": "Author",
+    "category": "Category",
+    "detail": "Detail",
+    "details": "Detail",
+    "description": "Detail",
+    "total": "TotalCopies",
+    "totalcopies": "TotalCopies",
+    "copies": "TotalCopies",
+}
+
+UPSERT_SQL = """
+    INSERT INTO Book
+    (BookID, Title, Author, Category, Detail, TotalCopies, AvailableCopies)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (BookID) DO UPDATE SET
+        Title = excluded.Title,
+        Author = excluded.Author,
+        Category = excluded.Category,
+        Detail = excluded.Detail,
+        AvailableCopies = MAX(
+            0, Book.AvailableCopies + excluded.TotalCopies - Book.TotalCopies
+        ),
+        TotalCopies = excluded.TotalCopies
+"""
+
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+        self.rejects = []  # (line, reason)
+        self.elapsed = 0.0
+
+    def reject(self, line, reason):
+        self.rejected += 1
+        if len(self.rejects) < MAX_REJECTS_KEPT:
+            self.rejects.append((line, reason))
+
+
+def read_records(path):
+    """Yield (line_no, dict) from a .csv or .jsonl/.json-lines file."""
+    ext = os.path.splitext(path)[1].lower()
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if ext == ".csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield line_no, record
+
+
+@functools.lru_cache(maxsize=256)
+def _column(key):
+    # cùng một header lặp lại ở mọi dòng → chuẩn hoá một lần
+    return COLUMN_ALIASES.get(key.strip().lower().replace("_", "").replace(" ", ""))
+
+
+def validate(record):
+    """Map one input record to an upsert tuple, or raise ValueError."""
+    if not isinstance(record, dict):
+        raise ValueError("not a JSON object")
+
+    row = {}
+    for key, value in record.items():
+        if key is None:
+            continue
+        column = _column(key)
+        if column:
+            row[column] = value.strip() if isinstance(value, str) else value
+
+    title = row.get("Title")
+    if not title:
+        raise ValueError("missing title")
+
+    total = row.get("TotalCopies")
+    if total in (None, ""):
+        total = 0
+    try:
+        total = int(total)
+    except (TypeError, ValueError):
+        raise ValueError("total copies must be a number")
+    if total < 0:
+        raise ValueError("total copies cannot be negative")
+
+    return (
+        row.get("BookID") or str(uuid.uuid4()),
+        title,
+        row.get("Author") or "",
+        row.get("Category") or "",
+        row.get("Detail") or None,
+        total,
+        total,
+    )
+
+
+def import_books(path, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Stream a CSV/JSONL catalog into Book. Valid rows are upserted by BookID
+    with executemany, one transaction per chunk; invalid rows are counted
+    and reported but do not stop the load. progress(report) is called after
+    every chunk.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    batch = []
+    bulk = False
+
+    def flush():
+        nonlocal bulk
+        if not bulk and report.imported + len(batch) > BULK_THRESHOLD:
+            bulk = _suspend_triggers()
+
+        with transaction() as conn:
+            conn.executemany(UPSERT_SQL, batch)
+        report.imported += len(batch)
+        batch.clear()
+        if progress:
+            progress(report)
+
+    try:
+        for line_no, record in read_records(path):
+            try:
+                batch.append(validate(record))
+            except ValueError as exc:
+                report.reject(line_no, str(exc))
+                continue
+
+            if len(batch) >= chunk_size:
+                flush()
+
+        if batch:
+            flush()
+    finally:
+        if bulk:
+            _resume_triggers()
+        # ghi thẳng bằng SQL nên phải tự xoá cache
+        Book.clear_cache()
+        report.elapsed = time.perf_counter() - started
+
+    return report
+
+
+def _suspend_triggers():
+    with transaction() as conn:
+        cur = conn.cursor()
+        if Book._has_search_index(conn):
+            v003_book_search.drop_triggers(cur)
+        v009_circulation_stats.drop_triggers(
+            cur, v009_circulation_stats.CATEGORY_TRIGGERS
+        )
+    return True
+
+
+def _resume_triggers():
+    # rebuild also picks up rows written by others while triggers were off
+    with transaction() as conn:
+        cur = conn.cursor()
+        if Book._has_search_index(conn):
+            v003_book_search.create_triggers(cur)
+            cur.execute("INSERT INTO BookSearch (BookSearch) VALUES ('rebuild')")
+        v009_circulation_stats.create_triggers(cur)
+        v009_circulation_stats.rebuild_categories(cur)
@@ -1,37 +1,144 @@
-from database import get_connection
+from database import connection, transaction
+from models import events
+from metrics import instrument
+from models.fine import Fine
+from models.hold import Hold
+from models.records import (
+    BorrowListing, BorrowRecord, HistoryEntry, fetch_all, fetch_one
+)
 from datetime import date, timedelta
 import uuid
 
+LOAN_DAYS = 7
+
+# số sách một member được mượn cùng lúc
+MAX_ACTIVE_LOANS = 5
+
+# kết quả của Borrow.borrow
+BORROW_OK = "ok"
+BORROW_UNAVAILABLE = "unavailable"
+BORROW_NOT_FOUND = "not_found"
+BORROW_LIMIT = "limit"
+
+# kết quả của Borrow.return_book / return_many
+RETURN_OK = "ok"
+RETURN_NOT_FOUND = "not_found"
+RETURN_ALREADY = "returned"
+
+# Category: thể loại của sách lúc mượn, cho thống kê (v009)
+INSERT_LOAN_SQL = """
+    INSERT INTO BorrowRecord
+    (BorrowID, UserID, BookID, BorrowDate, DueDate, ReturnDate, Status, Category)
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, (SELECT Category FROM Book WHERE BookID = ?3))
+"""
+
+# cột sắp xếp cho Borrow.query
+SORT_COLUMNS = {
+    "borrow_date": "b.BorrowDate",
+    "due_date": "b.DueDate",
+}
+
+# cột sắp xếp cho Borrow.get_by_user; NULL → '' / 0 để so sánh keyset được
+HISTORY_SORT_COLUMNS = {
+    "borrow_date": "br.BorrowDate",
+    "due_date": "br.DueDate",
+    "return_date": "COALESCE(br.ReturnDate, '')",
+    "title": "b.Title",
+    "status": "br.Status",
+    "fine": "COALESCE(f.Amount, 0)",
+}
+
+HISTORY_SQL = """
+    SELECT br.BorrowID, b.Title, br.BorrowDate, br.DueDate,
+           br.ReturnDate, br.Status, f.Amount
+    FROM BorrowRecord br
+    JOIN Book b ON br.BookID=b.BookID
+    LEFT JOIN Fine f ON f.BorrowID=br.BorrowID
+"""
+
+@instrument
 class Borrow:
 
     @staticmethod
-    def get_all(self):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("""
+    def get_all():
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT b.BorrowID, u.Username, bk.Title,
+                       b.BorrowDate, b.DueDate, b.ReturnDate, b.Status
+                FROM BorrowRecord b
+                JOIN Users u ON b.UserID = u.UserID
+                JOIN Book bk ON b.BookID = bk.BookID
+            """)
+            return fetch_all(cur, BorrowListing)
+    
+    @staticmethod
+    def query(status=None, username=None, title=None,
+              date_from=None, date_to=None, overdue_only=False,
+              sort="borrow_date", descending=True, after=None, limit=100):
+        """
+        Filtered page of borrow records for the admin screen. Filters are
+        pushed into SQL; rows are ordered by (sort column, BorrowID) and
+        `after` is the query_cursor() of the last row of the previous page.
+        `title` matches as a prefix; dates are ISO strings on BorrowDate.
+        """
+        column = SORT_COLUMNS[sort]
+        where = []
+        params = []
+
+        if status:
+            where.append("b.Status = ?")
+            params.append(status)
+        if overdue_only:
+            where.append("b.Status = 'Borrowed' AND b.DueDate < ?")
+            params.append(date.today().isoformat())
+        if username:
+            where.append("b.UserID = (SELECT UserID FROM Users WHERE Username = ?)")
+            params.append(username)
+        if title:
+            # prefix bằng range để dùng được idx_book_title
+            where.append("""b.BookID IN (
+                SELECT BookID FROM Book WHERE Title >= ? AND Title < ?
+            )""")
+            params.extend([title, title + "\U0010ffff"])
+        if date_from:
+            where.append("b.BorrowDate >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("b.BorrowDate <= ?")
+            params.append(date_to)
+        if after is not None:
+            op = "<" if descending else ">"
+            where.append(f"({column}, b.BorrowID) {op} (?, ?)")
+            params.extend(after)
+
+        direction = "DESC" if descending else "ASC"
+        sql = f"""
             SELECT b.BorrowID, u.Username, bk.Title,
-                   b.BorrowDate, b.Status
+                   b.BorrowDate, b.DueDate, b.ReturnDate, b.Status
             FROM BorrowRecord b
-            JOIN Users u ON b.UserID = u.UserID
-            JOIN Book bk ON b.BookID = bk.BookID
-        """)
-        rows = cur.fetchall()
-        conn.close()
-        return rows
-    
+            LEFT JOIN Users u ON b.UserID = u.UserID
+            LEFT JOIN Book bk ON b.BookID = bk.BookID
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY {column} {direction}, b.BorrowID {direction}
+            LIMIT ?
+        """
+        params.append(limit)
+
+        with connection() as conn:
+            return fetch_all(conn.execute(sql, params), BorrowListing)
+
     @staticmethod
-    def create(user_id, book_id):
-        conn = get_connection()
-        cur = conn.cursor()
+    def query_cursor(row, sort="borrow_date"):
+        value = row.borrow_date if sort == "borrow_date" else row.due_date
+        return (value, row.id)
 
+    @staticmethod
+    def _loan_row(user_id, book_id):
         borrow_id = str(uuid.uuid4())[:8]
         today = date.today()
-        due = today + timedelta(days=7)
-
-        cur.execute("""
-        INSERT INTO BorrowRecord
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
+        due = today + timedelta(days=LOAN_DAYS)
+        return (
             borrow_id,
             user_id,
             book_id,
@@ -39,65 +146,296 @@ class Borrow:
             due.isoformat(),
             None,
             "Borrowed"
-        ))
+        )
+
+    @staticmethod
+    def _insert(conn, user_id, book_id):
+        row = Borrow._loan_row(user_id, book_id)
+        conn.execute(INSERT_LOAN_SQL, row)
+        return row[0]
+
+    @staticmethod
+    def create(user_id, book_id):
+        with connection() as conn:
+            borrow_id = Borrow._insert(conn, user_id, book_id)
+        events.emit("BorrowRecord", events.CREATED, borrow_id)
+
+    @staticmethod
+    def borrow(user_id, book_id):
+        """
+        Check stock, take one copy (or the one set aside for the member's
+        Ready hold) and write the BorrowRecord in a single BEGIN IMMEDIATE
+        transaction. A Waiting hold of the member on the book is fulfilled
+        too, so it is never promoted later. Returns BORROW_OK,
+        BORROW_UNAVAILABLE, BORROW_NOT_FOUND or BORROW_LIMIT.
+        """
+        with transaction() as conn:
+            # UserLoanCount: O(1), không phải đếm BorrowRecord
+            active = conn.execute(
+                "SELECT Active FROM UserLoanCount WHERE UserID=?", (user_id,)
+            ).fetchone()
+            if active and active[0] >= MAX_ACTIVE_LOANS:
+                return BORROW_LIMIT
+
+            # copy set aside for this member's hold: already off the shelf
+            hold_id = Hold.claim(conn, user_id, book_id)
+
+            if not hold_id:
+                cur = conn.execute("""
+                UPDATE Book
+                SET AvailableCopies = AvailableCopies - 1
+                WHERE BookID=? AND AvailableCopies > 0
+                """, (book_id,))
+
+                if cur.rowcount == 0:
+                    exists = conn.execute(
+                        "SELECT 1 FROM Book WHERE BookID=?", (book_id,)
+                    ).fetchone()
+                    return BORROW_UNAVAILABLE if exists else BORROW_NOT_FOUND
 
-        conn.commit()
-        conn.close()
+            hold_ids = [hold_id] if hold_id else \
+                Hold.fulfil_waiting(conn, user_id, [book_id])
+            borrow_id = Borrow._insert(conn, user_id, book_id)
+
+        events.emit("Book", events.UPDATED, book_id)
+        events.emit("BorrowRecord", events.CREATED, borrow_id)
+        for hold_id in hold_ids:
+            events.emit("Hold", events.UPDATED, hold_id)
+        return BORROW_OK
 
     @staticmethod
-    def return_book(borrow_id):
-        conn = get_connection()
-        cur = conn.cursor()
+    def borrow_many(user_id, book_ids):
+        """
+        Check out a whole cart in one BEGIN IMMEDIATE transaction: the
+        member's loan count, stock and Ready holds are read once, then the
+        copies are taken and the loans written with executemany. Waiting
+        holds on books taken off the shelf are fulfilled as well. Returns
+        [(book_id, result)] in cart order, each result as for borrow();
+        books that cannot be borrowed are skipped, the others still are.
+        """
+        results = []
+        from_shelf = []
+        hold_ids = []
+        rows = []
+
+        with transaction() as conn:
+            active = conn.execute(
+                "SELECT Active FROM UserLoanCount WHERE UserID=?", (user_id,)
+            ).fetchone()
+            room = MAX_ACTIVE_LOANS - (active[0] if active else 0)
+
+            unique = list(dict.fromkeys(book_ids))
+            stock = dict(conn.execute(f"""
+            SELECT BookID, AvailableCopies FROM Book
+            WHERE BookID IN ({",".join("?" * len(unique))})
+            """, unique).fetchall()) if unique else {}
+            ready = Hold.ready_for(conn, user_id, unique)
+
+            # write lock đã giữ từ BEGIN IMMEDIATE → quyết định trước, ghi một lần
+            for book_id in book_ids:
+                if room <= 0:
+                    results.append((book_id, BORROW_LIMIT))
+                    continue
 
-        cur.execute("""
-        SELECT BookID, DueDate
-        FROM BorrowRecord
-        WHERE BorrowID=?
-        """, (borrow_id,))
-        book_id, due = cur.fetchone()
+                if book_id in ready:
+                    hold_ids.append(ready.pop(book_id))
+                elif book_id not in stock:
+                    results.append((book_id, BORROW_NOT_FOUND))
+                    continue
+                elif stock[book_id] <= 0:
+                    results.append((book_id, BORROW_UNAVAILABLE))
+                    continue
+                else:
+                    stock[book_id] -= 1
+                    from_shelf.append((book_id,))
 
+                room -= 1
+                rows.append(Borrow._loan_row(user_id, book_id))
+                results.append((book_id, BORROW_OK))
+
+            conn.executemany("""
+            UPDATE Book
+            SET AvailableCopies = AvailableCopies - 1
+            WHERE BookID=? AND AvailableCopies > 0
+            """, from_shelf)
+            Hold.fulfil_many(conn, hold_ids)
+            hold_ids += Hold.fulfil_waiting(
+                conn, user_id, list(dict.fromkeys(b for b, in from_shelf))
+            )
+            conn.executemany(INSERT_LOAN_SQL, rows)
+
+        for book_id in dict.fromkeys(row[2] for row in rows):
+            events.emit("Book", events.UPDATED, book_id)
+        for row in rows:
+            events.emit("BorrowRecord", events.CREATED, row[0])
+        for hold_id in hold_ids:
+            events.emit("Hold", events.UPDATED, hold_id)
+        return results
+
+    @staticmethod
+    def return_book(borrow_id, user_id=None):
+        """
+        Close one loan in a single BEGIN IMMEDIATE transaction. The UPDATE
+        only matches a loan that is still out (and belongs to user_id, if
+        given) and RETURNING hands back the book and due date, so there is
+        no SELECT first. Returning twice changes nothing. Returns RETURN_OK,
+        RETURN_ALREADY or RETURN_NOT_FOUND.
+        """
         today = date.today()
+        with transaction() as conn:
+            row = conn.execute("""
+            UPDATE BorrowRecord
+            SET ReturnDate=?, Status='Returned'
+            WHERE BorrowID=? AND Status='Borrowed'
+            AND (? IS NULL OR UserID=?)
+            RETURNING BookID, DueDate
+            """, (today.isoformat(), borrow_id, user_id, user_id)).fetchone()
 
-        # update borrow
-        cur.execute("""
-        UPDATE BorrowRecord
-        SET ReturnDate=?, Status='Returned'
-        WHERE BorrowID=?
-        """, (today.isoformat(), borrow_id))
-
-        # update book
-        cur.execute("""
-        UPDATE Book
-        SET AvailableCopies = AvailableCopies + 1
-        WHERE BookID=?
-        """, (book_id,))
-
-        # fine
-        if today > date.fromisoformat(due):
-            days = (today - date.fromisoformat(due)).days
-            fine_id = str(uuid.uuid4())[:8]
-            amount = days * 5000
+            if not row:
+                exists = conn.execute("""
+                SELECT 1 FROM BorrowRecord
+                WHERE BorrowID=? AND (? IS NULL OR UserID=?)
+                """, (borrow_id, user_id, user_id)).fetchone()
+                return RETURN_ALREADY if exists else RETURN_NOT_FOUND
 
-            cur.execute("""
-            INSERT INTO Fine VALUES (?, ?, ?, ?)
-            """, (fine_id, borrow_id, amount, "Unpaid"))
+            book_id, due = row
+
+            # trả sách: giữ cho người đầu hàng đợi, không thì lên kệ
+            hold_id = Hold.release_copy(conn, book_id)
+
+            # fine (có thể đã được fine engine tạo trước)
+            amount = Fine.amount_for(date.fromisoformat(due), today)
+            if amount:
+                Fine.record(conn, borrow_id, amount)
+
+        events.emit("Book", events.UPDATED, book_id)
+        events.emit("BorrowRecord", events.UPDATED, borrow_id)
+        if hold_id:
+            events.emit("Hold", events.UPDATED, hold_id)
+        return RETURN_OK
 
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def return_many(borrow_ids, user_id=None):
+        """
+        Return several loans in one transaction. The loans are read with a
+        single SELECT and closed with executemany; each copy then goes to
+        the next hold or back on the shelf, and late loans get their Fine.
+        With user_id, loans of other members count as not found. Returns
+        [(borrow_id, RETURN_OK | RETURN_NOT_FOUND | RETURN_ALREADY)].
+        """
+        unique = list(dict.fromkeys(borrow_ids))
+        results = {}
+        returned = []
+        released = []
+
+        today = date.today()
+        with transaction() as conn:
+            loans = {
+                row[0]: row for row in conn.execute(f"""
+                SELECT BorrowID, UserID, BookID, DueDate, Status
+                FROM BorrowRecord
+                WHERE BorrowID IN ({",".join("?" * len(unique))})
+                """, unique)
+            } if unique else {}
+
+            for borrow_id in unique:
+                loan = loans.get(borrow_id)
+                if not loan or (user_id and loan[1] != user_id):
+                    results[borrow_id] = RETURN_NOT_FOUND
+                elif loan[4] != "Borrowed":
+                    results[borrow_id] = RETURN_ALREADY
+                else:
+                    results[borrow_id] = RETURN_OK
+                    returned.append(loan)
+
+            conn.executemany("""
+            UPDATE BorrowRecord
+            SET ReturnDate=?, Status='Returned'
+            WHERE BorrowID=? AND Status='Borrowed'
+            """, [(today.isoformat(), loan[0]) for loan in returned])
+
+            # mỗi bản trả về: giữ cho hàng đợi hoặc lên kệ
+            for loan in returned:
+                released.append((loan[2], Hold.release_copy(conn, loan[2])))
+
+            fines = []
+            for loan in returned:
+                amount = Fine.amount_for(date.fromisoformat(loan[3]), today)
+                if amount:
+                    fines.append((loan[0], amount))
+            Fine.record_many(conn, fines)
+
+        for book_id, hold_id in released:
+            events.emit("Book", events.UPDATED, book_id)
+            if hold_id:
+                events.emit("Hold", events.UPDATED, hold_id)
+        for loan in returned:
+            events.emit("BorrowRecord", events.UPDATED, loan[0])
+        return [(borrow_id, results[borrow_id]) for borrow_id in unique]
+
+    @staticmethod
+    def get_by_id(borrow_id):
+        with connection() as conn:
+            cur = conn.execute("""
+            SELECT BorrowID, UserID, BookID, BorrowDate,
+                   DueDate, ReturnDate, Status
+            FROM BorrowRecord
+            WHERE BorrowID=?
+            """, (borrow_id,))
+            return fetch_one(cur, BorrowRecord)
+
+    @staticmethod
+    def get_by_user(user_id, sort="borrow_date", descending=True,
+                    after=None, limit=None):
+        """
+        A member's borrow history with the fine of each loan, ordered by
+        (sort column, BorrowID). Pages by keyset like query(): `after` is
+        the history_cursor() of the last row of the previous page. The
+        default order walks idx_borrow_user_date, so a page costs the same
+        for a heavy reader as for a new member; other sorts order only
+        that member's loans. limit=None returns everything.
+        """
+        column = HISTORY_SORT_COLUMNS[sort]
+        where = "br.UserID=?"
+        params = [user_id]
+
+        if after is not None:
+            op = "<" if descending else ">"
+            where += f" AND ({column}, br.BorrowID) {op} (?, ?)"
+            params.extend(after)
+
+        direction = "DESC" if descending else "ASC"
+        sql = f"""
+            {HISTORY_SQL}
+            WHERE {where}
+            ORDER BY {column} {direction}, br.BorrowID {direction}
+        """
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with connection() as conn:
+            return fetch_all(conn.execute(sql, params), HistoryEntry)
+
+    @staticmethod
+    def history_cursor(row, sort="borrow_date"):
+        # giống biểu thức trong HISTORY_SORT_COLUMNS
+        value = {
+            "borrow_date": row.borrow_date,
+            "due_date": row.due_date,
+            "return_date": row.return_date or "",
+            "title": row.title,
+            "status": row.status,
+            "fine": row.fine or 0,
+        }[sort]
+        return (value, row.id)
 
     @staticmethod
-    def get_by_user(user_id):
-        conn = get_connection()
-        cur = conn.cursor()
-
-        cur.execute("""
-        SELECT br.BorrowID, b.Title, br.BorrowDate,
-               br.ReturnDate, br.Status
-        FROM BorrowRecord br
-        JOIN Book b ON br.BookID=b.BookID
-        WHERE br.UserID=?
-        """, (user_id,))
-
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+    def get_history_entry(borrow_id, user_id=None):
+        """One row of get_by_user(), to refresh it after a change."""
+        with connection() as conn:
+            cur = conn.execute(f"""
+            {HISTORY_SQL}
+            WHERE br.BorrowID=? AND (? IS NULL OR br.UserID=?)
+            """, (borrow_id, user_id, user_id))
+            return fetch_one(cur, HistoryEntry)
@@ -0,0 +1,68 @@
+"""
+Row-level change notifications.
+
+Models call emit() after a write is committed; views subscribe() to the
+tables they display and patch just the affected row. Callbacks run on the
+thread that made the change (often a worker), so Tk views should hop back
+to the main loop, e.g. with TaskRunner.call_soon.
+
+When several writes share one outer transaction, wrap them in deferred()
+and publish() the collected changes once that transaction has committed,
+so no subscriber sees (or caches) rows that could still be rolled back.
+"""
+import threading
+from contextlib import contextmanager
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+_subscribers = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def subscribe(table, callback):
+    """callback(action, key) is called for every change to `table`.
+    Returns a function that removes the subscription."""
+    with _lock:
+        _subscribers.setdefault(table, []).append(callback)
+
+    def unsubscribe():
+        with _lock:
+            callbacks = _subscribers.get(table, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    return unsubscribe
+
+
+@contextmanager
+def deferred():
+    """
+    Collect this thread's emit() calls made inside the block instead of
+    delivering them. Yields the list of (table, action, key).
+    """
+    outer = getattr(_local, "pending", None)
+    _local.pending = pending = []
+    try:
+        yield pending
+    finally:
+        _local.pending = outer
+
+
+def publish(changes):
+    for table, action, key in changes:
+        emit(table, action, key)
+
+
+def emit(table, action, key):
+    pending = getattr(_local, "pending", None)
+    if pending is not None:
+        pending.append((table, action, key))
+        return
+
+    with _lock:
+        callbacks = list(_subscribers.get(table, ()))
+    for callback in callbacks:
+        callback(action, key)
@@ -0,0 +1,86 @@
+import csv
+import json
+from database import connection
+
+# số dòng đọc mỗi lần từ cursor
+FETCH_SIZE = 5000
+
+EXPORT_COLUMNS = (
+    "BorrowID", "UserID", "Username", "BookID", "Title",
+    "BorrowDate", "DueDate", "ReturnDate", "Status",
+    "FineID", "FineAmount", "FineStatus",
+)
+
+FORMATS = ("csv", "jsonl")
+
+
+def iter_borrow_history(date_from=None, date_to=None, status=None):
+    """
+    Yield BorrowRecord rows joined with member, book and fine, ordered by
+    BorrowDate. Rows are pulled FETCH_SIZE at a time, so memory stays flat
+    no matter how many records match.
+    """
+    where = []
+    params = []
+    if date_from:
+        where.append("b.BorrowDate >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append("b.BorrowDate <= ?")
+        params.append(date_to)
+    if status:
+        where.append("b.Status = ?")
+        params.append(status)
+
+    sql = f"""
+        SELECT b.BorrowID, b.UserID, u.Username, b.BookID, bk.Title,
+               b.BorrowDate, b.DueDate, b.ReturnDate, b.Status,
+               f.FineID, f.Amount, f.Status
+        FROM BorrowRecord b
+        LEFT JOIN Users u ON u.UserID = b.UserID
+        LEFT JOIN Book bk ON bk.BookID = b.BookID
+        LEFT JOIN Fine f ON f.BorrowID = b.BorrowID
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY b.BorrowDate, b.BorrowID
+    """
+
+    with connection() as conn:
+        cur = conn.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            yield from rows
+
+
+def export_history(path, fmt="csv", date_from=None, date_to=None,
+                   status=None, progress=None):
+    """
+    Stream the borrow + fine history to a CSV or JSONL file. Returns the
+    number of rows written; progress(count) is called every FETCH_SIZE rows.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    count = 0
+    rows = iter_borrow_history(date_from, date_to, status)
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            write = writer.writerow
+        else:
+            def write(row):
+                f.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False))
+                f.write("\n")
+
+        for row in rows:
+            write(row)
+            count += 1
+            if progress and count % FETCH_SIZE == 0:
+                progress(count)
+
+    if progress:
+        progress(count)
+    return count
@@ -0,0 +1,63 @@
+from database import transaction
+from metrics import instrument
+from datetime import date
+
+# tiền phạt mỗi ngày trễ hạn
+FINE_PER_DAY = 5000
+
+# One fine per loan, so FineID is derived from BorrowID.
+# Upsert the fine of every open, overdue loan in one statement. Paid fines
+# are left alone and unchanged amounts are not rewritten, so running it
+# again for the same day is a no-op.
+ASSESS_SQL = """
+    INSERT INTO Fine (FineID, BorrowID, Amount, Status)
+    SELECT 'F-' || BorrowID,
+           BorrowID,
+           CAST(julianday(:today) - julianday(DueDate) AS INTEGER) * :rate,
+           'Unpaid'
+    FROM BorrowRecord
+    WHERE Status = 'Borrowed' AND DueDate < :today
+    ON CONFLICT (BorrowID) DO UPDATE SET Amount = excluded.Amount
+    WHERE Fine.Status = 'Unpaid' AND Fine.Amount <> excluded.Amount
+"""
+
+
+@instrument
+class Fine:
+
+    @staticmethod
+    def amount_for(due, returned):
+        days = (returned - due).days
+        return days * FINE_PER_DAY if days > 0 else 0
+
+    @staticmethod
+    def record(conn, borrow_id, amount):
+        """Create or update the fine of one loan (inside the caller's transaction)."""
+        conn.execute("""
+        INSERT INTO Fine (FineID, BorrowID, Amount, Status)
+        VALUES ('F-' || ?, ?, ?, 'Unpaid')
+        ON CONFLICT (BorrowID) DO UPDATE SET Amount = excluded.Amount
+        WHERE Fine.Status = 'Unpaid'
+        """, (borrow_id, borrow_id, amount))
+
+    @staticmethod
+    def record_many(conn, fines):
+        """record() for [(borrow_id, amount)] with a single executemany."""
+        conn.executemany("""
+        INSERT INTO Fine (FineID, BorrowID, Amount, Status)
+        VALUES ('F-' || ?, ?, ?, 'Unpaid')
+        ON CONFLICT (BorrowID) DO UPDATE SET Amount = excluded.Amount
+        WHERE Fine.Status = 'Unpaid'
+        """, [(borrow_id, borrow_id, amount) for borrow_id, amount in fines])
+
+    @staticmethod
+    def assess_overdue(as_of=None):
+        """
+        Bring the fines of all loans still out and past due up to date as
+        of `as_of` (default today). Returns the number of Fine rows
+        created or changed.
+        """
+        today = (as_of or date.today()).isoformat()
+        with transaction() as conn:
+            cur = conn.execute(ASSESS_SQL, {"today": today, "rate": FINE_PER_DAY})
+            return cur.rowcount
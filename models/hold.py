@@ -0,0 +1,217 @@
+from database import connection, transaction
+from metrics import instrument
+from models import events
+from models.records import HoldRecord, fetch_all
+from datetime import date, timedelta
+import uuid
+
+# số ngày giữ sách đã sẵn sàng cho member đến lấy
+HOLD_READY_DAYS = 3
+
+# kết quả của Hold.place
+HOLD_OK = "ok"
+HOLD_EXISTS = "exists"
+HOLD_AVAILABLE = "available"
+HOLD_ON_LOAN = "on_loan"
+HOLD_NOT_FOUND = "not_found"
+
+# Waiting -> Ready (copy set aside) -> Fulfilled (borrowed)
+#                                   -> Expired (not picked up in time)
+# Waiting / Ready -> Cancelled
+OPEN_STATUSES = ("Waiting", "Ready")
+
+
+@instrument
+class Hold:
+    """
+    Per-book FIFO queue of members waiting for a copy. idx_hold_queue
+    (BookID, Status, Position) keeps each queue ordered, so finding the
+    next hold or the end of the queue is one O(log n) index seek.
+    """
+
+    @staticmethod
+    def place(user_id, book_id):
+        """
+        Returns HOLD_OK, HOLD_EXISTS, HOLD_ON_LOAN (the member already has
+        the book out), HOLD_AVAILABLE or HOLD_NOT_FOUND.
+        """
+        with transaction() as conn:
+            book = conn.execute(
+                "SELECT AvailableCopies FROM Book WHERE BookID=?", (book_id,)
+            ).fetchone()
+            if not book:
+                return HOLD_NOT_FOUND
+            if book[0] > 0:
+                return HOLD_AVAILABLE
+
+            exists = conn.execute("""
+            SELECT 1 FROM Hold
+            WHERE UserID=? AND BookID=? AND Status IN ('Waiting', 'Ready')
+            """, (user_id, book_id)).fetchone()
+            if exists:
+                return HOLD_EXISTS
+
+            on_loan = conn.execute("""
+            SELECT 1 FROM BorrowRecord
+            WHERE UserID=? AND BookID=? AND Status='Borrowed'
+            """, (user_id, book_id)).fetchone()
+            if on_loan:
+                return HOLD_ON_LOAN
+
+            position = conn.execute("""
+            SELECT COALESCE(MAX(Position), 0) + 1 FROM Hold
+            WHERE BookID=? AND Status='Waiting'
+            """, (book_id,)).fetchone()[0]
+
+            hold_id = str(uuid.uuid4())[:8]
+            conn.execute("""
+            INSERT INTO Hold
+            (HoldID, UserID, BookID, Position, Status, CreatedAt, ReadyAt)
+            VALUES (?, ?, ?, ?, 'Waiting', ?, NULL)
+            """, (hold_id, user_id, book_id, position, date.today().isoformat()))
+
+        events.emit("Hold", events.CREATED, hold_id)
+        return HOLD_OK
+
+    @staticmethod
+    def release_copy(conn, book_id):
+        """
+        A copy of book_id came back (inside the caller's transaction): set
+        it aside for the next waiting member, or put it back on the shelf.
+        Returns the HoldID that got the copy, or None.
+        """
+        row = conn.execute("""
+        SELECT HoldID FROM Hold
+        WHERE BookID=? AND Status='Waiting'
+        ORDER BY Position
+        LIMIT 1
+        """, (book_id,)).fetchone()
+
+        if row:
+            conn.execute(
+                "UPDATE Hold SET Status='Ready', ReadyAt=? WHERE HoldID=?",
+                (date.today().isoformat(), row[0])
+            )
+            return row[0]
+
+        conn.execute("""
+        UPDATE Book
+        SET AvailableCopies = AvailableCopies + 1
+        WHERE BookID=?
+        """, (book_id,))
+        return None
+
+    @staticmethod
+    def claim(conn, user_id, book_id):
+        """Turn the member's Ready hold into a loan; returns its HoldID or None."""
+        row = conn.execute("""
+        UPDATE Hold SET Status='Fulfilled'
+        WHERE UserID=? AND BookID=? AND Status='Ready'
+        RETURNING HoldID
+        """, (user_id, book_id)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def ready_for(conn, user_id, book_ids):
+        """{BookID: HoldID} of the member's Ready holds on any of book_ids."""
+        if not book_ids:
+            return {}
+        rows = conn.execute(f"""
+        SELECT BookID, HoldID FROM Hold
+        WHERE UserID=? AND Status='Ready'
+        AND BookID IN ({",".join("?" * len(book_ids))})
+        """, (user_id, *book_ids)).fetchall()
+        return dict(rows)
+
+    @staticmethod
+    def fulfil_many(conn, hold_ids):
+        conn.executemany(
+            "UPDATE Hold SET Status='Fulfilled' WHERE HoldID=? AND Status='Ready'",
+            [(hold_id,) for hold_id in hold_ids]
+        )
+
+    @staticmethod
+    def fulfil_waiting(conn, user_id, book_ids):
+        """
+        The member took copies of book_ids off the shelf: their Waiting
+        holds on those books are done. Returns the HoldIDs closed.
+        """
+        if not book_ids:
+            return []
+        rows = conn.execute(f"""
+        UPDATE Hold SET Status='Fulfilled'
+        WHERE UserID=? AND Status='Waiting'
+        AND BookID IN ({",".join("?" * len(book_ids))})
+        RETURNING HoldID
+        """, (user_id, *book_ids)).fetchall()
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def cancel(hold_id, user_id):
+        with transaction() as conn:
+            row = conn.execute("""
+            SELECT BookID, Status FROM Hold
+            WHERE HoldID=? AND UserID=? AND Status IN ('Waiting', 'Ready')
+            """, (hold_id, user_id)).fetchone()
+            if not row:
+                return False
+
+            book_id, status = row
+            conn.execute(
+                "UPDATE Hold SET Status='Cancelled' WHERE HoldID=?", (hold_id,)
+            )
+            passed_to = Hold.release_copy(conn, book_id) if status == "Ready" else None
+
+        events.emit("Hold", events.UPDATED, hold_id)
+        if status == "Ready":
+            Hold._emit_released(book_id, passed_to)
+        return True
+
+    @staticmethod
+    def expire_ready(as_of=None):
+        """Expire Ready holds not picked up within HOLD_READY_DAYS."""
+        cutoff = ((as_of or date.today()) - timedelta(days=HOLD_READY_DAYS)).isoformat()
+        expired = []
+        with transaction() as conn:
+            rows = conn.execute("""
+            SELECT HoldID, BookID FROM Hold
+            WHERE Status='Ready' AND ReadyAt < ?
+            """, (cutoff,)).fetchall()
+            for hold_id, book_id in rows:
+                conn.execute(
+                    "UPDATE Hold SET Status='Expired' WHERE HoldID=?", (hold_id,)
+                )
+                expired.append((hold_id, book_id, Hold.release_copy(conn, book_id)))
+
+        for hold_id, book_id, passed_to in expired:
+            events.emit("Hold", events.UPDATED, hold_id)
+            Hold._emit_released(book_id, passed_to)
+        return len(expired)
+
+    @staticmethod
+    def get_by_user(user_id):
+        """
+        Open holds of a member as HoldRecords. position is 1 for the next
+        in line and 0 once the copy is Ready.
+        """
+        with connection() as conn:
+            cur = conn.execute("""
+            SELECT h.HoldID, h.BookID, b.Title, h.Status, h.CreatedAt, h.ReadyAt,
+                CASE WHEN h.Status = 'Waiting' THEN (
+                    SELECT COUNT(*) FROM Hold q
+                    WHERE q.BookID = h.BookID AND q.Status = 'Waiting'
+                    AND q.Position <= h.Position
+                ) ELSE 0 END
+            FROM Hold h
+            JOIN Book b ON b.BookID = h.BookID
+            WHERE h.UserID=? AND h.Status IN ('Waiting', 'Ready')
+            ORDER BY h.Status, h.CreatedAt
+            """, (user_id,))
+            return fetch_all(cur, HoldRecord)
+
+    @staticmethod
+    def _emit_released(book_id, passed_to):
+        if passed_to:
+            events.emit("Hold", events.UPDATED, passed_to)
+        else:
+            events.emit("Book", events.UPDATED, book_id)
@@ -0,0 +1,73 @@
+from database import connection, transaction
+from metrics import instrument
+
+# (counter table, key column) — cả hai được trigger trên BorrowRecord cập nhật
+COUNTERS = (
+    ("UserLoanCount", "UserID"),
+    ("BookLoanCount", "BookID"),
+)
+
+
+@instrument
+class LoanCount:
+    """
+    Active-loan counters per member and per book. Triggers on BorrowRecord
+    keep them up to date (migration v006). check() and rebuild() compare
+    them with, and recompute them from, BorrowRecord.
+    """
+
+    @staticmethod
+    def for_user(user_id):
+        with connection() as conn:
+            row = conn.execute(
+                "SELECT Active FROM UserLoanCount WHERE UserID=?", (user_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def for_book(book_id):
+        with connection() as conn:
+            row = conn.execute(
+                "SELECT Active FROM BookLoanCount WHERE BookID=?", (book_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def total_active():
+        with connection() as conn:
+            row = conn.execute("SELECT SUM(Active) FROM UserLoanCount").fetchone()
+        return row[0] or 0
+
+    @staticmethod
+    def check():
+        """Return [(table, key, stored, actual)] for every counter that is off."""
+        mismatches = []
+        with connection() as conn:
+            for table, key in COUNTERS:
+                rows = conn.execute(f"""
+                    SELECT k, SUM(stored), SUM(actual) FROM (
+                        SELECT {key} AS k, Active AS stored, 0 AS actual
+                        FROM {table}
+                        UNION ALL
+                        SELECT {key}, 0, COUNT(*)
+                        FROM BorrowRecord
+                        WHERE Status = 'Borrowed'
+                        GROUP BY {key}
+                    )
+                    GROUP BY k
+                    HAVING SUM(stored) <> SUM(actual)
+                """).fetchall()
+                mismatches.extend((table, *row) for row in rows)
+        return mismatches
+
+    @staticmethod
+    def rebuild():
+        with transaction() as conn:
+            for table, key in COUNTERS:
+                conn.execute(f"DELETE FROM {table}")
+                conn.execute(f"""
+                    INSERT INTO {table} ({key}, Active)
+                    SELECT {key}, COUNT(*) FROM BorrowRecord
+                    WHERE Status = 'Borrowed'
+                    GROUP BY {key}
+                """)
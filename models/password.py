@@ -0,0 +1,61 @@
+"""
+Password hashing with a configurable bcrypt work factor.
+
+LIBRARY_BCRYPT_ROUNDS overrides the cost. Hashes made with another cost
+still verify; User.login re-hashes them with the current one. hash_many()
+spreads bulk hashing (seed data, user import) over a process pool.
+"""
+import os
+
+BCRYPT_ROUNDS = int(os.environ.get("LIBRARY_BCRYPT_ROUNDS", "12"))
+
+# dưới ngưỡng này hash tuần tự, không đáng mở process pool
+POOL_THRESHOLD = 8
+
+
+# bcrypt / multiprocessing are imported on first use, not at app startup
+def hash_password(password, rounds=None):
+    import bcrypt
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode(), salt).decode()
+
+
+def check_password(password, hashed):
+    import bcrypt
+    return bcrypt.checkpw(password.encode(), hashed.encode())
+
+
+def get_rounds(hashed):
+    # $2b$12$<salt+hash>
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(hashed, rounds=None):
+    return get_rounds(hashed) != (rounds or BCRYPT_ROUNDS)
+
+
+def _hash_with_rounds(args):
+    password, rounds = args
+    return hash_password(password, rounds)
+
+
+def hash_many(passwords, rounds=None, workers=None):
+    """Hash a list of passwords, in parallel across CPU cores when it is long."""
+    rounds = rounds or BCRYPT_ROUNDS
+    jobs = [(p, rounds) for p in passwords]
+
+    if len(jobs) < POOL_THRESHOLD:
+        return [_hash_with_rounds(job) for job in jobs]
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    # spawn: the GUI process has worker threads, forking it is not safe
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        return list(pool.map(_hash_with_rounds, jobs, chunksize=chunksize))
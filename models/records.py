@@ -0,0 +1,173 @@
+"""
+Typed rows returned by the model queries.
+
+Each class has fixed __slots__ (no per-row __dict__), so a record is about
+as small as the tuple it replaces, but callers read `book.available`
+instead of `book[5]`. Queries attach them with sqlite3's row_factory:
+
+    cur = conn.execute("SELECT BookID, Title, ... FROM Book")
+    return fetch_all(cur, BookRecord)
+
+Iterating a record yields its fields in slot order, so unpacking and
+csv/zip-based code keep working.
+"""
+
+
+class Record:
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, cursor, row):
+        # sqlite3 row_factory signature
+        return cls(*row)
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class BookRecord(Record):
+    # detail chỉ có khi query chọn cột Detail (get_by_id)
+    __slots__ = ("id", "title", "author", "category", "total", "available", "detail")
+
+    def __init__(self, id, title, author, category, total, available, detail=None):
+        self.id = id
+        self.title = title
+        self.author = author
+        self.category = category
+        self.total = total
+        self.available = available
+        self.detail = detail
+
+
+class UserRecord(Record):
+    __slots__ = ("id", "username", "role")
+
+    def __init__(self, id, username, role):
+        self.id = id
+        self.username = username
+        self.role = role
+
+
+class BorrowRecord(Record):
+    __slots__ = (
+        "id", "user_id", "book_id", "borrow_date", "due_date", "return_date", "status"
+    )
+
+    def __init__(self, id, user_id, book_id, borrow_date, due_date,
+                 return_date, status):
+        self.id = id
+        self.user_id = user_id
+        self.book_id = book_id
+        self.borrow_date = borrow_date
+        self.due_date = due_date
+        self.return_date = return_date
+        self.status = status
+
+
+class BorrowListing(Record):
+    """Borrow record joined with the member's username and the book title."""
+    __slots__ = (
+        "id", "username", "title", "borrow_date", "due_date", "return_date", "status"
+    )
+
+    def __init__(self, id, username, title, borrow_date, due_date,
+                 return_date, status):
+        self.id = id
+        self.username = username
+        self.title = title
+        self.borrow_date = borrow_date
+        self.due_date = due_date
+        self.return_date = return_date
+        self.status = status
+
+
+class HistoryEntry(Record):
+    """One line of a member's borrow history; fine is None when there is none."""
+    __slots__ = (
+        "id", "title", "borrow_date", "due_date", "return_date", "status", "fine"
+    )
+
+    def __init__(self, id, title, borrow_date, due_date, return_date, status,
+                 fine=None):
+        self.id = id
+        self.title = title
+        self.borrow_date = borrow_date
+        self.due_date = due_date
+        self.return_date = return_date
+        self.status = status
+        self.fine = fine
+
+
+class HoldRecord(Record):
+    __slots__ = (
+        "id", "book_id", "title", "status", "created_at", "ready_at", "position"
+    )
+
+    def __init__(self, id, book_id, title, status, created_at, ready_at, position):
+        self.id = id
+        self.book_id = book_id
+        self.title = title
+        self.status = status
+        self.created_at = created_at
+        self.ready_at = ready_at
+        self.position = position
+
+
+class TitleStat(Record):
+    __slots__ = ("book_id", "title", "loans")
+
+    def __init__(self, book_id, title, loans):
+        self.book_id = book_id
+        self.title = title
+        self.loans = loans
+
+
+class CategoryStat(Record):
+    # turnover = loans / copies trong khoảng thời gian
+    __slots__ = ("category", "titles", "copies", "loans", "turnover")
+
+    def __init__(self, category, titles, copies, loans, turnover):
+        self.category = category
+        self.titles = titles
+        self.copies = copies
+        self.loans = loans
+        self.turnover = turnover
+
+
+class PeriodStat(Record):
+    """Loans and fines of one 'YYYY-MM' period."""
+    __slots__ = (
+        "period", "loans", "returned", "avg_days", "late", "assessed", "paid"
+    )
+
+    def __init__(self, period, loans, returned, avg_days, late, assessed, paid):
+        self.period = period
+        self.loans = loans
+        self.returned = returned
+        self.avg_days = avg_days
+        self.late = late
+        self.assessed = assessed
+        self.paid = paid
+
+
+def fetch_all(cur, cls):
+    cur.row_factory = cls.from_row
+    return cur.fetchall()
+
+
+def fetch_one(cur, cls):
+    cur.row_factory = cls.from_row
+    return cur.fetchone()
@@ -1,7 +1,11 @@
-import bcrypt
 import uuid
-from database import get_connection
+from database import connection
+from models import events
+from metrics import instrument
+from models import password as passwords
+from models.records import UserRecord, fetch_all, fetch_one
 
+@instrument
 class User:
     def __init__(self, user_id, username, role):
         self.id = user_id
@@ -10,22 +14,19 @@ class User:
 
     @staticmethod
     def hash_password(password):
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        return passwords.hash_password(password)
 
     @staticmethod
     def check_password(password, hashed):
-        return bcrypt.checkpw(password.encode(), hashed.encode())
+        return passwords.check_password(password, hashed)
 
     @staticmethod
     def login(username, password):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT UserID, Username, Password, Role FROM Users WHERE Username=?",
-            (username,)
-        )
-        row = cur.fetchone()
-        conn.close()
+        with connection() as conn:
+            row = conn.execute(
+                "SELECT UserID, Username, Password, Role FROM Users WHERE Username=?",
+                (username,)
+            ).fetchone()
 
         if not row:
             return None
@@ -33,61 +34,90 @@ class User:
         if not User.check_password(password, row[2]):
             return None
 
+        # hash cũ dùng cost khác → hash lại với cost hiện tại
+        if passwords.needs_rehash(row[2]):
+            with connection() as conn:
+                conn.execute(
+                    "UPDATE Users SET Password=? WHERE UserID=? AND Password=?",
+                    (User.hash_password(password), row[0], row[2])
+                )
+
         return User(row[0], row[1], row[3])
 
     @staticmethod
     def get_password_hash(user_id):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT Password FROM Users WHERE UserID=?", (user_id,))
-        row = cur.fetchone()
-        conn.close()
+        with connection() as conn:
+            row = conn.execute(
+                "SELECT Password FROM Users WHERE UserID=?", (user_id,)
+            ).fetchone()
         return row[0]
 
+    @staticmethod
+    def get_by_id(user_id):
+        with connection() as conn:
+            cur = conn.execute(
+                "SELECT UserID, Username, Role FROM Users WHERE UserID=?",
+                (user_id,)
+            )
+            return fetch_one(cur, UserRecord)
+
     @staticmethod
     def change_password(user_id, new_password):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE Users SET Password=? WHERE UserID=?",
-            (User.hash_password(new_password), user_id)
-        )
-        conn.commit()
-        conn.close()
+        password_hash = User.hash_password(new_password)
+        with connection() as conn:
+            conn.execute(
+                "UPDATE Users SET Password=? WHERE UserID=?",
+                (password_hash, user_id)
+            )
     
     @staticmethod
     def get_all():
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT UserID, Username, Role FROM Users")
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+        with connection() as conn:
+            cur = conn.execute("SELECT UserID, Username, Role FROM Users")
+            return fetch_all(cur, UserRecord)
 
     @staticmethod
     def delete(user_id):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("DELETE FROM Users WHERE UserID = ?", (user_id,))
-        conn.commit()
-        conn.close()
+        with connection() as conn:
+            conn.execute("DELETE FROM Users WHERE UserID = ?", (user_id,))
+        events.emit("Users", events.DELETED, user_id)
 
     @staticmethod
     def create(username, password, role):
-        conn = get_connection()
-        cur = conn.cursor()
-
+        user_id = str(uuid.uuid4())
         password_hash = User.hash_password(password)
 
-        cur.execute("""
-            INSERT INTO Users (UserID, Username, Password, Role)
-            VALUES (?, ?, ?, ?)
-        """, (
-            str(uuid.uuid4()),
-            username,
-            password_hash,
-            role
-        ))
-
-        conn.commit()
-        conn.close()
\ No newline at end of file
+        with connection() as conn:
+            conn.execute("""
+                INSERT INTO Users (UserID, Username, Password, Role)
+                VALUES (?, ?, ?, ?)
+            """, (
+                user_id,
+                username,
+                password_hash,
+                role
+            ))
+        events.emit("Users", events.CREATED, user_id)
+        return user_id
+
+    @staticmethod
+    def create_many(users):
+        """
+        Bulk-create (username, password, role) tuples. Passwords are hashed
+        on a process pool and inserted in one transaction.
+        """
+        hashes = passwords.hash_many([u[1] for u in users])
+        rows = [
+            (str(uuid.uuid4()), username, password_hash, role)
+            for (username, _, role), password_hash in zip(users, hashes)
+        ]
+
+        with connection() as conn:
+            conn.executemany("""
+                INSERT INTO Users (UserID, Username, Password, Role)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+
+        for row in rows:
+            events.emit("Users", events.CREATED, row[0])
+        return [row[0] for row in rows]
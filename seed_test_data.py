@@ -1,16 +1,21 @@
-from database import get_connection
+from database import connection
 from datetime import date, timedelta
-from models.user import User
+from models.password import hash_many
 
 def seed_data():
-    conn = get_connection()
-    cur = conn.cursor()
+    with connection() as conn:
+        _seed(conn.cursor())
+    print("✅ Seed data inserted successfully!")
+
+
+def _seed(cur):
 
     # ======================
     # CLEAR OLD DATA
     # ======================
     cur.execute("DELETE FROM Fine")
     cur.execute("DELETE FROM BorrowRecord")
+    cur.execute("DELETE FROM Hold")
     cur.execute("DELETE FROM Book")
     cur.execute("DELETE FROM Users")
 
@@ -18,15 +23,16 @@ def seed_data():
     # USERS
     # ======================
     users = [
-        ("U001", "admin", User.hash_password("123"), "admin"),
-        ("U002", "member1", User.hash_password("123"), "user"),
-        ("U003", "member2", User.hash_password("123"), "user"),
-        ("U004", "member3", User.hash_password("123"), "user"),
+        ("U001", "admin", "123", "admin"),
+        ("U002", "member1", "123", "user"),
+        ("U003", "member2", "123", "user"),
+        ("U004", "member3", "123", "user"),
     ]
+    hashes = hash_many([u[2] for u in users])
 
     cur.executemany(
         "INSERT INTO Users(UserID, Username, Password, Role) VALUES (?, ?, ?, ?)",
-        users
+        [(u[0], u[1], h, u[3]) for u, h in zip(users, hashes)]
     )
 
     # ======================
@@ -108,9 +114,6 @@ def seed_data():
         fines
     )
 
-    conn.commit()
-    conn.close()
-    print("✅ Seed data inserted successfully!")
 
 if __name__ == "__main__":
     seed_data()
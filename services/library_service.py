@@ -0,0 +1,173 @@
+"""
+UI-free business logic shared by the Tk controllers and the HTTP API.
+
+Methods return plain data and raise ServiceError for anything the user
+should be told about; callers decide how to show it (messagebox, JSON).
+"""
+from models.book import Book
+from models.borrow import (
+    Borrow, BORROW_OK, BORROW_NOT_FOUND, BORROW_LIMIT, MAX_ACTIVE_LOANS,
+    RETURN_NOT_FOUND
+)
+from models.hold import (
+    Hold, HOLD_AVAILABLE, HOLD_EXISTS, HOLD_NOT_FOUND, HOLD_ON_LOAN
+)
+from models.user import User
+
+ROLES = ("admin", "user")
+
+
+class ServiceError(Exception):
+    # code: invalid | unauthorized | forbidden | not_found | conflict
+    def __init__(self, title, message, code="invalid"):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+        self.code = code
+
+
+class LibraryService:
+    def __init__(self):
+        self.books = Book()
+
+    # ===== AUTH =====
+    def login(self, username, password):
+        user = User.login(username, password)
+        if not user:
+            raise ServiceError("Error", "Invalid login", "unauthorized")
+        return user
+
+    def change_password(self, user, old_pw, new_pw):
+        self._require_login(user)
+        if not new_pw:
+            raise ServiceError("Invalid data", "New password is required")
+        current_hash = User.get_password_hash(user.id)
+        if not User.check_password(old_pw, current_hash):
+            raise ServiceError("Error", "Old password incorrect", "forbidden")
+        User.change_password(user.id, new_pw)
+
+    # ===== BOOKS =====
+    def list_books(self, after=None, limit=100):
+        return self.books.get_page(after, limit)
+
+    def search_books(self, query, limit=50, offset=0):
+        return self.books.search(query, limit, offset)
+
+    def get_book(self, book_id):
+        # BookRecord (cached) — không tạo dict mới mỗi lần xem chi tiết
+        book = self.books.get_by_id(book_id)
+        if not book:
+            raise ServiceError("Not found", "This book no longer exists", "not_found")
+        return book
+
+    # ===== BORROW / RETURN =====
+    def borrow(self, user, book_id):
+        self._require_member(user, "Only members can borrow books")
+
+        result = Borrow.borrow(user.id, book_id)
+        if result == BORROW_NOT_FOUND:
+            raise ServiceError("Not found", "This book no longer exists", "not_found")
+        if result == BORROW_LIMIT:
+            raise ServiceError(
+                "Limit reached",
+                f"You can borrow at most {MAX_ACTIVE_LOANS} books at a time",
+                "conflict"
+            )
+        if result != BORROW_OK:
+            raise ServiceError("Unavailable", "This book is not available", "conflict")
+        return result
+
+    def borrow_many(self, user, book_ids):
+        """Cart checkout: [(book_id, result)] with the BORROW_* results."""
+        self._require_member(user, "Only members can borrow books")
+        if not book_ids:
+            raise ServiceError("Empty cart", "Add some books to the cart first")
+        return Borrow.borrow_many(user.id, book_ids)
+
+    def return_book(self, user, borrow_id):
+        """RETURN_OK, or RETURN_ALREADY when the loan was already closed."""
+        self._require_login(user)
+
+        result = Borrow.return_book(borrow_id, self._owner(user))
+        if result == RETURN_NOT_FOUND:
+            raise ServiceError("Not found", "Borrow record not found", "not_found")
+        return result
+
+    def return_many(self, user, borrow_ids):
+        """[(borrow_id, result)] with the RETURN_* results."""
+        self._require_login(user)
+        if not borrow_ids:
+            raise ServiceError("Nothing selected", "Select the books to return first")
+        return Borrow.return_many(borrow_ids, self._owner(user))
+
+    # ===== HOLDS =====
+    def place_hold(self, user, book_id):
+        self._require_member(user, "Only members can place holds")
+
+        result = Hold.place(user.id, book_id)
+        if result == HOLD_NOT_FOUND:
+            raise ServiceError("Not found", "This book no longer exists", "not_found")
+        if result == HOLD_AVAILABLE:
+            raise ServiceError(
+                "Available", "This book is available, borrow it instead", "conflict"
+            )
+        if result == HOLD_EXISTS:
+            raise ServiceError(
+                "Already on hold", "You already have a hold on this book", "conflict"
+            )
+        if result == HOLD_ON_LOAN:
+            raise ServiceError(
+                "Already borrowed", "You already have this book on loan", "conflict"
+            )
+        return result
+
+    def holds(self, user):
+        self._require_login(user)
+        return Hold.get_by_user(user.id)
+
+    def cancel_hold(self, user, hold_id):
+        self._require_login(user)
+        if not Hold.cancel(hold_id, user.id):
+            raise ServiceError("Not found", "Hold not found", "not_found")
+
+    def history(self, user, sort="borrow_date", descending=True,
+                after=None, limit=None):
+        self._require_login(user)
+        return Borrow.get_by_user(user.id, sort, descending, after, limit)
+
+    def history_entry(self, user, borrow_id):
+        self._require_login(user)
+        return Borrow.get_history_entry(borrow_id, self._owner(user))
+
+    # ===== USERS =====
+    def validate_new_user(self, username, password, role):
+        if not username or not password:
+            raise ServiceError("Invalid data", "Username and password are required")
+        if role not in ROLES:
+            raise ServiceError("Invalid role", "Role must be admin or user")
+
+    def add_user(self, username, password, role):
+        self.validate_new_user(username, password, role)
+        return User.create(username, password, role)
+
+    # ===== CHECKS =====
+    @staticmethod
+    def _require_login(user):
+        if not user:
+            raise ServiceError(
+                "Login required", "Please login first", "unauthorized"
+            )
+
+    @staticmethod
+    def _owner(user):
+        # admin thấy / trả được mọi lượt mượn, member chỉ của mình
+        return None if user.role == "admin" else user.id
+
+    @staticmethod
+    def _require_member(user, message):
+        if not user:
+            raise ServiceError(
+                "Login required", "Please login to borrow books", "unauthorized"
+            )
+        if user.role != "user":
+            raise ServiceError("Permission denied", message, "forbidden")
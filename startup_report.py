@@ -0,0 +1,75 @@
+"""
+Cold-start report: how long until the login screen is up, and which
+imports cost the most.
+
+    python startup_report.py [--runs 5] [--top 15]
+
+Runs `python -X importtime main.py --exit-after-startup` --runs times and
+prints the median of each startup phase (imports, init_db, Tk, login
+screen) plus the slowest modules of the last run by self import time.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_once():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", "--exit-after-startup"],
+        cwd=HERE, capture_output=True, text=True
+    )
+    phases = None
+    for line in proc.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            phases = json.loads(line[len("STARTUP "):])
+
+    imports = []
+    errors = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        imports.append((int(parts[0]), int(parts[1]), parts[2].rstrip()))
+
+    return phases, imports, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start to login")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.runs):
+        phases, imports, errors = run_once()
+        if phases is None:
+            print("main.py did not reach the login screen:")
+            print("\n".join(errors[-10:]))
+            break
+        runs.append(phases)
+
+    if runs:
+        print(f"Startup phases, median of {len(runs)} runs (ms):")
+        for phase in runs[0]:
+            print(f"  {phase:<14} {statistics.median(r[phase] for r in runs):8.1f}")
+
+    # importtime ghi microsecond
+    print(f"\n{len(imports)} modules imported, "
+          f"{sum(i[0] for i in imports) / 1000:.1f} ms in total")
+    print(f"Slowest {args.top} by self time (ms):")
+    print(f"  {'self':>8} {'cumulative':>11}  module")
+    for self_us, cumulative_us, name in sorted(imports, reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} {cumulative_us / 1000:11.1f}  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+# (column, heading, width)
+TITLE_COLUMNS = (("rank", "#", 50), ("title", "Title", 420), ("loans", "Loans", 90))
+CATEGORY_COLUMNS = (
+    ("category", "Category", 200), ("titles", "Titles", 90),
+    ("copies", "Copies", 90), ("loans", "Loans", 90),
+    ("turnover", "Loans / copy", 110),
+)
+PERIOD_COLUMNS = (
+    ("period", "Month", 90), ("loans", "Loans", 90),
+    ("returned", "Returned", 90), ("avg_days", "Avg days", 90),
+    ("late", "Late", 80), ("late_rate", "Late %", 80),
+    ("assessed", "Fines", 120), ("paid", "Paid", 120),
+)
+
+class AnalyticsView(tk.Frame):
+    def __init__(self, parent, app, controller):
+        super().__init__(parent)
+        self.app = app
+        self.controller = controller
+
+        # ======================
+        # FILTER
+        # ======================
+        bar = tk.Frame(self)
+        bar.pack(fill="x", padx=10, pady=(10, 0))
+
+        tk.Label(bar, text="From (YYYY-MM)").pack(side="left")
+        self.from_entry = tk.Entry(bar, width=10)
+        self.from_entry.pack(side="left", padx=(5, 10))
+
+        tk.Label(bar, text="To").pack(side="left")
+        self.to_entry = tk.Entry(bar, width=10)
+        self.to_entry.pack(side="left", padx=(5, 10))
+
+        tk.Button(bar, text="Apply", command=self.load_data).pack(side="left")
+
+        tk.Button(bar, text="Rebuild statistics", command=self.rebuild)\
+            .pack(side="right")
+
+        # ======================
+        # SUMMARY
+        # ======================
+        self.summary_var = tk.StringVar(value="Loading...")
+        tk.Label(
+            self, textvariable=self.summary_var, anchor="w", justify="left"
+        ).pack(fill="x", padx=10, pady=(10, 0))
+
+        # ======================
+        # TABS
+        # ======================
+        tabs = ttk.Notebook(self)
+        tabs.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.titles = self.table(tabs, "Top titles", TITLE_COLUMNS)
+        self.categories = self.table(tabs, "Categories", CATEGORY_COLUMNS)
+        self.periods = self.table(tabs, "By month", PERIOD_COLUMNS)
+
+        self.load_data()
+
+    def table(self, tabs, title, columns):
+        frame = tk.Frame(tabs)
+        tabs.add(frame, text=title)
+
+        table = ttk.Treeview(
+            frame, columns=[c[0] for c in columns], show="headings"
+        )
+        for i, (col, text, width) in enumerate(columns):
+            table.heading(col, text=text)
+            # cột đầu là nhãn, còn lại là số
+            table.column(col, width=width, anchor="w" if i == 0 else "e",
+                         stretch=(col == "title"))
+
+        scroll = ttk.Scrollbar(frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=scroll.set)
+        table.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+        return table
+
+    # ======================
+    # DATA
+    # ======================
+    def load_data(self):
+        try:
+            period_from = self.controller.parse_period(self.from_entry.get())
+            period_to = self.controller.parse_period(self.to_entry.get())
+        except ValueError as exc:
+            messagebox.showwarning("Warning", str(exc))
+            return
+
+        self.app.tasks.submit(
+            self.controller.get_report, period_from, period_to,
+            on_done=self.show
+        )
+
+    def show(self, report):
+        if not self.winfo_exists():
+            return
+
+        s = report["summary"]
+        self.summary_var.set(
+            f"{s['loans']:,} loans   •   {s['returned']:,} returned   •   "
+            f"average loan {s['avg_loan_days']} days   •   "
+            f"{s['late_returns']:,} returned late, {s['open_overdue']:,} overdue now "
+            f"({s['overdue_rate']:.1%})\n"
+            f"Fines assessed {s['fines_assessed']:,}   •   "
+            f"paid {s['fines_paid']:,}   •   "
+            f"computed in {report['elapsed_ms']} ms"
+        )
+
+        self.fill(self.titles, [
+            (rank, t.title, f"{t.loans:,}")
+            for rank, t in enumerate(report["top_titles"], start=1)
+        ])
+        self.fill(self.categories, [
+            (c.category or "-", f"{c.titles:,}", f"{c.copies:,}",
+             f"{c.loans:,}", "-" if c.turnover is None else c.turnover)
+            for c in report["categories"]
+        ])
+        # tháng mới nhất lên đầu
+        self.fill(self.periods, [
+            (p.period, f"{p.loans:,}", f"{p.returned:,}", p.avg_days,
+             f"{p.late:,}", f"{p.late / p.loans:.1%}" if p.loans else "-",
+             f"{p.assessed:,}", f"{p.paid:,}")
+            for p in reversed(report["periods"])
+        ])
+
+    def fill(self, table, rows):
+        table.delete(*table.get_children())
+        for values in rows:
+            table.insert("", "end", values=values)
+
+    # ======================
+    # ACTIONS
+    # ======================
+    def rebuild(self):
+        if not messagebox.askyesno(
+            "Confirm",
+            "Recompute all statistics from the borrow records? "
+            "This can take a while on a large database."
+        ):
+            return
+        self.app.tasks.submit(
+            self.controller.rebuild,
+            on_done=lambda _: self.load_data()
+        )
@@ -0,0 +1,157 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+STAT_COLUMNS = ("count", "mean", "p95", "max", "rows", "errors")
+
+class DiagnosticsView(tk.Frame):
+    def __init__(self, parent, app, controller):
+        super().__init__(parent)
+        self.app = app
+        self.controller = controller
+        self.slow = []
+
+        # ======================
+        # TOOLBAR
+        # ======================
+        bar = tk.Frame(self)
+        bar.pack(fill="x", padx=10, pady=(10, 0))
+
+        self.summary_var = tk.StringVar()
+        tk.Label(bar, textvariable=self.summary_var, anchor="w")\
+            .pack(side="left", fill="x", expand=True)
+
+        tk.Button(bar, text="Save metrics...", command=self.save)\
+            .pack(side="right", padx=(5, 0))
+        tk.Button(bar, text="Reset", command=self.reset)\
+            .pack(side="right", padx=(5, 0))
+        tk.Button(bar, text="Refresh", command=self.load_data)\
+            .pack(side="right")
+
+        # ======================
+        # TABS
+        # ======================
+        tabs = ttk.Notebook(self)
+        tabs.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.methods = self.stats_table(tabs, "Model methods", "Method")
+        self.statements = self.stats_table(tabs, "Statements", "SQL")
+
+        slow_tab = tk.Frame(tabs)
+        tabs.add(slow_tab, text="Slow queries")
+
+        self.slow_table = ttk.Treeview(
+            slow_tab, columns=("at", "ms", "rows", "sql"), show="headings",
+            height=10
+        )
+        for col, text, width in (
+            ("at", "At", 140), ("ms", "ms", 70),
+            ("rows", "Rows", 70), ("sql", "SQL", 600),
+        ):
+            self.slow_table.heading(col, text=text)
+            self.slow_table.column(col, width=width, stretch=(col == "sql"))
+        self.slow_table.pack(fill="both", expand=True)
+        self.slow_table.bind("<<TreeviewSelect>>", self.show_plan)
+
+        tk.Label(slow_tab, text="Query plan", anchor="w").pack(fill="x")
+        self.plan_text = tk.Text(slow_tab, height=8, state="disabled")
+        self.plan_text.pack(fill="x")
+
+        self.load_data()
+
+    def stats_table(self, tabs, title, name):
+        frame = tk.Frame(tabs)
+        tabs.add(frame, text=title)
+
+        table = ttk.Treeview(
+            frame, columns=("name",) + STAT_COLUMNS, show="headings"
+        )
+        table.heading("name", text=name)
+        table.column("name", width=420)
+        for col in STAT_COLUMNS:
+            heading = col.capitalize() + (" (ms)" if col in ("mean", "p95", "max") else "")
+            table.heading(col, text=heading)
+            table.column(col, width=80, anchor="e", stretch=False)
+
+        scroll = ttk.Scrollbar(frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=scroll.set)
+        table.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+        return table
+
+    # ======================
+    # DATA
+    # ======================
+    def load_data(self):
+        self.show(self.controller.get_metrics())
+
+    def show(self, data):
+        if not data["enabled"]:
+            self.summary_var.set(
+                "Metrics are off. Start the app with LIBRARY_METRICS=1 to collect them."
+            )
+            return
+
+        connections = data["connections"]
+        self.summary_var.set(
+            f"Since {data['since']}   •   "
+            f"{connections['count']} connections opened "
+            f"(mean {connections['mean_ms']} ms)   •   "
+            f"slow query threshold {data['slow_query_ms']:g} ms"
+        )
+
+        self.fill(self.methods, data["methods"])
+        self.fill(self.statements, data["statements"])
+
+        self.slow = list(reversed(data["slow_queries"]))
+        self.slow_table.delete(*self.slow_table.get_children())
+        for i, entry in enumerate(self.slow):
+            self.slow_table.insert("", "end", iid=str(i), values=(
+                entry["at"], entry["ms"], entry["rows"], entry["sql"]
+            ))
+        self.set_plan("")
+
+    def fill(self, table, stats):
+        table.delete(*table.get_children())
+        # tốn nhiều thời gian nhất lên đầu
+        ordered = sorted(stats.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+        for name, s in ordered:
+            table.insert("", "end", values=(
+                name, s["count"], s["mean_ms"], s["p95_ms"],
+                s["max_ms"], s["rows"], s["errors"]
+            ))
+
+    def show_plan(self, event=None):
+        selected = self.slow_table.selection()
+        if not selected:
+            return
+        entry = self.slow[int(selected[0])]
+        self.set_plan(entry["sql"] + "\n\n" + "\n".join(entry["plan"]))
+
+    def set_plan(self, text):
+        self.plan_text.config(state="normal")
+        self.plan_text.delete("1.0", "end")
+        self.plan_text.insert("1.0", text)
+        self.plan_text.config(state="disabled")
+
+    # ======================
+    # ACTIONS
+    # ======================
+    def reset(self):
+        if not messagebox.askyesno("Confirm", "Clear all collected metrics?"):
+            return
+        self.controller.reset_metrics()
+        self.load_data()
+
+    def save(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")]
+        )
+        if not path:
+            return
+        try:
+            self.controller.dump_metrics(path)
+        except OSError as exc:
+            messagebox.showerror("Error", str(exc))
+            return
+        messagebox.showinfo("Saved", f"Metrics written to {path}")
@@ -0,0 +1,96 @@
+import tkinter as tk
+from datetime import date
+from tkinter import ttk, filedialog, messagebox
+
+class ExportView(tk.Frame):
+    def __init__(self, parent, app, controller):
+        super().__init__(parent)
+        self.app = app
+        self.controller = controller
+
+        card = tk.Frame(self, padx=40, pady=20)
+        card.pack(expand=True)
+
+        tk.Label(
+            card,
+            text="Export borrow history & fines",
+            font=("Arial", 14, "bold")
+        ).grid(row=0, column=0, columnspan=2, pady=(0, 15))
+
+        tk.Label(card, text="From (YYYY-MM-DD)").grid(row=1, column=0, sticky="w")
+        self.from_var = tk.StringVar()
+        tk.Entry(card, textvariable=self.from_var).grid(row=1, column=1, pady=2)
+
+        tk.Label(card, text="To (YYYY-MM-DD)").grid(row=2, column=0, sticky="w")
+        self.to_var = tk.StringVar()
+        tk.Entry(card, textvariable=self.to_var).grid(row=2, column=1, pady=2)
+
+        tk.Label(card, text="Status").grid(row=3, column=0, sticky="w")
+        self.status_var = tk.StringVar(value="All")
+        ttk.Combobox(
+            card, textvariable=self.status_var,
+            values=["All", "Borrowed", "Returned"], state="readonly"
+        ).grid(row=3, column=1, pady=2)
+
+        tk.Label(card, text="Format").grid(row=4, column=0, sticky="w")
+        self.format_var = tk.StringVar(value="csv")
+        ttk.Combobox(
+            card, textvariable=self.format_var,
+            values=["csv", "jsonl"], state="readonly"
+        ).grid(row=4, column=1, pady=2)
+
+        self.export_btn = tk.Button(
+            card, text="Export...", width=25, command=self.export
+        )
+        self.export_btn.grid(row=5, column=0, columnspan=2, pady=15)
+
+        self.progress_var = tk.StringVar()
+        tk.Label(card, textvariable=self.progress_var)\
+            .grid(row=6, column=0, columnspan=2)
+
+    def export(self):
+        date_from = self.from_var.get().strip() or None
+        date_to = self.to_var.get().strip() or None
+        try:
+            for value in (date_from, date_to):
+                if value:
+                    date.fromisoformat(value)
+        except ValueError:
+            messagebox.showwarning("Invalid data", "Dates must be YYYY-MM-DD")
+            return
+
+        fmt = self.format_var.get()
+        path = filedialog.asksaveasfilename(
+            defaultextension="." + fmt,
+            filetypes=[(fmt.upper(), "*." + fmt)]
+        )
+        if not path:
+            return
+
+        status = self.status_var.get()
+        status = None if status == "All" else status
+
+        def progress(count):
+            self.app.tasks.call_soon(self.show_progress, count)
+
+        self.export_btn.config(state="disabled")
+        self.progress_var.set("Exporting...")
+        self.app.tasks.submit(
+            self.controller.export_history,
+            path, fmt, date_from, date_to, status, progress,
+            on_done=lambda count: self.on_finished(path, count),
+            on_error=self.on_failed
+        )
+
+    def show_progress(self, count):
+        if self.winfo_exists():
+            self.progress_var.set(f"{count} rows written")
+
+    def on_finished(self, path, count):
+        self.export_btn.config(state="normal")
+        self.progress_var.set(f"✅ {count} rows written to {path}")
+
+    def on_failed(self, exc):
+        self.export_btn.config(state="normal")
+        self.progress_var.set("")
+        messagebox.showerror("Export failed", str(exc))
@@ -0,0 +1,88 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox
+
+class ImportBooksView(tk.Frame):
+    def __init__(self, parent, app, controller):
+        super().__init__(parent)
+        self.app = app
+        self.controller = controller
+
+        tk.Label(
+            self,
+            text="Import books from CSV / JSONL",
+            font=("Arial", 14, "bold")
+        ).pack(pady=(15, 5))
+
+        tk.Label(
+            self,
+            text="Columns: BookID (optional), Title, Author, Category, Detail, Total",
+            fg="#555"
+        ).pack()
+
+        row = tk.Frame(self)
+        row.pack(pady=10)
+
+        self.path_var = tk.StringVar()
+        tk.Entry(row, textvariable=self.path_var, width=50).pack(side="left")
+        tk.Button(row, text="Browse...", command=self.browse)\
+            .pack(side="left", padx=5)
+
+        self.start_btn = tk.Button(
+            self, text="Start import", width=20, command=self.start
+        )
+        self.start_btn.pack(pady=5)
+
+        self.progress_var = tk.StringVar(value="")
+        tk.Label(self, textvariable=self.progress_var).pack(pady=5)
+
+        tk.Label(self, text="Rejected rows").pack(anchor="w", padx=15)
+        self.rejects = tk.Listbox(self, height=12)
+        self.rejects.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+
+    def browse(self):
+        path = filedialog.askopenfilename(
+            filetypes=[
+                ("Catalog files", "*.csv *.jsonl"),
+                ("All files", "*.*")
+            ]
+        )
+        if path:
+            self.path_var.set(path)
+
+    def start(self):
+        path = self.path_var.get().strip()
+        if not path:
+            messagebox.showwarning("Warning", "Choose a file first")
+            return
+
+        self.start_btn.config(state="disabled")
+        self.rejects.delete(0, "end")
+        self.progress_var.set("Importing...")
+
+        # progress được gọi ở worker thread → chuyển về Tk thread
+        def progress(report):
+            self.app.tasks.call_soon(self.show_progress, report.imported, report.rejected)
+
+        self.app.tasks.submit(
+            self.controller.import_books, path, progress,
+            on_done=self.on_finished,
+            on_error=self.on_failed
+        )
+
+    def show_progress(self, imported, rejected):
+        if self.winfo_exists():
+            self.progress_var.set(f"{imported} imported, {rejected} rejected")
+
+    def on_finished(self, report):
+        self.start_btn.config(state="normal")
+        self.progress_var.set(
+            f"Done: {report.imported} imported, {report.rejected} rejected "
+            f"in {report.elapsed:.1f}s"
+        )
+        for line, reason in report.rejects:
+            self.rejects.insert("end", f"line {line}: {reason}")
+
+    def on_failed(self, exc):
+        self.start_btn.config(state="normal")
+        self.progress_var.set("")
+        messagebox.showerror("Import failed", str(exc))
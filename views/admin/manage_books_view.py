@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from views.lazy_treeview import LazyTreeview
 
 class ManageBooksView(tk.Frame):
     def __init__(self, parent, app, controller):
@@ -7,8 +8,17 @@ class ManageBooksView(tk.Frame):
         self.app = app
         self.controller = controller
 
-        self.table = ttk.Treeview(
-            self,
+        table_frame = tk.Frame(self)
+        table_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.table = LazyTreeview(
+            table_frame,
+            fetch_page=self.controller.get_books_page,
+            to_item=lambda b: (
+                b.id, (b.title, b.author, b.category, b.total, b.available)
+            ),
+            cursor_of=self.controller.page_cursor,
+            runner=self.app.tasks,
             columns=("title", "author", "category", "total", "available"),
             show="headings"
         )
@@ -16,7 +26,10 @@ class ManageBooksView(tk.Frame):
         for col in self.table["columns"]:
             self.table.heading(col, text=col.capitalize())
 
-        self.table.pack(fill="both", expand=True, padx=10, pady=10)
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
+        self.table.attach_scrollbar(scrollbar)
+        scrollbar.pack(side="right", fill="y")
+        self.table.pack(side="left", fill="both", expand=True)
 
         btns = tk.Frame(self)
         btns.pack(pady=10)
@@ -26,10 +39,11 @@ class ManageBooksView(tk.Frame):
 
         self.load_books()
 
+        self._unwatch = self.app.watch("Book", self.on_book_changed)
+        self.bind("<Destroy>", lambda e: self._unwatch())
+
     def load_books(self):
-        self.table.delete(*self.table.get_children())
-        for b in self.controller.get_books():
-            self.table.insert("", "end", iid=b[0], values=b[1:])
+        self.table.reset()
 
     def delete_book(self):
         book_id = self.table.focus()
@@ -46,9 +60,33 @@ class ManageBooksView(tk.Frame):
         if not confirm:
             return  # user bấm No → không làm gì
 
-        self.controller.delete_book(book_id)
+        self.app.tasks.submit(
+            self.controller.delete_book, book_id,
+            on_done=self.on_book_deleted
+        )
+
+    def on_book_deleted(self, _):
         messagebox.showinfo("Success", "Book deleted successfully")
-        self.load_books()
+
+    def on_book_changed(self, action, book_id):
+        if not self.table.winfo_exists():
+            return
+
+        if action == "deleted":
+            self.table.remove_row(book_id)
+            return
+
+        if action == "updated" and not self.table.exists(book_id):
+            return
+
+        # sách mới thêm hiện ở đầu bảng
+        apply = self.table.prepend_row if action == "created" \
+            else self.table.update_row
+        self.app.tasks.submit(
+            self.controller.get_book, book_id,
+            on_done=lambda row: row and apply(row),
+            busy=False
+        )
 
     
     # add book
@@ -129,4 +167,3 @@ class ManageBooksView(tk.Frame):
 
         if success:
             popup.destroy()
-            self.load_books()
@@ -1,24 +1,125 @@
 import tkinter as tk
-from tkinter import ttk
+from datetime import date
+from tkinter import ttk, messagebox
+from views.lazy_treeview import LazyTreeview
+
+SORT_OPTIONS = {
+    "Borrow date": "borrow_date",
+    "Due date": "due_date",
+}
 
 class ManageBorrowView(tk.Frame):
-    def __init__(self, parent, controller):
+    def __init__(self, parent, app, controller):
         super().__init__(parent)
+        self.app = app
         self.controller = controller
 
-        self.table = ttk.Treeview(
-            self,
-            columns=("user", "book", "date", "status"),
+        # ======================
+        # FILTERS
+        # ======================
+        filters = tk.Frame(self)
+        filters.pack(fill="x", padx=10, pady=(10, 0))
+
+        tk.Label(filters, text="Status").grid(row=0, column=0, sticky="w")
+        self.status_var = tk.StringVar(value="All")
+        ttk.Combobox(
+            filters, textvariable=self.status_var, width=10,
+            values=["All", "Borrowed", "Returned"], state="readonly"
+        ).grid(row=1, column=0, padx=(0, 8))
+
+        tk.Label(filters, text="Username").grid(row=0, column=1, sticky="w")
+        self.user_var = tk.StringVar()
+        tk.Entry(filters, textvariable=self.user_var, width=14)\
+            .grid(row=1, column=1, padx=(0, 8))
+
+        tk.Label(filters, text="Title starts with").grid(row=0, column=2, sticky="w")
+        self.title_var = tk.StringVar()
+        tk.Entry(filters, textvariable=self.title_var, width=18)\
+            .grid(row=1, column=2, padx=(0, 8))
+
+        tk.Label(filters, text="From (YYYY-MM-DD)").grid(row=0, column=3, sticky="w")
+        self.from_var = tk.StringVar()
+        tk.Entry(filters, textvariable=self.from_var, width=12)\
+            .grid(row=1, column=3, padx=(0, 8))
+
+        tk.Label(filters, text="To").grid(row=0, column=4, sticky="w")
+        self.to_var = tk.StringVar()
+        tk.Entry(filters, textvariable=self.to_var, width=12)\
+            .grid(row=1, column=4, padx=(0, 8))
+
+        tk.Label(filters, text="Sort by").grid(row=0, column=5, sticky="w")
+        self.sort_var = tk.StringVar(value="Borrow date")
+        ttk.Combobox(
+            filters, textvariable=self.sort_var, width=11,
+            values=list(SORT_OPTIONS), state="readonly"
+        ).grid(row=1, column=5, padx=(0, 8))
+
+        self.overdue_var = tk.BooleanVar()
+        tk.Checkbutton(filters, text="Overdue only", variable=self.overdue_var)\
+            .grid(row=1, column=6)
+
+        self.desc_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(filters, text="Newest first", variable=self.desc_var)\
+            .grid(row=1, column=7)
+
+        tk.Button(filters, text="Apply", command=self.load_data)\
+            .grid(row=1, column=8, padx=5)
+
+        # ======================
+        # TABLE
+        # ======================
+        table_frame = tk.Frame(self)
+        table_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.table = LazyTreeview(
+            table_frame,
+            fetch_page=lambda after, limit: [],
+            to_item=lambda r: (r.id, (
+                r.username, r.title, r.borrow_date,
+                r.due_date, r.return_date or "", r.status
+            )),
+            runner=self.app.tasks,
+            columns=("user", "book", "date", "due", "returned", "status"),
             show="headings"
         )
 
         for col in self.table["columns"]:
             self.table.heading(col, text=col.capitalize())
 
-        self.table.pack(fill="both", expand=True, padx=10, pady=10)
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
+        self.table.attach_scrollbar(scrollbar)
+        scrollbar.pack(side="right", fill="y")
+        self.table.pack(side="left", fill="both", expand=True)
+
         self.load_data()
 
+    def get_filters(self):
+        date_from = self.from_var.get().strip()
+        date_to = self.to_var.get().strip()
+        for value in (date_from, date_to):
+            if value:
+                date.fromisoformat(value)  # ValueError nếu sai định dạng
+
+        status = self.status_var.get()
+        return {
+            "status": None if status == "All" else status,
+            "username": self.user_var.get().strip() or None,
+            "title": self.title_var.get().strip() or None,
+            "date_from": date_from or None,
+            "date_to": date_to or None,
+            "overdue_only": self.overdue_var.get(),
+            "sort": SORT_OPTIONS[self.sort_var.get()],
+            "descending": self.desc_var.get(),
+        }
+
     def load_data(self):
-        self.table.delete(*self.table.get_children())
-        for r in self.controller.get_records():
-            self.table.insert("", "end", values=r[1:])
+        try:
+            filters = self.get_filters()
+        except ValueError:
+            messagebox.showwarning("Invalid data", "Dates must be YYYY-MM-DD")
+            return
+
+        self.table.reset(
+            lambda after, limit: self.controller.get_records_page(filters, after, limit),
+            self.controller.page_cursor(filters)
+        )
@@ -27,10 +27,13 @@ class ManageMembersView(tk.Frame):
 
         self.load_users()
 
+        self._unwatch = self.app.watch("Users", self.on_user_changed)
+        self.bind("<Destroy>", lambda e: self._unwatch())
+
     def load_users(self):
         self.table.delete(*self.table.get_children())
         for u in self.controller.get_users():
-            self.table.insert("", "end", iid=u[0], values=u[1:])
+            self.table.insert("", "end", iid=u.id, values=(u.username, u.role))
 
     def delete_user(self):
         user_id = self.table.focus()
@@ -48,7 +51,23 @@ class ManageMembersView(tk.Frame):
 
         self.controller.delete_user(user_id)
         messagebox.showinfo("Success", "User deleted successfully")
-        self.load_users()
+
+    def on_user_changed(self, action, user_id):
+        if not self.table.winfo_exists():
+            return
+
+        if action == "deleted":
+            if self.table.exists(user_id):
+                self.table.delete(user_id)
+        elif action == "created":
+            self.app.tasks.submit(
+                self.controller.get_user, user_id,
+                on_done=self.add_row, busy=False
+            )
+
+    def add_row(self, row):
+        if row and self.table.winfo_exists() and not self.table.exists(row.id):
+            self.table.insert("", 0, iid=row.id, values=(row.username, row.role))
 
     # ===== ADD USER =====
     def open_add_user(self):
@@ -86,7 +105,16 @@ class ManageMembersView(tk.Frame):
         ).pack(pady=15)
 
     def create_user(self, username, password, role, popup):
-        if self.controller.add_user(username, password, role):
-            popup.destroy()
-            self.load_users()
+        if not self.controller.validate_user(username, password, role):
+            return
+
+        def on_created(_):
+            if popup.winfo_exists():
+                popup.destroy()
+            messagebox.showinfo("Success", "User added successfully")
+
+        self.app.tasks.submit(
+            self.controller.create_user, username, password, role,
+            on_done=on_created
+        )
 
@@ -18,6 +18,13 @@ class AdminView(tk.Frame):
             command=self.manage_books
         ).pack(pady=5)
 
+        tk.Button(
+            self,
+            text="Import Books",
+            width=25,
+            command=self.import_books
+        ).pack(pady=5)
+
         tk.Button(
             self,
             text="Manage Members",
@@ -32,6 +39,27 @@ class AdminView(tk.Frame):
             command=self.manage_borrows
         ).pack(pady=5)
 
+        tk.Button(
+            self,
+            text="Export History",
+            width=25,
+            command=self.export_history
+        ).pack(pady=5)
+
+        tk.Button(
+            self,
+            text="Statistics",
+            width=25,
+            command=self.statistics
+        ).pack(pady=5)
+
+        tk.Button(
+            self,
+            text="Diagnostics",
+            width=25,
+            command=self.diagnostics
+        ).pack(pady=5)
+
     def manage_books(self):
         from views.admin.manage_books_view import ManageBooksView
         from controllers.admin_book_controller import AdminBookController
@@ -42,6 +70,16 @@ class AdminView(tk.Frame):
         ManageBooksView(self.app.root, self.app, controller)\
             .pack(fill="both", expand=True)
 
+    def import_books(self):
+        from views.admin.import_books_view import ImportBooksView
+        from controllers.admin_book_controller import AdminBookController
+
+        self.app.clear_screen()
+        self.app.render_header("Import Books")
+        controller = AdminBookController()
+        ImportBooksView(self.app.root, self.app, controller)\
+            .pack(fill="both", expand=True)
+
     def manage_members(self):
         from views.admin.manage_members_view import ManageMembersView
         from controllers.admin_user_controller import AdminUserController
@@ -59,5 +97,35 @@ class AdminView(tk.Frame):
         self.app.clear_screen()
         self.app.render_header("Borrow Records")
         controller = AdminBorrowController()
-        ManageBorrowView(self.app.root, controller)\
+        ManageBorrowView(self.app.root, self.app, controller)\
+            .pack(fill="both", expand=True)
+
+    def export_history(self):
+        from views.admin.export_view import ExportView
+        from controllers.admin_borrow_controller import AdminBorrowController
+
+        self.app.clear_screen()
+        self.app.render_header("Export History")
+        controller = AdminBorrowController()
+        ExportView(self.app.root, self.app, controller)\
+            .pack(fill="both", expand=True)
+
+    def statistics(self):
+        from views.admin.analytics_view import AnalyticsView
+        from controllers.admin_analytics_controller import AdminAnalyticsController
+
+        self.app.clear_screen()
+        self.app.render_header("Statistics")
+        controller = AdminAnalyticsController()
+        AnalyticsView(self.app.root, self.app, controller)\
+            .pack(fill="both", expand=True)
+
+    def diagnostics(self):
+        from views.admin.diagnostics_view import DiagnosticsView
+        from controllers.admin_diagnostics_controller import AdminDiagnosticsController
+
+        self.app.clear_screen()
+        self.app.render_header("Diagnostics")
+        controller = AdminDiagnosticsController()
+        DiagnosticsView(self.app.root, self.app, controller)\
             .pack(fill="both", expand=True)
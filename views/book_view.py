@@ -1,11 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from views.lazy_treeview import LazyTreeview
 
 class BookView(tk.Frame):
-    def __init__(self, master, controller, books):
+    def __init__(self, master, controller):
         super().__init__(master)
         self.controller = controller
-        self.books = books
 
         # ======================
         # TITLE
@@ -16,13 +16,36 @@ class BookView(tk.Frame):
             font=("Arial", 16, "bold")
         ).pack(anchor="w", padx=15, pady=(10, 5))
 
+        # ======================
+        # SEARCH
+        # ======================
+        search_bar = tk.Frame(self)
+        search_bar.pack(fill="x", padx=15)
+
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(search_bar, textvariable=self.search_var, width=40)
+        search_entry.pack(side="left")
+        search_entry.bind("<Return>", lambda e: self.search())
+
+        tk.Button(search_bar, text="Search", command=self.search)\
+            .pack(side="left", padx=5)
+        tk.Button(search_bar, text="Clear", command=self.clear_search)\
+            .pack(side="left")
+
         # ======================
         # TABLE
         # ======================
         columns = ("title", "author", "category", "status", "actions")
 
-        self.table = ttk.Treeview(
-            self,
+        table_frame = tk.Frame(self)
+        table_frame.pack(fill="both", expand=True, padx=15, pady=10)
+
+        self.table = LazyTreeview(
+            table_frame,
+            fetch_page=self.controller.get_books_page,
+            to_item=self.book_item,
+            cursor_of=self.controller.book_model.page_cursor,
+            runner=self.controller.app.tasks,
             columns=columns,
             show="headings",
             height=12
@@ -40,31 +63,84 @@ class BookView(tk.Frame):
         self.table.column("status", width=100, anchor="center")
         self.table.column("actions", width=120, anchor="center")
 
-        self.table.pack(fill="both", expand=True, padx=15, pady=10)
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
+        self.table.attach_scrollbar(scrollbar)
+        scrollbar.pack(side="right", fill="y")
+        self.table.pack(side="left", fill="both", expand=True)
+
+        # ======================
+        # CART
+        # ======================
+        cart_bar = tk.Frame(self)
+        cart_bar.pack(fill="x", padx=15, pady=(0, 10))
+
+        self.cart_var = tk.StringVar()
+        tk.Label(cart_bar, textvariable=self.cart_var, anchor="w")\
+            .pack(side="left", fill="x", expand=True)
 
+        tk.Button(cart_bar, text="Checkout", command=self.checkout)\
+            .pack(side="right", padx=(5, 0))
+        tk.Button(cart_bar, text="Clear Cart", command=self.clear_cart)\
+            .pack(side="right", padx=(5, 0))
+        # Ctrl/Shift + click để chọn nhiều dòng
+        tk.Button(cart_bar, text="Add Selected to Cart", command=self.add_selected)\
+            .pack(side="right")
+
+        self.show_cart()
         self.load_books()
 
         # Click vào cột Actions
         self.table.bind("<ButtonRelease-1>", self.on_click)
 
-    def load_books(self):
-        for book in self.books:
-            book_id = book[0]
-            status = "Available" if book[4] > 0 else "Borrowed"
-
-            self.table.insert(
-                "",
-                "end",
-                iid=book_id,
-                values=(
-                    book[1],  # Title
-                    book[2],  # Author
-                    book[3],  # Category
-                    status,
-                    "View Details"
-                )
+        # chỉ cập nhật dòng bị thay đổi, không reload cả bảng
+        self._unwatch = self.controller.app.watch("Book", self.on_book_changed)
+        self.bind("<Destroy>", lambda e: self._unwatch())
+
+    @staticmethod
+    def book_item(book):
+        status = "Available" if book.available > 0 else "Borrowed"
+        return book.id, (
+            book.title,
+            book.author,
+            book.category,
+            status,
+            "View Details"
+        )
+
+    def on_book_changed(self, action, book_id):
+        if not self.table.winfo_exists() or not self.table.exists(book_id):
+            return
+
+        if action == "deleted":
+            self.table.remove_row(book_id)
+        elif action == "updated":
+            self.controller.app.tasks.submit(
+                self.controller.book_model.get_by_id, book_id,
+                on_done=lambda row: row and self.table.update_row(row),
+                busy=False
             )
 
+    def load_books(self):
+        self.table.reset(
+            self.controller.get_books_page,
+            self.controller.book_model.page_cursor
+        )
+
+    def search(self):
+        query = self.search_var.get().strip()
+        if not query:
+            self.clear_search()
+            return
+
+        # kết quả tìm kiếm phân trang theo OFFSET
+        self.table.reset(
+            lambda offset, limit: self.controller.search_books(query, offset, limit)
+        )
+
+    def clear_search(self):
+        self.search_var.set("")
+        self.load_books()
+
     def on_click(self, event):
         region = self.table.identify("region", event.x, event.y)
         if region != "cell":
@@ -78,60 +154,111 @@ class BookView(tk.Frame):
             self.open_detail_popup(row)
 
     def open_detail_popup(self, book_id):
-        book = self.controller.get_book_detail(book_id)
-        if not book:
+        self.controller.app.tasks.submit(
+            self.controller.get_book_detail, book_id,
+            on_done=lambda book: self.show_detail_popup(book_id, book)
+        )
+
+    def show_detail_popup(self, book_id, book):
+        if not book or not self.winfo_exists():
             return
 
         popup = tk.Toplevel(self)
         popup.title("Book Details")
-        popup.geometry("400x300")
+        popup.geometry("400x380")
         popup.resizable(False, False)
 
-        tk.Label(popup, text=book["title"], font=("Arial", 14, "bold")).pack(pady=10)
+        tk.Label(popup, text=book.title, font=("Arial", 14, "bold")).pack(pady=10)
 
         info = [
-            f"Author: {book['author']}",
-            f"Category: {book['category']}",
-            f"Total Copies: {book['total']}",
-            f"Available Copies: {book['available']}",
-            f"Status: {'Available' if book['available'] > 0 else 'Borrowed'}"
+            f"Author: {book.author}",
+            f"Category: {book.category}",
+            f"Total Copies: {book.total}",
+            f"Available Copies: {book.available}",
+            f"Status: {'Available' if book.available > 0 else 'Borrowed'}"
         ]
 
         for line in info:
             tk.Label(popup, text=line, anchor="w").pack(fill="x", padx=20, pady=2)
 
-        tk.Button(
-            popup,
-            text="Borrow Book",
-            command=lambda: self.borrow_from_popup(book_id, popup)
-        ).pack(pady=15)
+        if book.detail:
+            tk.Label(
+                popup,
+                text=book.detail,
+                anchor="w",
+                justify="left",
+                wraplength=360
+            ).pack(fill="x", padx=20, pady=(8, 2))
+
+        if book.available > 0:
+            buttons = tk.Frame(popup)
+            buttons.pack(pady=15)
+            tk.Button(
+                buttons,
+                text="Borrow Book",
+                command=lambda: self.borrow_from_popup(book_id, popup)
+            ).pack(side="left", padx=5)
+            tk.Button(
+                buttons,
+                text="Add to Cart",
+                command=lambda: self.add_from_popup(book, popup)
+            ).pack(side="left", padx=5)
+        else:
+            # hết sách → vào hàng đợi giữ chỗ
+            tk.Button(
+                popup,
+                text="Place Hold",
+                command=lambda: self.controller.place_hold(
+                    book_id, on_success=popup.destroy
+                )
+            ).pack(pady=15)
+
+    # ======================
+    # CART
+    # ======================
+    def show_cart(self):
+        cart = self.controller.cart
+        if not cart:
+            self.cart_var.set("Cart is empty")
+            return
+        titles = ", ".join(list(cart.values())[:3])
+        more = f" and {len(cart) - 3} more" if len(cart) > 3 else ""
+        self.cart_var.set(f"Cart ({len(cart)}): {titles}{more}")
+
+    def add_selected(self):
+        selected = self.table.selection()
+        if not selected:
+            messagebox.showwarning("Warning", "Select one or more books first")
+            return
+        self.controller.add_to_cart(
+            (book_id, self.table.item(book_id, "values")[0]) for book_id in selected
+        )
+        self.show_cart()
+
+    def clear_cart(self):
+        self.controller.clear_cart()
+        self.show_cart()
+
+    def checkout(self):
+        if not self.controller.cart:
+            messagebox.showwarning("Warning", "Cart is empty")
+            return
+        # sách còn lỗi vẫn nằm trong giỏ
+        self.controller.checkout(
+            on_done=lambda: self.winfo_exists() and self.show_cart()
+        )
 
     def borrow_from_popup(self, book_id, popup):
-        if self.controller.borrow_book(book_id):
-            popup.destroy()
-            self.table.delete(*self.table.get_children())
-            self.reload_books()
+        # dòng trong bảng tự cập nhật qua event "Book" updated
+        self.controller.borrow_book(book_id, on_success=popup.destroy)
+
+    def add_from_popup(self, book, popup):
+        self.controller.add_to_cart([(book.id, book.title)])
+        self.show_cart()
+        popup.destroy()
 
     def reload_books(self):
-        # Xoá toàn bộ dòng cũ
-        for row in self.table.get_children():
-            self.table.delete(row)
-
-        # Lấy data mới từ DB
-        books = self.controller.book_model.get_all()
-
-        for book in books:
-            status = "Available" if book[5] > 0 else "Borrowed"
-
-            self.table.insert(
-                "",
-                "end",
-                iid=book[0],
-                values=(
-                    book[1],
-                    book[2],
-                    book[3],
-                    status,
-                    "View Details"
-                )
-            )
+        if self.search_var.get().strip():
+            self.search()
+        else:
+            self.load_books()
@@ -1,32 +1,147 @@
 import tkinter as tk
+from tkinter import ttk, messagebox
+from views.lazy_treeview import LazyTreeview
+
+# (column, heading, width); mọi cột trừ action đều sắp xếp được
+COLUMNS = (
+    ("title", "Book", 260),
+    ("borrow_date", "Borrow Date", 110),
+    ("due_date", "Due Date", 110),
+    ("return_date", "Return Date", 110),
+    ("fine", "Fine", 90),
+    ("status", "Status", 90),
+    ("action", "Action", 90),
+)
 
 class HistoryView(tk.Frame):
 
-    def __init__(self, master, controller, borrows):
+    def __init__(self, master, controller):
         super().__init__(master)
         self.controller = controller  # HistoryController
+        self.app = controller.app
+
+        # mới mượn nhất lên đầu (theo idx_borrow_user_date)
+        self.sort = "borrow_date"
+        self.descending = True
+
+        # ======================
+        # TABLE
+        # ======================
+        table_frame = tk.Frame(self)
+        table_frame.pack(fill="both", expand=True, padx=15, pady=10)
 
-        headers = ["Book", "Borrow Date", "Return Date", "Fine", "Action"]
-        for i, h in enumerate(headers):
-            tk.Label(
-                self,
-                text=h,
-                font=("Arial", 10, "bold")
-            ).grid(row=0, column=i, padx=8, pady=5)
-
-        # ===== LOAD DATA =====
-        for r, b in enumerate(borrows, start=1):
-            tk.Label(self, text=b[1]).grid(row=r, column=0)
-            tk.Label(self, text=b[2]).grid(row=r, column=1)
-            tk.Label(self, text=b[3] if b[3] else "-").grid(row=r, column=2)
-            tk.Label(self, text=b[4]).grid(row=r, column=3)
-
-            if b[3] is None:
-                # Chưa trả → cho phép RETURN
-                tk.Button(
-                    self,
-                    text="RETURN",
-                    command=lambda bid=b[0]: self.controller.app.book.handle_return(bid)
-                ).grid(row=r, column=4)
+        self.table = LazyTreeview(
+            table_frame,
+            fetch_page=self.fetch_page,
+            to_item=self.history_item,
+            cursor_of=self.cursor_of,
+            runner=self.app.tasks,
+            columns=[c[0] for c in COLUMNS],
+            show="headings",
+            height=15
+        )
+
+        for col, text, width in COLUMNS:
+            anchor = "w" if col == "title" else "center"
+            self.table.column(col, width=width, anchor=anchor,
+                              stretch=(col == "title"))
+            if col == "action":
+                self.table.heading(col, text=text)
             else:
-                tk.Label(self, text="Done").grid(row=r, column=4)
+                self.table.heading(col, command=lambda c=col: self.sort_by(c))
+        self.show_sort()
+
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
+        self.table.attach_scrollbar(scrollbar)
+        scrollbar.pack(side="right", fill="y")
+        self.table.pack(side="left", fill="both", expand=True)
+
+        # Click vào cột Action
+        self.table.bind("<ButtonRelease-1>", self.on_click)
+
+        # Ctrl/Shift + click để chọn nhiều dòng
+        tk.Button(
+            self,
+            text="Return Selected",
+            command=self.return_selected
+        ).pack(pady=(0, 10))
+
+        self.table.reset()
+
+        # chỉ cập nhật dòng vừa trả, không dựng lại màn hình
+        self._unwatch = self.app.watch("BorrowRecord", self.on_borrow_changed)
+        self.bind("<Destroy>", lambda e: self._unwatch())
+
+    @staticmethod
+    def history_item(b):
+        return b.id, (
+            b.title,
+            b.borrow_date,
+            b.due_date,
+            b.return_date or "-",
+            f"{b.fine:,}" if b.fine else "-",
+            b.status,
+            "RETURN" if b.return_date is None else "Done"
+        )
+
+    # ======================
+    # DATA
+    # ======================
+    def fetch_page(self, after, limit):
+        return self.controller.get_page(self.sort, self.descending, after, limit)
+
+    def cursor_of(self, row):
+        return self.controller.page_cursor(row, self.sort)
+
+    def sort_by(self, column):
+        if column == self.sort:
+            self.descending = not self.descending
+        else:
+            # cột ngày / tiền: lớn nhất trước; cột chữ: A → Z
+            self.sort = column
+            self.descending = column not in ("title", "status")
+        self.show_sort()
+        self.table.reset()
+
+    def show_sort(self):
+        for col, text, _ in COLUMNS:
+            if col == self.sort:
+                text += " ▼" if self.descending else " ▲"
+            self.table.heading(col, text=text)
+
+    def on_borrow_changed(self, action, borrow_id):
+        if not self.table.winfo_exists() or not self.table.exists(borrow_id):
+            return
+        self.app.tasks.submit(
+            self.controller.get_entry, borrow_id,
+            on_done=self.refresh_row,
+            busy=False
+        )
+
+    def refresh_row(self, entry):
+        if entry and self.table.winfo_exists():
+            self.table.update_row(entry)
+
+    # ======================
+    # ACTIONS
+    # ======================
+    def on_click(self, event):
+        if self.table.identify("region", event.x, event.y) != "cell":
+            return
+
+        column = self.table.identify_column(event.x)
+        row = self.table.identify_row(event.y)
+
+        # Cột Action là cột cuối
+        if column == f"#{len(COLUMNS)}" and row and self.is_open(row):
+            self.app.book.handle_return(row)
+
+    def is_open(self, borrow_id):
+        return self.table.item(borrow_id, "values")[-1] == "RETURN"
+
+    def return_selected(self):
+        ids = [bid for bid in self.table.selection() if self.is_open(bid)]
+        if not ids:
+            messagebox.showwarning("Warning", "Select one or more books to return")
+            return
+        self.controller.return_many(ids)
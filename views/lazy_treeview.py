@@ -0,0 +1,134 @@
+from tkinter import ttk, messagebox
+
+PAGE_SIZE = 100
+
+# tải trang tiếp theo khi kéo tới 90% danh sách
+LOAD_THRESHOLD = 0.9
+
+
+class LazyTreeview(ttk.Treeview):
+    """
+    Treeview that only loads the rows the user has scrolled to.
+
+    fetch_page(after, limit) returns the next rows. With cursor_of the
+    table pages by keyset: cursor_of(last_row) is passed back as `after`.
+    Without it, `after` is the number of rows already loaded (OFFSET).
+    to_item(row) returns the (iid, values) to insert for a row.
+
+    With a TaskRunner, pages are fetched on a worker thread; a page that
+    arrives after reset() is dropped. A page that fails is reported and can
+    be retried; the table is not marked as fully loaded.
+    """
+
+    def __init__(self, master, fetch_page, to_item, cursor_of=None,
+                 page_size=PAGE_SIZE, runner=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.fetch_page = fetch_page
+        self.to_item = to_item
+        self.cursor_of = cursor_of
+        self.page_size = page_size
+        self.runner = runner
+        self.scrollbar = None
+        self._token = 0
+        self._loading = False
+
+        self._after = None
+        self._loaded = 0
+        self._exhausted = False
+        self._pending = False
+
+        super().configure(yscrollcommand=self._on_scroll)
+
+    def attach_scrollbar(self, scrollbar):
+        self.scrollbar = scrollbar
+        scrollbar.configure(command=self.yview)
+
+    def reset(self, fetch_page=None, cursor_of=None):
+        """Clear the table and load the first page (optionally from a new source)."""
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+            self.cursor_of = cursor_of
+
+        self.delete(*self.get_children())
+        self._token += 1
+        self._loading = False
+        self._after = None
+        self._loaded = 0
+        self._exhausted = False
+        self.load_more()
+
+    def load_more(self):
+        if self._exhausted or self._loading:
+            return
+
+        after = self._after if self.cursor_of else self._loaded
+        if self.runner is None:
+            self.add_rows(self.fetch_page(after, self.page_size))
+            return
+
+        token = self._token
+        self._loading = True
+        self.runner.submit(
+            self.fetch_page, after, self.page_size,
+            on_done=lambda rows: self._on_page(token, rows),
+            on_error=lambda exc: self._on_page_error(token, exc)
+        )
+
+    def _on_page(self, token, rows):
+        if token != self._token or not self.winfo_exists():
+            return
+        self._loading = False
+        self.add_rows(rows)
+
+    def _on_page_error(self, token, exc):
+        if token != self._token or not self.winfo_exists():
+            return
+        self._loading = False
+        answer = messagebox.showerror(
+            getattr(exc, "title", "Error"), str(exc),
+            type=messagebox.RETRYCANCEL, parent=self
+        )
+        if answer == messagebox.RETRY:
+            self.load_more()
+
+    def add_rows(self, rows):
+        for row in rows:
+            iid, values = self.to_item(row)
+            if self.exists(iid):
+                continue
+            self.insert("", "end", iid=iid, values=values)
+
+        self._loaded += len(rows)
+        if rows and self.cursor_of:
+            self._after = self.cursor_of(rows[-1])
+        if len(rows) < self.page_size:
+            self._exhausted = True
+
+    def _on_scroll(self, first, last):
+        if self.scrollbar is not None:
+            self.scrollbar.set(first, last)
+        if float(last) >= LOAD_THRESHOLD and not self._exhausted \
+                and not self._pending:
+            # gọi sau, không load ngay trong callback của Tk
+            self._pending = True
+            self.after_idle(self._load_pending)
+
+    def _load_pending(self):
+        self._pending = False
+        self.load_more()
+
+    def update_row(self, row):
+        iid, values = self.to_item(row)
+        if self.exists(iid):
+            self.item(iid, values=values)
+
+    def prepend_row(self, row):
+        iid, values = self.to_item(row)
+        if self.exists(iid):
+            self.item(iid, values=values)
+        else:
+            self.insert("", 0, iid=iid, values=values)
+
+    def remove_row(self, iid):
+        if self.exists(iid):
+            self.delete(iid)
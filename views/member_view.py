@@ -1,4 +1,5 @@
 import tkinter as tk
+from tkinter import messagebox
 
 class MemberView(tk.Frame):
 
@@ -12,6 +13,9 @@ class MemberView(tk.Frame):
             font=("Arial", 14, "bold")
         ).pack(pady=20)
 
+        self.loans_label = tk.Label(self, text="", fg="#555")
+        self.loans_label.pack()
+
         tk.Button(
             self,
             text="📚 View Book List",
@@ -27,3 +31,45 @@ class MemberView(tk.Frame):
             height=2,
             command=self.controller.app.history.show_history
         ).pack(pady=10)
+
+        self.holds_frame = tk.Frame(self)
+        self.holds_frame.pack(fill="x", pady=(10, 0))
+
+    def show_active_loans(self, count):
+        if self.loans_label.winfo_exists():
+            self.loans_label.config(text=f"Books on loan: {count}")
+
+    def show_holds(self, holds):
+        if not self.holds_frame.winfo_exists() or not holds:
+            return
+
+        tk.Label(
+            self.holds_frame, text="My holds", font=("Arial", 11, "bold")
+        ).pack(anchor="w")
+
+        for hold in holds:
+            if hold.status == "Ready":
+                text = f"{hold.title} — ready for pickup (since {hold.ready_at})"
+                color = "#27ae60"
+            else:
+                text = f"{hold.title} — #{hold.position} in queue"
+                color = "#555"
+
+            row = tk.Frame(self.holds_frame)
+            row.pack(fill="x", pady=1)
+            tk.Label(row, text=text, fg=color, anchor="w")\
+                .pack(side="left", fill="x", expand=True)
+            tk.Button(
+                row, text="Cancel",
+                command=lambda h=hold.id: self.cancel_hold(h)
+            ).pack(side="right")
+            if hold.status == "Ready":
+                # bản sách đã để riêng: mượn luôn từ đây
+                tk.Button(
+                    row, text="Borrow",
+                    command=lambda b=hold.book_id: self.controller.borrow_hold(b)
+                ).pack(side="right", padx=(0, 5))
+
+    def cancel_hold(self, hold_id):
+        if messagebox.askyesno("Confirm", "Cancel this hold?"):
+            self.controller.cancel_hold(hold_id)